@@ -1,5 +1,12 @@
-from .request import Request
+from .request import Request, FastRequest
 from .reader import Reader
 from .status import Status
+from .interner import Interner
+from .trace import Trace, HIT, MISS, PASS, STATUSES
+from .stats import Stats, WindowedStats
 from .cache import Cache
 from .pbarmixin import PBarMixIn
+from .tinylfumixin import TinyLFUMixIn
+from .doorkeepermixin import DoorkeeperMixIn
+from .expirymixin import ExpiryMixIn
+from .profilingmixin import ProfilingMixIn
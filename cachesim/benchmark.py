@@ -0,0 +1,228 @@
+"""
+Benchmark suite of the simulation hot path: Cache._recv() throughput of the caches, throughput of the readers, eviction
+cost against the number of cached objects, and peak memory per million requests. Results are written to a JSON file,
+and compared to a baseline file, if given.
+
+    python -m cachesim.benchmark [output.json [baseline.json]]
+"""
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+from collections import deque
+from typing import Callable, Dict, List
+
+import numpy as np
+
+from cachesim import Cache, Request, Trace
+from cachesim.caches import FIFOCache, ProtectedFIFOCache, NonCache, LRUCache, LFUCache, HeapLFUCache, SLRUCache, \
+    ARCCache, TwoQCache, S3FIFOCache, GDSFCache
+from cachesim.readers import ConstantReader, CSVReader, PopulationReader, RandomReader, WorkloadReader
+from cachesim.workload import Zipf, Lognormal, Constant
+
+# name: factory of the caches for a totalsize
+CACHES = {
+    'FIFOCache': FIFOCache,
+    'ProtectedFIFOCache': lambda totalsize: ProtectedFIFOCache(totalsize, max(totalsize // 100, 1)),
+    'NonCache': lambda totalsize: NonCache(),
+    'LRUCache': LRUCache,
+    'LFUCache': LFUCache,
+    'HeapLFUCache': HeapLFUCache,
+    'SLRUCache': SLRUCache,
+    'ARCCache': ARCCache,
+    'TwoQCache': TwoQCache,
+    'S3FIFOCache': S3FIFOCache,
+    'GDSFCache': GDSFCache,
+}
+
+# slower when larger (linear scans), measured on a share of the requests only
+SLOW = {'LFUCache': 20}
+
+
+def _result(benchmark: str, name: str, value: float, unit: str, **params) -> dict:
+    return {'benchmark': benchmark, 'name': name, **params, 'value': value, 'unit': unit}
+
+
+def _key(result: dict) -> tuple:
+    return tuple((k, v) for k, v in result.items() if k not in ['value', 'unit'])
+
+
+def _consume(iterator):
+    deque(iterator, maxlen=0)
+
+
+def recv(trace: Trace, totalsize: int, caches: Dict[str, Callable[[int], Cache]] = CACHES) -> List[dict]:
+    """
+    Requests per second of Cache._recv(), the requests are created before the measurement.
+
+    :param trace: The requests.
+    :param totalsize: Size of the caches.
+    :param caches: Factories of the caches by name, called with the size.
+    """
+    results = []
+    for name, factory in caches.items():
+        requests = list(trace[:len(trace) // SLOW.get(name, 1)])
+        cache = factory(totalsize)
+        start = time.perf_counter()
+        _consume(map(cache._recv, requests))
+        results.append(_result('recv', name, len(requests) / (time.perf_counter() - start), 'requests/s'))
+    return results
+
+
+def readers(totalcount: int, objectcount: int) -> List[dict]:
+    """
+    Requests per second of the readers.
+
+    :param totalcount: Requests to read.
+    :param objectcount: Objects of the population.
+    """
+    population = [Request(0, str(i), i % 1000 + 1, 3600) for i in range(objectcount)]
+    factories = {
+        'ConstantReader': lambda: ConstantReader(totalcount, Request(0, 'a', 1, 3600)),
+        'RandomReader': lambda: RandomReader(totalcount),
+        'PopulationReader': lambda: PopulationReader(totalcount, population,
+                                                     weights=[1 / (i + 1) for i in range(objectcount)], rate=100),
+    }
+
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'trace.csv')
+        with open(path, 'w') as file:
+            for request in PopulationReader(min(totalcount, 1000000), population, weights=[1] * objectcount,
+                                            rate=100):
+                file.write(f"{request.time},{request.hash},{request._size},{request._maxage}\n")
+        factories['CSVReader'] = lambda: CSVReader(totalcount, path)
+
+        for name, factory in factories.items():
+            reader = factory()
+            start = time.perf_counter()
+            _consume(reader)
+            results.append(_result('reader', name, totalcount / (time.perf_counter() - start), 'requests/s'))
+
+    return results
+
+
+def eviction(counts: List[int], batch: int, caches: Dict[str, Callable[[int], Cache]] = CACHES) -> List[dict]:
+    """
+    Cost of a request against the number of cached objects: a full caches of unit sized objects gets hits on the
+    cached objects and misses triggering evictions alternately.
+
+    :param counts: Numbers of cached objects.
+    :param batch: Requests measured.
+    :param caches: Factories of the caches by name, called with the size.
+    """
+    results = []
+    for name, factory in caches.items():
+        for count in counts:
+            # linear scans, quadratic fill
+            if count > 10 ** 4 and name in SLOW:
+                continue
+
+            cache = factory(count)
+            for i in range(int(count * .95)):
+                cache._recv(Request(0, i, 1, 3600))
+            requests = [Request(1, count + i if i % 2 else i // 2 % int(count * .9), 1, 3600) for i in range(batch)]
+
+            start = time.perf_counter()
+            _consume(map(cache._recv, requests))
+            elapsed = time.perf_counter() - start
+            results.append(_result('eviction', name, elapsed / batch * 1e9, 'ns/request', objects=count))
+    return results
+
+
+def memory(trace: Trace, totalsize: int, caches: Dict[str, Callable[[int], Cache]] = CACHES) -> List[dict]:
+    """
+    Peak memory per million requests of run() (the caches, its statistics and the requests in flight) and of
+    simulate() (the batch engine and its result columns) on a trace already in memory.
+
+    :param trace: The requests.
+    :param totalsize: Size of the caches.
+    :param caches: Factories of the caches by name, called with the size.
+    """
+    results = []
+    for name, factory in caches.items():
+        requests = trace[:len(trace) // SLOW.get(name, 1)]
+        for engine in ['run', 'simulate']:
+            cache = factory(totalsize)
+            tracemalloc.start()
+            getattr(cache, engine)(requests)
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            results.append(_result('memory', name, peak / 2 ** 20 / len(requests) * 10 ** 6,
+                                   'MiB/1M requests', engine=engine))
+    return results
+
+
+def run(scale: float = 1.0) -> dict:
+    """
+    Runs the suite.
+
+    :param scale: Multiplier of the number of requests, for quick runs.
+    :return: Platform details and the results, a list of {benchmark, name, [parameters], value, unit}.
+    """
+    assert scale > 0, f"I expect a positive scale, got '{scale}'"
+    totalcount = max(int(10 ** 6 * scale), 1000)
+    objectcount = max(totalcount // 10, 100)
+
+    # zipf popularity with lognormal sizes, caches size is 5% of the content base
+    workload = Zipf(objectcount, 0.8, size=Lognormal(10000, 1.5), maxage=Constant(10 ** 9), rate=1000)
+    trace = Trace.fromreader(WorkloadReader(totalcount, workload, seed=0))
+    totalsize = objectcount * 10000 // 20
+
+    results = []
+    results += recv(trace, totalsize)
+    results += readers(totalcount, objectcount)
+    results += eviction([10 ** e for e in range(3, 7) if 10 ** e <= totalcount], max(totalcount // 10, 1000))
+    results += memory(trace[:totalcount // 10], totalsize)
+
+    return {'python': platform.python_version(), 'numpy': np.__version__, 'platform': platform.platform(),
+            'processor': platform.processor(), 'time': time.strftime('%Y-%m-%dT%H:%M:%S'), 'scale': scale,
+            'results': results}
+
+
+def compare(baseline: dict, current: dict, tolerance: float = .1) -> List[dict]:
+    """
+    Compares the results of two runs. Higher is better for requests/s, lower for the other units.
+
+    :param baseline: Results of the reference run.
+    :param current: Results of the actual run.
+    :param tolerance: Relative change accepted as noise.
+    :return: The results found in both, with the baseline value, the ratio to it, and a regression flag.
+    """
+    reference = {_key(result): result['value'] for result in baseline['results']}
+    comparison = []
+    for result in current['results']:
+        base = reference.get(_key(result))
+        if base is None or not base:
+            continue
+
+        ratio = result['value'] / base
+        worse = ratio < 1 - tolerance if result['unit'] == 'requests/s' else ratio > 1 + tolerance
+        comparison.append({**result, 'baseline': base, 'ratio': ratio, 'regression': worse})
+    return comparison
+
+
+def _table(results: List[dict]):
+    for result in results:
+        params = ' '.join(f"{k}={v}" for k, v in result.items()
+                          if k not in ['benchmark', 'name', 'value', 'unit', 'baseline', 'ratio', 'regression'])
+        line = f"{result['benchmark']:>9} {result['name']:>18} {params:>15} {result['value']:>14.1f} {result['unit']}"
+        if 'ratio' in result:
+            line += f"  {result['ratio']:.2f}x{'  REGRESSION' if result['regression'] else ''}"
+        print(line)
+
+
+if __name__ == "__main__":
+    output = sys.argv[1] if len(sys.argv) > 1 else 'benchmark.json'
+    report = run()
+    with open(output, 'w') as file:
+        json.dump(report, file, indent=1)
+
+    if len(sys.argv) > 2:
+        with open(sys.argv[2]) as file:
+            _table(compare(json.load(file), report))
+    else:
+        _table(report['results'])
@@ -1,9 +1,17 @@
 from abc import ABC, abstractmethod
-from copy import copy
-from typing import Optional, Tuple
+from copy import deepcopy
+from typing import Hashable, Optional, Tuple, TYPE_CHECKING
+
+import numpy as np
 
 from cachesim import Reader, Request
 from cachesim import Status
+from cachesim import Trace, STATUSES
+from cachesim import Stats
+
+if TYPE_CHECKING:
+    # for the annotation only, cachesim.progress imports this package
+    from cachesim.progress import Progress
 
 
 class Cache(ABC):
@@ -27,9 +35,65 @@ class Cache(ABC):
         """Total size of the caches."""
         return self.__totalsize
 
+    @property
+    def objectcount(self) -> int:
+        """Overload to tell the number of cached objects (see ProfilingMixIn)."""
+        raise NotImplementedError(f"{self.__class__.__name__} does not count its objects")
+
     def map(self, reader: Reader):
         return map(self._recv, reader)
 
+    def run(self, reader: Reader, stats: Optional[Stats] = None, progress: Optional['Progress'] = None) -> Stats:
+        """
+        Processes all requests of the reader. Results are aggregated on the fly, nothing is kept per request.
+
+        :param reader: The reader.
+        :param stats: Statistics to update, e.g. WindowedStats (optional).
+        :param progress: Progress to report requests/s, CHR and BHR to, updated in chunks (optional, see Progress).
+        :return: The statistics.
+        """
+        if stats is None:
+            stats = Stats()
+
+        if progress is not None:
+            return progress.track(self.map(reader), stats)
+
+        add = stats.add
+        for result in self.map(reader):
+            add(*result)
+
+        return stats
+
+    def simulate(self, trace: Trace) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Batch simulation of a columnar trace, the state of this caches is not changed. This generic implementation runs
+        map() on a copy of the caches, models may overload it with array based engines giving the same results.
+
+        :param trace: The trace.
+        :return: Status codes (index of STATUSES) and caches size after each request.
+        """
+        cache = deepcopy(self)
+        codes = {status: code for code, status in enumerate(STATUSES)}
+
+        status = np.empty(len(trace), dtype=np.int8)
+        size = np.zeros(len(trace), dtype=np.int64)
+        for i, result in enumerate(map(cache._recv, trace)):
+            status[i] = codes[result[1]]
+            if len(result) > 2:
+                size[i] = result[2]
+
+        return status, size
+
+    def _overloaded(self, cls: type) -> bool:
+        """
+        Checks, if the request processing has been customized compared to cls, so a batch engine written for cls
+        cannot be used.
+
+        :param cls: Class the batch engine was written for.
+        """
+        return any(getattr(type(self), name) is not getattr(cls, name)
+                   for name in ['_recv', '_lookup', '_admit', '_store', '_treshold', '_evict'])
+
     # def imap(self, requests: Iterable[Request], chunksize: int = 1):
     #     self.map(requests)
     #
@@ -66,19 +130,24 @@ class Cache(ABC):
         :param request: The request
         :return: Request status (Status).
         """
-        # check the object in the caches, make a copy to overwrite attributes.
-        stored = copy(self._lookup(request))
+        # check the object in the caches
+        stored = self._lookup(request)
 
         # in caches?
         if stored is not None:
 
             # retrieved from caches, ttl expired?
             if not stored.isexpired(request.time):
-                # update timestamp to reflect current time
-                stored.time = request.time
+                # "serv" object from caches: the request gets the stored metadata, the stored object is not changed
+                request._size = stored._size
+                request._maxage = stored._maxage
+                request.fetched = True
 
-                # "serv" object from caches
-                return self._log(stored, Status.HIT)
+                return self._log(request, Status.HIT)
+
+            # expired, drop the stored copy and fetch again (caches without _remove() store over the stale copy)
+            if type(self)._remove is not Cache._remove:
+                self._remove(request.hash)
 
         # MISS: not in caches or expired --> just simulate fetch!
         request.fetched = True
@@ -148,5 +217,25 @@ class Cache(ABC):
         """
         pass
 
+    def _remove(self, hash: Hashable) -> Optional[Request]:
+        """
+        Overload this method to remove an object from the caches, used to drop expired objects (required by
+        ExpiryMixIn). Ghost entries or statistics of the removed object are not expected to be kept. Without it, expired
+        objects are stored again over the stale copy.
+
+        :param hash: Hash of the object.
+        :return: The removed object, None if not in caches.
+        """
+        raise NotImplementedError(f"{self.__class__.__name__} does not support removing objects")
+
+    def _victim(self) -> Optional[Hashable]:
+        """
+        Overload this method to tell the hash of the object to be evicted next, if known. Used by admission policies
+        comparing the fetched object to the victim (see TinyLFUMixIn).
+
+        :return: Hash of the next evicted object, or None if unknown.
+        """
+        return None
+
     def _log(self, request: Request, status: Status):
         return request, status
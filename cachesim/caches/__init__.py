@@ -2,3 +2,10 @@ from .fifocache import FIFOCache
 from .noncache import NonCache
 from .protectedfifocache import ProtectedFIFOCache
 from .lfucache import LFUCache
+from .heaplfucache import HeapLFUCache
+from .lrucache import LRUCache
+from .slrucache import SLRUCache
+from .arccache import ARCCache
+from .twoqcache import TwoQCache
+from .s3fifocache import S3FIFOCache
+from .gdsfcache import GDSFCache
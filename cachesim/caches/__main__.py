@@ -0,0 +1,46 @@
+"""
+Compares the caches on the same trace: throughput of run() and simulate() (batch engine, where the caches has one),
+CHR and BHR.
+
+    python -m cachesim.caches [totalcount]
+"""
+import sys
+import time
+
+import numpy as np
+
+from cachesim import Trace, Stats
+from cachesim.caches import FIFOCache, ProtectedFIFOCache, LRUCache, SLRUCache, ARCCache, TwoQCache, S3FIFOCache, \
+    LFUCache, HeapLFUCache, GDSFCache
+from cachesim.readers import WorkloadReader
+from cachesim.workload import Zipf, Lognormal
+
+# zipf popularity over 100k objects with lognormal sizes, caches size is 5% of the content base
+totalcount = int(sys.argv[1]) if len(sys.argv) > 1 else 1000000
+objectcount = 100000
+workload = Zipf(objectcount, 0.8, size=Lognormal(10000, 1.5), maxage=np.full(objectcount, 10 ** 9), rate=1000)
+trace = Trace.fromreader(WorkloadReader(totalcount, workload, seed=0))
+totalsize = int(objectcount * 10000 * 0.05)
+
+factories = [lambda: FIFOCache(totalsize), lambda: ProtectedFIFOCache(totalsize, totalsize // 100),
+             lambda: LRUCache(totalsize), lambda: SLRUCache(totalsize), lambda: ARCCache(totalsize),
+             lambda: TwoQCache(totalsize), lambda: S3FIFOCache(totalsize), lambda: LFUCache(totalsize),
+             lambda: HeapLFUCache(totalsize), lambda: GDSFCache(totalsize)]
+
+print(f"{len(trace)} requests, {trace.objectcount} objects, caches size {totalsize} Byte")
+print(f"{'caches':>20}{'run req/s':>12}{'simulate req/s':>16}{'CHR':>8}{'BHR':>8}")
+for factory in factories:
+    cache = factory()
+
+    # linear eviction scan, too slow for the whole trace
+    requests = trace[:len(trace) // 20] if type(cache) is LFUCache else trace
+
+    start = time.perf_counter()
+    stats = cache.run(requests)
+    run = len(requests) / (time.perf_counter() - start)
+
+    start = time.perf_counter()
+    Stats.fromsimulation(requests, *factory().simulate(requests))
+    simulate = len(requests) / (time.perf_counter() - start)
+
+    print(f"{type(cache).__name__:>20}{run:>12.0f}{simulate:>16.0f}{stats.chr * 100:>7.2f}%{stats.bhr * 100:>7.2f}%")
@@ -0,0 +1,148 @@
+from collections import OrderedDict
+from typing import Hashable, Optional
+
+from cachesim import Request
+from cachesim import PBarMixIn
+from cachesim.caches import FIFOCache
+from cachesim.readers import PopulationReader
+
+
+class ARCCache(FIFOCache):
+    """
+    Adaptive replacement caches model (Megiddo and Modha), in Byte: objects requested once are kept in the recent
+    list (T1), objects requested again in the frequent list (T2), both in LRU order. Evicted objects are remembered in
+    ghost lists (B1, B2). A request for a ghost adapts the target size of T1 (p): recent ghosts grow it, frequent ghosts
+    shrink it. Eviction takes T1 objects while T1 is larger than p, T2 objects otherwise.
+    """
+
+    def __init__(self, totalsize: int):
+        super().__init__(totalsize)
+
+        # T1 is _cache
+        self._recentsize = 0
+        self._frequent = OrderedDict()  # T2, hash: request
+
+        # ghosts, hash: size
+        self._recentghosts = OrderedDict()  # B1
+        self._recentghostsize = 0
+        self._frequentghosts = OrderedDict()  # B2
+        self._frequentghostsize = 0
+
+        # target size of T1
+        self._p = 0
+
+    @property
+    def p(self) -> float:
+        return self._p
+
+    @property
+    def objectcount(self) -> int:
+        return len(self._cache) + len(self._frequent)
+
+    def _lookup(self, requested: Request) -> Optional[Request]:
+        hash = requested.hash
+        stored = self._frequent.get(hash)
+        if stored is not None:
+            self._frequent.move_to_end(hash)
+            return stored
+
+        stored = self._cache.pop(hash, None)
+        if stored is not None:
+            self._recentsize -= stored.size
+            self._frequent[hash] = stored
+            return stored
+
+        # miss, adapt to ghost hits before eviction
+        if hash in self._recentghosts:
+            size = self._recentghosts[hash]
+            delta = max(self._frequentghostsize / max(self._recentghostsize, 1), 1) * size
+            self._p = min(self._p + delta, self.totalsize)
+        elif hash in self._frequentghosts:
+            size = self._frequentghosts[hash]
+            delta = max(self._recentghostsize / max(self._frequentghostsize, 1), 1) * size
+            self._p = max(self._p - delta, 0)
+
+        return None
+
+    def _store(self, fetched: Request):
+        hash = fetched.hash
+        assert hash not in self._cache and hash not in self._frequent, f"Object {fetched} already in caches"
+
+        # ghosts enter T2, new objects T1
+        if hash in self._recentghosts:
+            self._recentghostsize -= self._recentghosts.pop(hash)
+            self._frequent[hash] = fetched
+        elif hash in self._frequentghosts:
+            self._frequentghostsize -= self._frequentghosts.pop(hash)
+            self._frequent[hash] = fetched
+        else:
+            self._cache[hash] = fetched
+            self._recentsize += fetched.size
+        self.size += fetched.size
+
+        # limit the ghosts: T1 and B1 to totalsize, all lists to twice totalsize
+        while self._recentghosts and self._recentsize + self._recentghostsize > self.totalsize:
+            _, size = self._recentghosts.popitem(last=False)
+            self._recentghostsize -= size
+        while self._frequentghosts and \
+                self.size + self._recentghostsize + self._frequentghostsize > 2 * self.totalsize:
+            _, size = self._frequentghosts.popitem(last=False)
+            self._frequentghostsize -= size
+
+    def _remove(self, hash: Hashable) -> Optional[Request]:
+        # not remembered as a ghost, the object was not evicted
+        removed = self._frequent.pop(hash, None)
+        if removed is None:
+            removed = self._cache.pop(hash, None)
+            if removed is None:
+                return None
+            self._recentsize -= removed.size
+
+        self.size -= removed.size
+        return removed
+
+    def _victim(self) -> Optional[Hashable]:
+        # same choice as _evict()
+        if self._cache and (self._recentsize > self._p or not self._frequent):
+            return next(iter(self._cache))
+        return next(iter(self._frequent), None)
+
+    def _evict(self):
+        """
+        ARC caches, evict from T1 while it is above its target size, from T2 otherwise
+        """
+
+        # evict till caches reaches 90%
+        while self.size / self.totalsize > self.thlow:
+            if self._cache and (self._recentsize > self._p or not self._frequent):
+                hash, evicted = self._cache.popitem(last=False)
+                self._recentsize -= evicted.size
+                self._recentghosts[hash] = evicted.size
+                self._recentghostsize += evicted.size
+            else:
+                hash, evicted = self._frequent.popitem(last=False)
+                self._frequentghosts[hash] = evicted.size
+                self._frequentghostsize += evicted.size
+            self.size -= evicted.size
+
+
+if __name__ == "__main__":
+    import random
+
+    # zipf like popularity over 10k objects, caches size is 10% of the content base
+    count = 10000
+    population = [Request(0, str(i), random.randint(1, 100), 3600 * 24) for i in range(count)]
+    reader = PopulationReader(1000000, population, weights=[1 / (i + 1) for i in range(count)])
+
+
+    class MyCache(PBarMixIn, ARCCache):
+        pass
+
+
+    cache = MyCache(totalsize=int(count * 50 * 0.1))
+
+    stats = cache.run(reader)
+
+    print(f"Requests: {stats.requests}")
+    print(f"CHR: {stats.chr * 100:.2f}%")
+    print(f"Bytes sent: {stats.bytes} Byte")
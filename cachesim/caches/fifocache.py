@@ -1,7 +1,10 @@
-from typing import Optional
+from collections import OrderedDict
+from typing import Hashable, Optional, Tuple
+
+import numpy as np
 
 from cachesim import Request
-from cachesim import Cache, Status, PBarMixIn
+from cachesim import Cache, Status, PBarMixIn, Trace, HIT, MISS, PASS
 from cachesim.readers import ConstantReader
 
 
@@ -13,11 +16,8 @@ class FIFOCache(Cache):
     def __init__(self, totalsize: int):
         super().__init__(totalsize)
 
-        # store metadata indexed by hash
-        self._cache = {}
-
-        # keep track of indexes entering the caches
-        self._index = []
+        # store metadata indexed by hash, in the order of entering the caches (oldest first)
+        self._cache = OrderedDict()
 
         # actual size of the caches
         self._size = 0
@@ -31,22 +31,29 @@ class FIFOCache(Cache):
         assert v >= 0, f"Size must be non negative, received '{v}'"
         self._size = v
 
-    def _lookup(self, requested: Request) -> Optional[Request]:
-        if requested.hash not in self._index:
-            return None
+    @property
+    def objectcount(self) -> int:
+        return len(self._cache)
 
-        return self._cache[requested.hash]
+    def _lookup(self, requested: Request) -> Optional[Request]:
+        return self._cache.get(requested.hash)
 
     def _admit(self, fetched: Request) -> bool:
         # check if object fit into the caches (should not normally happen, eviction should be triggered first)
         return self.size + fetched.size <= self.totalsize
 
     def _store(self, fetched: Request):
-        assert fetched.hash not in self._index, f"Object {fetched} already in caches: {self._cache[fetched.hash]}"
+        assert fetched.hash not in self._cache, f"Object {fetched} already in caches: {self._cache[fetched.hash]}"
         self._cache[fetched.hash] = fetched
-        self._index.append(fetched.hash)
         self.size += fetched.size
 
+    def _remove(self, hash: Hashable) -> Optional[Request]:
+        removed = self._cache.pop(hash, None)
+        if removed is not None:
+            self.size -= removed.size
+
+        return removed
+
     @property
     def thlow(self):
         return .9
@@ -62,17 +69,87 @@ class FIFOCache(Cache):
 
         # evict till caches reaches 90%
         while self.size / self.totalsize > self.thlow:
-            hash_to_delete = self._index.pop(0)
-            evicted = self._cache.pop(hash_to_delete)
+            _, evicted = self._cache.popitem(last=False)
             self.size -= evicted.size
 
     @property
     def _treshold(self) -> bool:
         return self.size / self.totalsize > self.thhigh
 
+    def _victim(self) -> Optional[Hashable]:
+        return next(iter(self._cache), None)
+
     def _log(self, request: Request, status: Status):
         return super()._log(request, status) + (self.size,)
 
+    def simulate(self, trace: Trace) -> Tuple[np.ndarray, np.ndarray]:
+        if self._overloaded(FIFOCache) or self._cache:
+            return super().simulate(trace)
+
+        return self._simulate(trace, self.totalsize)
+
+    def _simulate(self, trace: Trace, limit: int, lru: bool = False) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Array based FIFO engine, starting with an empty caches.
+
+        :param trace: The trace.
+        :param limit: Objects larger than this are not admitted.
+        :param lru: Move objects to the end of the queue on hit (LRU).
+        """
+        totalsize, thlow, thhigh = self.totalsize, self.thlow, self.thhigh
+        status = np.empty(len(trace), dtype=np.int8)
+        occupancy = np.empty(len(trace), dtype=np.int64)
+
+        # state indexed by object id, entered is None for objects not in caches
+        entered = [None] * trace.objectcount
+        storedsize = [0] * trace.objectcount
+        storedmaxage = [0] * trace.objectcount
+        order = OrderedDict()
+        size = 0
+
+        start = 0
+        for time, id, objsize, maxage in trace.chunks():
+            st = []
+            oc = []
+            for t, o, s, m in zip(time, id, objsize, maxage):
+                e = entered[o]
+                if e is not None:
+                    if not e + storedmaxage[o] < t:
+                        if lru:
+                            order.move_to_end(o)
+                        st.append(HIT)
+                        oc.append(size)
+                        continue
+
+                    # expired, drop the stored copy and fetch again
+                    del order[o]
+                    entered[o] = None
+                    size -= storedsize[o]
+
+                if m > 0 and s <= totalsize and s <= limit and size + s <= totalsize:
+                    if size / totalsize > thhigh:
+                        while size / totalsize > thlow:
+                            evicted, _ = order.popitem(last=False)
+                            entered[evicted] = None
+                            size -= storedsize[evicted]
+
+                    entered[o] = t
+                    storedsize[o] = s
+                    storedmaxage[o] = m
+                    order[o] = None
+                    size += s
+                    st.append(MISS)
+                else:
+                    st.append(PASS)
+
+                oc.append(size)
+
+            status[start:start + len(st)] = st
+            occupancy[start:start + len(oc)] = oc
+            start += len(st)
+
+        return status, occupancy
+
 
 if __name__ == "__main__":
     totalcount = 10000000
@@ -85,9 +162,26 @@ if __name__ == "__main__":
 
     cache = MyCache(totalsize=int(1000))
 
-    req, sta, cac = zip(*list(cache.map(reader)))
-
-    hit = sta.count(Status.HIT)
-    print(f"Requests: {len(sta)}")
-    print(f"CHR: {hit / len(sta) * 100:.2f}%")
-    print(f"Bytes sent: {sum(r.size for r in req)} Byte")
+    stats = cache.run(reader)
+
+    print(f"Requests: {stats.requests}")
+    print(f"CHR: {stats.chr * 100:.2f}%")
+    print(f"Bytes sent: {stats.bytes} Byte")
+
+    # per request cost should not depend on the number of cached objects
+    import time
+
+    for count in [10 ** e for e in range(3, 8)]:
+        cache = FIFOCache(totalsize=count)
+        for i in range(count):
+            cache._store(Request(0, str(i), 1, 3600, True))
+
+        # alternate hits on cached objects and misses triggering evictions
+        batch = 100000
+        requests = [Request(1, str(count + i) if i % 2 else str(count - 1 - i % (count // 2)), 1, 3600)
+                    for i in range(batch)]
+        start = time.perf_counter()
+        for request in requests:
+            cache._recv(request)
+        elapsed = time.perf_counter() - start
+        print(f"{count:>9} objects: {elapsed / batch * 1e9:.0f} ns/request")
@@ -0,0 +1,108 @@
+from heapq import heappop, heappush, heapreplace
+from typing import Hashable, Optional
+
+from cachesim import Request
+from cachesim import PBarMixIn
+from cachesim.caches import LFUCache
+from cachesim.readers import PopulationReader
+
+
+class GDSFCache(LFUCache):
+    """
+    Greedy dual size frequency caches model (Cherkasova): objects have a priority of L + frequency / size, the one with
+    the lowest priority is evicted, and L (the inflation clock) is raised to its priority. Small, frequently requested
+    objects are kept, objects not requested for long age out. Priorities are kept on a heap, like in HeapLFUCache.
+    """
+
+    def __init__(self, totalsize: int):
+        super().__init__(totalsize)
+
+        # inflation clock
+        self._clock = 0.0
+
+        # hash: priority, with (priority, store sequence, hash) entries on the heap, one per cached object. Outdated
+        # entries are pushed back with the actual priority when they reach the top of the heap, entries of removed
+        # objects are dropped.
+        self._priority = {}
+        self._heap = []
+        self._counter = 0
+        self._seq = {}  # hash: store sequence of the entry
+
+    @property
+    def clock(self) -> float:
+        return self._clock
+
+    def _lookup(self, requested: Request) -> Optional[Request]:
+        stored = super()._lookup(requested)
+        if stored is not None:
+            self._priority[requested.hash] = self._clock + (self._index[requested.hash] + 1) / max(stored.size, 1)
+
+        return stored
+
+    def _store(self, fetched: Request):
+        super()._store(fetched)
+        priority = self._priority[fetched.hash] = self._clock + 1 / max(fetched.size, 1)
+        heappush(self._heap, (priority, self._counter, fetched.hash))
+        self._seq[fetched.hash] = self._counter
+        self._counter += 1
+
+    def _remove(self, hash: Hashable) -> Optional[Request]:
+        self._priority.pop(hash, None)
+        self._seq.pop(hash, None)
+        return super()._remove(hash)
+
+    def _top(self) -> Optional[Hashable]:
+        """Drops entries of removed objects and pushes back outdated ones, till the top entry is the actual one."""
+        heap = self._heap
+        while heap:
+            priority, seq, hash = heap[0]
+            if self._seq.get(hash) != seq:
+                heappop(heap)
+            # requested since pushed, priorities only grow, so the entry's place is further down
+            elif self._priority[hash] != priority:
+                heapreplace(heap, (self._priority[hash], seq, hash))
+            else:
+                return hash
+
+        return None
+
+    def _evict(self):
+        """
+        GDSF caches, evict the object with the lowest priority
+        """
+
+        # evict till caches reaches 90%
+        while self.size / self.totalsize > self.thlow:
+            hash_to_delete = self._top()
+            heappop(self._heap)
+
+            self._clock = self._priority.pop(hash_to_delete)
+            self._seq.pop(hash_to_delete)
+            self._index.pop(hash_to_delete)
+            evicted = self._cache.pop(hash_to_delete)
+            self.size -= evicted.size
+
+    def _victim(self) -> Optional[Hashable]:
+        return self._top()
+
+
+if __name__ == "__main__":
+    import random
+
+    # zipf like popularity over 10k objects, caches size is 10% of the content base
+    count = 10000
+    population = [Request(0, str(i), random.randint(1, 100), 3600 * 24) for i in range(count)]
+    reader = PopulationReader(1000000, population, weights=[1 / (i + 1) for i in range(count)])
+
+
+    class MyCache(PBarMixIn, GDSFCache):
+        pass
+
+
+    cache = MyCache(totalsize=int(count * 50 * 0.1))
+
+    stats = cache.run(reader)
+
+    print(f"Requests: {stats.requests}")
+    print(f"CHR: {stats.chr * 100:.2f}%")
+    print(f"Bytes sent: {stats.bytes} Byte")
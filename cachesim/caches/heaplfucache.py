@@ -0,0 +1,103 @@
+from heapq import heappop, heappush, heapreplace
+from typing import Hashable, Optional, Tuple
+
+import numpy as np
+
+from cachesim import Request
+from cachesim import PBarMixIn, Trace
+from cachesim.caches import LFUCache
+from cachesim.readers import RandomReader
+
+
+class HeapLFUCache(LFUCache):
+    """
+    Same as LFUCache, but the least frequently used object is found on a heap in O(log n) instead of a linear scan of
+    the index. Ties are broken in store order, just like in LFUCache.
+    """
+
+    def __init__(self, totalsize: int):
+        super().__init__(totalsize)
+
+        # (count, store sequence, hash) entries, one per cached object. Counts are not updated on lookup, outdated
+        # entries are pushed back with the actual count when they reach the top of the heap.
+        self._heap = []
+
+        # store sequence for breaking ties, and the one of the entry of each cached object, entries of removed objects
+        # are outdated
+        self._counter = 0
+        self._seq = {}  # hash: store sequence
+
+    def _store(self, fetched: Request):
+        super()._store(fetched)
+        heappush(self._heap, (0, self._counter, fetched.hash))
+        self._seq[fetched.hash] = self._counter
+        self._counter += 1
+
+    def _remove(self, hash: Hashable) -> Optional[Request]:
+        self._seq.pop(hash, None)
+        return super()._remove(hash)
+
+    def _top(self) -> Optional[Hashable]:
+        """Drops entries of removed objects and pushes back outdated ones, till the top entry is the actual one."""
+        heap = self._heap
+        while heap:
+            count, seq, hash = heap[0]
+            if self._seq.get(hash) != seq:
+                heappop(heap)
+            # requested since pushed, counts only grow, so the entry's place is further down
+            elif self._index[hash] != count:
+                heapreplace(heap, (self._index[hash], seq, hash))
+            else:
+                return hash
+
+        return None
+
+    def _evict(self):
+        """
+        LFU caches, evict least frequently used objects first
+        """
+
+        # evict till caches reaches 90%
+        while self.size / self.totalsize > self.thlow:
+            hash_to_delete = self._top()
+            heappop(self._heap)
+
+            self._index.pop(hash_to_delete)
+            self._seq.pop(hash_to_delete)
+            evicted = self._cache.pop(hash_to_delete)
+            self.size -= evicted.size
+
+    def _victim(self) -> Optional[Hashable]:
+        return self._top()
+
+    def simulate(self, trace: Trace) -> Tuple[np.ndarray, np.ndarray]:
+        # same results as LFUCache
+        if self._overloaded(HeapLFUCache) or self._cache:
+            return super(LFUCache, self).simulate(trace)
+
+        return self._simulate(trace)
+
+
+if __name__ == "__main__":
+    import random
+    import time
+
+    totalcount = 200000
+
+    for cls in [LFUCache, HeapLFUCache]:
+        random.seed(0)
+        reader = RandomReader(totalcount, hashlen=2, sizegen=int(1))
+
+
+        class MyCache(PBarMixIn, cls):
+            pass
+
+
+        # caches size is 10% of content base (2 byte hashlen allows 2^16 different objects)
+        cache = MyCache(totalsize=int(2 ** 16 * 0.1))
+
+        start = time.perf_counter()
+        stats = cache.run(reader)
+        elapsed = time.perf_counter() - start
+
+        print(f"{cls.__name__}: {totalcount / elapsed:.0f} requests/s, CHR: {stats.chr * 100:.2f}%")
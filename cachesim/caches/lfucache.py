@@ -1,7 +1,10 @@
-from typing import Optional
+from heapq import heappop, heappush
+from typing import Hashable, Optional, Tuple
+
+import numpy as np
 
 from cachesim import Request
-from cachesim import Cache, Status, PBarMixIn
+from cachesim import Cache, Status, PBarMixIn, Trace, HIT, MISS, PASS
 from cachesim.readers import RandomReader
 
 
@@ -31,6 +34,10 @@ class LFUCache(Cache):
         assert v >= 0, f"Size must be non negative, received '{v}'"
         self._size = v
 
+    @property
+    def objectcount(self) -> int:
+        return len(self._index)
+
     def _lookup(self, requested: Request) -> Optional[Request]:
         if requested.hash not in self._index:
             return None
@@ -49,6 +56,14 @@ class LFUCache(Cache):
         self._cache[fetched.hash] = fetched
         self.size += fetched.size
 
+    def _remove(self, hash: Hashable) -> Optional[Request]:
+        if self._index.pop(hash, None) is None:
+            return None
+
+        removed = self._cache.pop(hash)
+        self.size -= removed.size
+        return removed
+
     @property
     def thlow(self):
         return .9
@@ -73,9 +88,90 @@ class LFUCache(Cache):
     def _treshold(self) -> bool:
         return self.size / self.totalsize > self.thhigh
 
+    def _victim(self) -> Optional[Hashable]:
+        """Linear scan of the index, O(n) on each call, see HeapLFUCache for large caches."""
+        return min(self._index, key=self._index.get) if self._index else None
+
     def _log(self, request: Request, status: Status):
         return super()._log(request, status) + (self.size,)
 
+    def simulate(self, trace: Trace) -> Tuple[np.ndarray, np.ndarray]:
+        if self._overloaded(LFUCache) or self._cache:
+            return super().simulate(trace)
+
+        return self._simulate(trace)
+
+    def _simulate(self, trace: Trace) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Array based LFU engine, starting with an empty caches. The least frequently used object is found on a heap of
+        (count, store sequence, id) entries, which are pushed back with the actual count when found outdated on top.
+
+        :param trace: The trace.
+        """
+        totalsize, thlow, thhigh = self.totalsize, self.thlow, self.thhigh
+        status = np.empty(len(trace), dtype=np.int8)
+        occupancy = np.empty(len(trace), dtype=np.int64)
+
+        # state indexed by object id, entered is None for objects not in caches
+        entered = [None] * trace.objectcount
+        storedsize = [0] * trace.objectcount
+        storedmaxage = [0] * trace.objectcount
+        count = [0] * trace.objectcount
+        seq = [0] * trace.objectcount
+        heap = []
+        counter = 0
+        size = 0
+
+        start = 0
+        for time, id, objsize, maxage in trace.chunks():
+            st = []
+            oc = []
+            for t, o, s, m in zip(time, id, objsize, maxage):
+                e = entered[o]
+                if e is not None:
+                    count[o] += 1
+                    if not e + storedmaxage[o] < t:
+                        st.append(HIT)
+                        oc.append(size)
+                        continue
+
+                    # expired, drop the stored copy and fetch again, its heap entry gets outdated
+                    entered[o] = None
+                    size -= storedsize[o]
+
+                if m > 0 and s <= totalsize and size + s <= totalsize:
+                    if size / totalsize > thhigh:
+                        while size / totalsize > thlow:
+                            c, q, evicted = heappop(heap)
+                            if entered[evicted] is None or seq[evicted] != q:
+                                continue
+                            if count[evicted] != c:
+                                heappush(heap, (count[evicted], q, evicted))
+                                continue
+
+                            entered[evicted] = None
+                            size -= storedsize[evicted]
+
+                    entered[o] = t
+                    storedsize[o] = s
+                    storedmaxage[o] = m
+                    count[o] = 0
+                    seq[o] = counter
+                    heappush(heap, (0, counter, o))
+                    counter += 1
+                    size += s
+                    st.append(MISS)
+                else:
+                    st.append(PASS)
+
+                oc.append(size)
+
+            status[start:start + len(st)] = st
+            occupancy[start:start + len(oc)] = oc
+            start += len(st)
+
+        return status, occupancy
+
 
 if __name__ == "__main__":
     totalcount = 200000
@@ -89,9 +185,8 @@ if __name__ == "__main__":
     # chr should be around 10%
     cache = MyCache(totalsize=int(2**16*0.1))
 
-    req, sta, cac = zip(*list(cache.map(reader)))
+    stats = cache.run(reader)
 
-    hit = sta.count(Status.HIT)
-    print(f"Requests: {len(sta)}")
-    print(f"CHR: {hit / len(sta) * 100:.2f}%")
-    print(f"Bytes sent: {sum(r.size for r in req)} Byte")
+    print(f"Requests: {stats.requests}")
+    print(f"CHR: {stats.chr * 100:.2f}%")
+    print(f"Bytes sent: {stats.bytes} Byte")
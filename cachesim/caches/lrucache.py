@@ -0,0 +1,49 @@
+from typing import Optional, Tuple
+
+import numpy as np
+
+from cachesim import Request
+from cachesim import PBarMixIn, Trace
+from cachesim.caches import FIFOCache
+from cachesim.readers import PopulationReader
+
+
+class LRUCache(FIFOCache):
+    """
+    LRU (least recently used) caches model: same as FIFOCache, but objects are moved to the end of the queue on hit.
+    """
+
+    def _lookup(self, requested: Request) -> Optional[Request]:
+        stored = self._cache.get(requested.hash)
+        if stored is not None:
+            self._cache.move_to_end(requested.hash)
+
+        return stored
+
+    def simulate(self, trace: Trace) -> Tuple[np.ndarray, np.ndarray]:
+        if self._overloaded(LRUCache) or self._cache:
+            return super(FIFOCache, self).simulate(trace)
+
+        return self._simulate(trace, self.totalsize, lru=True)
+
+
+if __name__ == "__main__":
+    import random
+
+    # zipf like popularity over 10k objects, caches size is 10% of the content base
+    count = 10000
+    population = [Request(0, str(i), random.randint(1, 100), 3600 * 24) for i in range(count)]
+    reader = PopulationReader(1000000, population, weights=[1 / (i + 1) for i in range(count)])
+
+
+    class MyCache(PBarMixIn, LRUCache):
+        pass
+
+
+    cache = MyCache(totalsize=int(count * 50 * 0.1))
+
+    stats = cache.run(reader)
+
+    print(f"Requests: {stats.requests}")
+    print(f"CHR: {stats.chr * 100:.2f}%")
+    print(f"Bytes sent: {stats.bytes} Byte")
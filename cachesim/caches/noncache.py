@@ -1,7 +1,9 @@
-from typing import Optional
+from typing import Hashable, Optional, Tuple
+
+import numpy as np
 
 from cachesim import Request
-from cachesim import Cache, Status, PBarMixIn
+from cachesim import Cache, PBarMixIn, Trace, PASS
 from cachesim.readers import ConstantReader
 
 
@@ -13,6 +15,10 @@ class NonCache(Cache):
     def __init__(self):
         super().__init__(totalsize=0)
 
+    @property
+    def objectcount(self) -> int:
+        return 0
+
     def _lookup(self, requested: Request) -> Optional[Request]:
         # object is never in caches
         return None
@@ -27,11 +33,21 @@ class NonCache(Cache):
     def _evict(self):
         pass
 
+    def _remove(self, hash: Hashable) -> Optional[Request]:
+        return None
+
     @property
     def _treshold(self) -> bool:
         # no need to eviction
         return False
 
+    def simulate(self, trace: Trace) -> Tuple[np.ndarray, np.ndarray]:
+        if self._overloaded(NonCache):
+            return super().simulate(trace)
+
+        # every request is passed
+        return np.full(len(trace), PASS, dtype=np.int8), np.zeros(len(trace), dtype=np.int64)
+
 
 if __name__ == "__main__":
     totalcount = 10000000
@@ -44,9 +60,8 @@ if __name__ == "__main__":
 
     cache = MyCache()
 
-    req, sta = zip(*list(cache.map(reader)))
+    stats = cache.run(reader)
 
-    hit = sta.count(Status.HIT)
-    print(f"Requests: {len(sta)}")
-    print(f"CHR: {hit / len(sta) * 100:.2f}%")
-    print(f"Bytes sent: {sum(r.size for r in req)} Byte")
+    print(f"Requests: {stats.requests}")
+    print(f"CHR: {stats.chr * 100:.2f}%")
+    print(f"Bytes sent: {stats.bytes} Byte")
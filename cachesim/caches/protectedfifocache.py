@@ -1,5 +1,9 @@
+from typing import Tuple
+
+import numpy as np
+
 from cachesim import Request
-from cachesim import Status, PBarMixIn
+from cachesim import PBarMixIn, Trace
 from cachesim.caches import FIFOCache
 from cachesim.readers import ConstantReader
 
@@ -23,6 +27,12 @@ class ProtectedFIFOCache(FIFOCache):
 
         return super()._admit(fetched)
 
+    def simulate(self, trace: Trace) -> Tuple[np.ndarray, np.ndarray]:
+        if self._overloaded(ProtectedFIFOCache) or self._cache:
+            return super(FIFOCache, self).simulate(trace)
+
+        return self._simulate(trace, self._limit)
+
 
 if __name__ == "__main__":
     totalcount = 10000000
@@ -35,9 +45,8 @@ if __name__ == "__main__":
 
     cache = MyCache(totalsize=int(totalcount * 0.1))
 
-    req, sta, cac = zip(*list(cache.map(reader)))
+    stats = cache.run(reader)
 
-    hit = sta.count(Status.HIT)
-    print(f"Requests: {len(sta)}")
-    print(f"CHR: {hit / len(sta) * 100:.2f}%")
-    print(f"Bytes sent: {sum(r.size for r in req)} Byte")
+    print(f"Requests: {stats.requests}")
+    print(f"CHR: {stats.chr * 100:.2f}%")
+    print(f"Bytes sent: {stats.bytes} Byte")
@@ -0,0 +1,131 @@
+from collections import OrderedDict
+from typing import Hashable, Optional
+
+from cachesim import Request
+from cachesim import PBarMixIn
+from cachesim.caches import FIFOCache
+from cachesim.readers import PopulationReader
+
+
+class S3FIFOCache(FIFOCache):
+    """
+    S3-FIFO caches model (Yang et al.): new objects enter the small FIFO queue, objects requested while remembered in
+    the ghost queue enter the main FIFO queue. Hits only increment a counter capped at 3. Eviction takes from the small
+    queue while it is above its share: objects hit more than once move to the main queue, others to the ghost queue.
+    From the main queue, objects with hits are reinserted with a decremented counter, others are evicted.
+    """
+
+    def __init__(self, totalsize: int, small: float = .1):
+        """
+        :param totalsize: Size of the caches.
+        :param small: Share of the small queue.
+        """
+        super().__init__(totalsize)
+
+        assert 0 < small < 1, f"small must be in (0, 1), got: '{small}'"
+        self._smallshare = small
+
+        # small queue is _cache
+        self._smallsize = 0
+        self._main = OrderedDict()  # hash: request
+        self._ghosts = OrderedDict()  # hash: size, as large as the main queue
+        self._ghostsize = 0
+        self._freq = {}  # hash: hits, 0 to 3
+
+    @property
+    def objectcount(self) -> int:
+        return len(self._cache) + len(self._main)
+
+    def _lookup(self, requested: Request) -> Optional[Request]:
+        hash = requested.hash
+        stored = self._cache.get(hash)
+        if stored is None:
+            stored = self._main.get(hash)
+        if stored is not None and self._freq[hash] < 3:
+            self._freq[hash] += 1
+
+        return stored
+
+    def _store(self, fetched: Request):
+        hash = fetched.hash
+        assert hash not in self._freq, f"Object {fetched} already in caches"
+
+        if hash in self._ghosts:
+            self._ghostsize -= self._ghosts.pop(hash)
+            self._main[hash] = fetched
+        else:
+            self._cache[hash] = fetched
+            self._smallsize += fetched.size
+        self._freq[hash] = 0
+        self.size += fetched.size
+
+    def _remove(self, hash: Hashable) -> Optional[Request]:
+        removed = self._main.pop(hash, None)
+        if removed is None:
+            removed = self._cache.pop(hash, None)
+            if removed is None:
+                return None
+            self._smallsize -= removed.size
+
+        del self._freq[hash]
+        self.size -= removed.size
+        return removed
+
+    def _victim(self) -> Optional[Hashable]:
+        # same choice as _evict(), objects at the head with hits would be moved or reinserted, good enough for a guess
+        if self._cache and (self._smallsize > self.totalsize * self._smallshare or not self._main):
+            return next(iter(self._cache))
+        return next(iter(self._main), None)
+
+    def _evict(self):
+        """
+        S3-FIFO caches, evict from the small queue while it is above its share, from the main queue otherwise
+        """
+
+        # evict till caches reaches 90%
+        while self.size / self.totalsize > self.thlow:
+            if self._cache and (self._smallsize > self.totalsize * self._smallshare or not self._main):
+                hash, evicted = self._cache.popitem(last=False)
+                self._smallsize -= evicted.size
+                if self._freq[hash] > 1:
+                    self._freq[hash] = 0
+                    self._main[hash] = evicted
+                    continue
+
+                self._ghosts[hash] = evicted.size
+                self._ghostsize += evicted.size
+            else:
+                hash, evicted = self._main.popitem(last=False)
+                if self._freq[hash] > 0:
+                    self._freq[hash] -= 1
+                    self._main[hash] = evicted
+                    continue
+
+            del self._freq[hash]
+            self.size -= evicted.size
+
+        while self._ghostsize > self.totalsize * (1 - self._smallshare):
+            _, size = self._ghosts.popitem(last=False)
+            self._ghostsize -= size
+
+
+if __name__ == "__main__":
+    import random
+
+    # zipf like popularity over 10k objects, caches size is 10% of the content base
+    count = 10000
+    population = [Request(0, str(i), random.randint(1, 100), 3600 * 24) for i in range(count)]
+    reader = PopulationReader(1000000, population, weights=[1 / (i + 1) for i in range(count)])
+
+
+    class MyCache(PBarMixIn, S3FIFOCache):
+        pass
+
+
+    cache = MyCache(totalsize=int(count * 50 * 0.1))
+
+    stats = cache.run(reader)
+
+    print(f"Requests: {stats.requests}")
+    print(f"CHR: {stats.chr * 100:.2f}%")
+    print(f"Bytes sent: {stats.bytes} Byte")
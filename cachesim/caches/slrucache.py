@@ -0,0 +1,112 @@
+from collections import OrderedDict
+from typing import Hashable, Optional
+
+from cachesim import Request
+from cachesim import PBarMixIn
+from cachesim.caches import FIFOCache
+from cachesim.readers import PopulationReader
+
+
+class SLRUCache(FIFOCache):
+    """
+    Segmented LRU caches model: new objects enter the probationary segment, objects hit there are promoted to the
+    protected segment. The protected segment is limited to a share of the caches, its least recently used objects are
+    demoted to the probationary segment. Eviction takes the least recently used probationary objects first.
+    """
+
+    def __init__(self, totalsize: int, protected: float = .8):
+        """
+        :param totalsize: Size of the caches.
+        :param protected: Share of the protected segment.
+        """
+        super().__init__(totalsize)
+
+        assert 0 <= protected < 1, f"protected must be in [0, 1), got: '{protected}'"
+        self._protectedshare = protected
+
+        # probationary segment is _cache, both segments are in LRU order (least recently used first)
+        self._protected = OrderedDict()
+        self._protectedsize = 0
+
+    @property
+    def protectedsize(self) -> int:
+        return self._protectedsize
+
+    @property
+    def objectcount(self) -> int:
+        return len(self._cache) + len(self._protected)
+
+    def _lookup(self, requested: Request) -> Optional[Request]:
+        hash = requested.hash
+        stored = self._protected.get(hash)
+        if stored is not None:
+            self._protected.move_to_end(hash)
+            return stored
+
+        stored = self._cache.pop(hash, None)
+        if stored is None:
+            return None
+
+        # promote, demote least recently used protected objects above the share
+        self._protected[hash] = stored
+        self._protectedsize += stored.size
+        while self._protectedsize > self.totalsize * self._protectedshare:
+            demoted, request = self._protected.popitem(last=False)
+            self._protectedsize -= request.size
+            self._cache[demoted] = request
+
+        return stored
+
+    def _store(self, fetched: Request):
+        assert fetched.hash not in self._protected, \
+            f"Object {fetched} already in caches: {self._protected[fetched.hash]}"
+        super()._store(fetched)
+
+    def _remove(self, hash: Hashable) -> Optional[Request]:
+        removed = self._protected.pop(hash, None)
+        if removed is None:
+            return super()._remove(hash)
+
+        self._protectedsize -= removed.size
+        self.size -= removed.size
+        return removed
+
+    def _victim(self) -> Optional[Hashable]:
+        # same choice as _evict()
+        return next(iter(self._cache if self._cache else self._protected), None)
+
+    def _evict(self):
+        """
+        SLRU caches, evict least recently used probationary objects first, then protected ones
+        """
+
+        # evict till caches reaches 90%
+        while self.size / self.totalsize > self.thlow:
+            if self._cache:
+                _, evicted = self._cache.popitem(last=False)
+            else:
+                _, evicted = self._protected.popitem(last=False)
+                self._protectedsize -= evicted.size
+            self.size -= evicted.size
+
+
+if __name__ == "__main__":
+    import random
+
+    # zipf like popularity over 10k objects, caches size is 10% of the content base
+    count = 10000
+    population = [Request(0, str(i), random.randint(1, 100), 3600 * 24) for i in range(count)]
+    reader = PopulationReader(1000000, population, weights=[1 / (i + 1) for i in range(count)])
+
+
+    class MyCache(PBarMixIn, SLRUCache):
+        pass
+
+
+    cache = MyCache(totalsize=int(count * 50 * 0.1))
+
+    stats = cache.run(reader)
+
+    print(f"Requests: {stats.requests}")
+    print(f"CHR: {stats.chr * 100:.2f}%")
+    print(f"Bytes sent: {stats.bytes} Byte")
@@ -0,0 +1,57 @@
+import random
+from unittest import TestCase
+
+from cachesim import Request
+from cachesim.caches import ARCCache
+from cachesim.readers import PopulationReader
+
+
+class TestARCCache(TestCase):
+    def test_arccache(self):
+        cache = ARCCache(100)
+        for i in range(48):
+            cache._recv(Request(i, str(i), 1, 3600))
+            cache._recv(Request(i, str(i), 1, 3600))
+        for i in range(48, 96):
+            cache._recv(Request(i, str(i), 1, 3600))
+        self.assertEqual([str(i) for i in range(48)], list(cache._frequent))
+        self.assertEqual([str(i) for i in range(48, 96)], list(cache._cache))
+
+        # T1 is above p (0), its least recently used objects become ghosts
+        cache._recv(Request(100, '96', 1, 3600))
+        self.assertEqual([str(i) for i in range(48, 54)], list(cache._recentghosts))
+        self.assertEqual(91, cache.size)
+
+        # ghost hit grows p, the object enters T2
+        cache._recv(Request(101, '48', 1, 3600))
+        self.assertEqual(1, cache.p)
+        self.assertEqual('48', list(cache._frequent)[-1])
+        self.assertEqual([str(i) for i in range(49, 54)], list(cache._recentghosts))
+
+        # T1 is not above p, T2 is evicted into B2, then T1 as T2 got empty
+        cache = ARCCache(100)
+        cache._p = 100
+        for i in range(96):
+            cache._recv(Request(i, str(i), 1, 3600))
+        cache._recv(Request(100, '0', 1, 3600))
+        cache._recv(Request(101, '96', 1, 3600))
+        self.assertEqual(['0'], list(cache._frequentghosts))
+        self.assertEqual([str(i) for i in range(1, 6)], list(cache._recentghosts))
+
+        # B2 hit shrinks p, by the ratio of the ghost lists
+        cache._recv(Request(102, '0', 1, 3600))
+        self.assertEqual(95, cache.p)
+
+    def test_size(self):
+        count = 1000
+        population = [Request(0, str(i), random.randint(1, 100), 3600 * 24) for i in range(count)]
+        cache = ARCCache(3000)
+        for request, status, size in cache.map(PopulationReader(20000, population,
+                                                                weights=[1 / (i + 1) for i in range(count)])):
+            self.assertLessEqual(size, 3000)
+            self.assertTrue(0 <= cache.p <= 3000)
+        self.assertEqual(cache.size, sum(r.size for r in list(cache._cache.values()) + list(cache._frequent.values())))
+        self.assertEqual(cache._recentghostsize, sum(cache._recentghosts.values()))
+        self.assertEqual(cache._frequentghostsize, sum(cache._frequentghosts.values()))
+        self.assertLessEqual(cache.size + cache._recentghostsize + cache._frequentghostsize, 2 * 3000)
+        self.assertFalse(set(cache._recentghosts) & set(cache._frequentghosts))
@@ -41,6 +41,21 @@ class TestFIFOCache(TestCase):
         self.assertTrue(all(r.fetched for r in requests))
         self.assertTrue(all(r.hash == request.hash for r in requests))
 
+    def test_evict(self):
+        totalsize = 100
+        cache = FIFOCache(totalsize)
+        for i in range(96):
+            cache._recv(Request(i, str(i), 1, 3600))
+
+        # 96% > thhigh, next store evicts the oldest objects till 90%
+        self.assertTrue(cache._treshold)
+        cache._recv(Request(96, '96', 1, 3600))
+        self.assertEqual(91, cache.size)
+        self.assertIsNone(cache._lookup(Request(96, '5', 1, 3600)))
+        self.assertIsNotNone(cache._lookup(Request(96, '6', 1, 3600)))
+        self.assertIsNotNone(cache._lookup(Request(96, '96', 1, 3600)))
+        self.assertEqual([str(i) for i in range(6, 97)], list(cache._cache))
+
     def test_chr(self):
         # create readers with 100, in avg. 300 Byte large random requests. Total content base is around 300kB
         totalcount = 1000
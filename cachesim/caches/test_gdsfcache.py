@@ -0,0 +1,61 @@
+import random
+from unittest import TestCase
+
+from cachesim import Request
+from cachesim.caches import GDSFCache, HeapLFUCache
+from cachesim.readers import PopulationReader
+
+
+class TestGDSFCache(TestCase):
+    def test_gdsfcache(self):
+        cache = GDSFCache(100)
+        cache._recv(Request(0, 'big', 51, 3600))
+        for i in range(9):
+            cache._recv(Request(i, str(i), 5, 3600))
+
+        # the big object has the lowest priority
+        cache._recv(Request(10, 'new', 1, 3600))
+        self.assertIsNone(cache._lookup(Request(11, 'big', 51, 3600)))
+        self.assertEqual(46, cache.size)
+        self.assertAlmostEqual(1 / 51, cache.clock)
+        self.assertAlmostEqual(1 / 51 + 1, cache._priority['new'])
+
+        # frequency counts
+        for _ in range(3):
+            cache._recv(Request(12, '0', 5, 3600))
+        self.assertAlmostEqual(1 / 51 + 4 / 5, cache._priority['0'])
+
+    def test_victim(self):
+        cache = GDSFCache(100)
+        for h, size in [('a', 10), ('b', 5), ('c', 1)]:
+            cache._recv(Request(0, h, size, 3600))
+        self.assertEqual('a', cache._victim())
+
+        # removed objects are no victims
+        cache._remove('a')
+        self.assertEqual('b', cache._victim())
+
+        # priorities raised by requests
+        for _ in range(2):
+            cache._recv(Request(1, 'b', 5, 3600))
+        self.assertEqual(min(cache._priority, key=cache._priority.get), cache._victim())
+        cache._recv(Request(2, 'd', 20, 3600))
+        self.assertEqual('d', cache._victim())
+
+    def test_size(self):
+        # small objects are preferred: higher CHR, but lower BHR than LFU
+        count = 1000
+        random.seed(1)
+        population = [Request(0, str(i), random.choice([1, 10, 100]), 3600 * 24) for i in range(count)]
+        weights = [1 / (i + 1) for i in range(count)]
+        random.seed(2)
+        cache = GDSFCache(3000)
+        stats = cache.run(PopulationReader(20000, population, weights=weights))
+        random.seed(2)
+        lfu = HeapLFUCache(3000).run(PopulationReader(20000, population, weights=weights))
+
+        self.assertGreater(stats.chr, lfu.chr + .05)
+        self.assertLess(stats.bhr, lfu.bhr)
+        self.assertLessEqual(stats.maxoccupancy, 3000)
+        self.assertEqual(cache.size, sum(r.size for r in cache._cache.values()))
+        self.assertEqual(set(cache._priority), set(cache._cache))
@@ -0,0 +1,63 @@
+import random
+from unittest import TestCase
+
+from cachesim import Request
+from cachesim.caches import LFUCache, HeapLFUCache
+from cachesim.readers import PopulationReader
+
+
+class TestHeapLFUCache(TestCase):
+    def test_heaplfucache(self):
+        totalsize = 100
+        cache = HeapLFUCache(totalsize)
+        for i in range(96):
+            cache._recv(Request(i, str(i), 1, 3600))
+
+        # use all but object '3' and '7'
+        for i in range(96):
+            if i not in [3, 7]:
+                cache._recv(Request(100 + i, str(i), 1, 3600))
+
+        # next store evicts 6 objects, never used ones first, then the oldest of the used ones
+        cache._recv(Request(200, 'new', 1, 3600))
+        self.assertEqual(91, cache.size)
+        self.assertEqual(0, cache._index['new'])
+        for h in ['3', '7', '0', '1', '2', '4']:
+            self.assertNotIn(h, cache._index)
+        for h in ['5', '6', '8', '95']:
+            self.assertEqual(1, cache._index[h])
+
+    def test_victim(self):
+        cache = HeapLFUCache(100)
+        for h in ['a', 'b', 'c']:
+            cache._recv(Request(0, h, 1, 3600))
+        self.assertEqual('a', cache._victim())
+
+        # removed objects are no victims
+        cache._remove('a')
+        self.assertEqual('b', cache._victim())
+
+        # the least frequently used one, though all entries were pushed with count 0
+        for _ in range(2):
+            cache._recv(Request(1, 'b', 1, 3600))
+        cache._recv(Request(1, 'c', 1, 3600))
+        self.assertEqual('c', cache._victim())
+        self.assertEqual(min(cache._index, key=cache._index.get), cache._victim())
+
+    def test_parity(self):
+        # zipf like popularity, content base is around 30kB, caches size is 10% of that
+        count = 1000
+        population = [Request(0, "%x" % random.getrandbits(8 * 8), random.randint(1, 60), 3600) for x in range(count)]
+        weights = [1 / (i + 1) for i in range(count)]
+
+        random.seed(1)
+        reader = PopulationReader(20000, population=population, weights=weights)
+        expected = list(LFUCache(totalsize=3000).map(reader))
+
+        random.seed(1)
+        reader = PopulationReader(20000, population=population, weights=weights)
+        cache = HeapLFUCache(totalsize=3000)
+        actual = list(cache.map(reader))
+
+        self.assertEqual([(r.hash, s, c) for r, s, c in expected], [(r.hash, s, c) for r, s, c in actual])
+        self.assertEqual(len(cache._index), len(cache._heap))
@@ -0,0 +1,31 @@
+import random
+from unittest import TestCase
+
+from cachesim import Request, Trace, STATUSES
+from cachesim.caches import LRUCache
+from cachesim.readers import PopulationReader
+
+
+class TestLRUCache(TestCase):
+    def test_lrucache(self):
+        totalsize = 100
+        cache = LRUCache(totalsize)
+        for i in range(96):
+            cache._recv(Request(i, str(i), 1, 3600))
+
+        # use the oldest objects, next store evicts the least recently used ones till 90%
+        for i in range(6):
+            cache._recv(Request(100 + i, str(i), 1, 3600))
+        cache._recv(Request(200, '96', 1, 3600))
+        self.assertEqual(91, cache.size)
+        self.assertEqual([str(i) for i in range(12, 96)] + [str(i) for i in range(6)] + ['96'], list(cache._cache))
+
+    def test_simulate(self):
+        count = 1000
+        population = [Request(0, str(i), random.randint(1, 100), 3600 * 24) for i in range(count)]
+        trace = Trace.fromreader(PopulationReader(20000, population, weights=[1 / (i + 1) for i in range(count)]))
+
+        status, size = LRUCache(3000).simulate(trace)
+        expected = list(LRUCache(3000).map(trace))
+        self.assertEqual([r[1] for r in expected], [STATUSES[s] for s in status])
+        self.assertEqual([r[2] for r in expected], size.tolist())
@@ -0,0 +1,51 @@
+import random
+from unittest import TestCase
+
+from cachesim import Request
+from cachesim.caches import S3FIFOCache
+from cachesim.readers import PopulationReader
+
+
+class TestS3FIFOCache(TestCase):
+    def test_s3fifocache(self):
+        cache = S3FIFOCache(100)
+        for i in range(96):
+            cache._recv(Request(i, str(i), 1, 3600))
+        for _ in range(2):
+            cache._recv(Request(100, '0', 1, 3600))
+        cache._recv(Request(100, '1', 1, 3600))
+
+        # hit more than once moves to the main queue, others go to the ghost queue
+        cache._recv(Request(101, '96', 1, 3600))
+        self.assertEqual(['0'], list(cache._main))
+        self.assertEqual(0, cache._freq['0'])
+        self.assertEqual([str(i) for i in range(1, 7)], list(cache._ghosts))
+        self.assertEqual(91, cache.size)
+
+        # requested while a ghost, enters the main queue
+        cache._recv(Request(102, '1', 1, 3600))
+        self.assertEqual(['0', '1'], list(cache._main))
+        self.assertEqual([str(i) for i in range(2, 7)], list(cache._ghosts))
+
+        # main queue objects with hits are reinserted
+        cache = S3FIFOCache(10, small=.5)
+        for i in range(10):
+            cache._store(Request(i, str(i), 1, 3600, True))
+            cache._main[str(i)] = cache._cache.pop(str(i))
+        cache._smallsize = 0
+        cache._recv(Request(10, '0', 1, 3600))
+        cache._evict()
+        self.assertEqual(['2', '3', '4', '5', '6', '7', '8', '9', '0'], list(cache._main))
+        self.assertEqual(0, cache._freq['0'])
+
+    def test_size(self):
+        count = 1000
+        population = [Request(0, str(i), random.randint(1, 100), 3600 * 24) for i in range(count)]
+        cache = S3FIFOCache(3000)
+        for request, status, size in cache.map(PopulationReader(20000, population,
+                                                                weights=[1 / (i + 1) for i in range(count)])):
+            self.assertLessEqual(size, 3000)
+        self.assertEqual(cache.size, sum(r.size for r in list(cache._cache.values()) + list(cache._main.values())))
+        self.assertEqual(set(cache._freq), set(cache._cache) | set(cache._main))
+        self.assertTrue(all(0 <= f <= 3 for f in cache._freq.values()))
+        self.assertEqual(cache._ghostsize, sum(cache._ghosts.values()))
@@ -0,0 +1,50 @@
+import random
+from unittest import TestCase
+
+from cachesim import Request
+from cachesim.caches import SLRUCache
+from cachesim.readers import PopulationReader
+
+
+class TestSLRUCache(TestCase):
+    def test_slrucache(self):
+        totalsize = 100
+        cache = SLRUCache(totalsize, protected=.2)
+        for i in range(96):
+            cache._recv(Request(i, str(i), 1, 3600))
+
+        # hits promote, the protected segment keeps the 20 most recently used, the others are demoted
+        for i in range(25):
+            cache._recv(Request(100 + i, str(i), 1, 3600))
+        self.assertEqual(20, cache.protectedsize)
+        self.assertEqual([str(i) for i in range(5, 25)], list(cache._protected))
+        self.assertEqual([str(i) for i in range(25, 96)] + [str(i) for i in range(5)], list(cache._cache))
+
+        # next store evicts probationary objects first
+        cache._recv(Request(200, '96', 1, 3600))
+        self.assertEqual(91, cache.size)
+        for i in range(25, 31):
+            self.assertIsNone(cache._lookup(Request(200, str(i), 1, 3600)))
+        self.assertIsNotNone(cache._lookup(Request(200, '0', 1, 3600)))
+
+        # protected objects go, when no probationary left
+        cache = SLRUCache(100, protected=.99)
+        for i in range(96):
+            cache._recv(Request(i, str(i), 1, 3600))
+            cache._recv(Request(i, str(i), 1, 3600))
+        self.assertEqual(0, len(cache._cache))
+        cache._recv(Request(100, '96', 1, 3600))
+        self.assertEqual([str(i) for i in range(6, 96)], list(cache._protected))
+        self.assertEqual(['96'], list(cache._cache))
+        self.assertEqual(91, cache.size)
+
+    def test_size(self):
+        count = 1000
+        population = [Request(0, str(i), random.randint(1, 100), 3600 * 24) for i in range(count)]
+        cache = SLRUCache(3000)
+        for request, status, size in cache.map(PopulationReader(20000, population,
+                                                                weights=[1 / (i + 1) for i in range(count)])):
+            self.assertLessEqual(size, 3000)
+        self.assertEqual(cache.size, sum(r.size for r in cache._cache.values()) + cache.protectedsize)
+        self.assertEqual(cache.protectedsize, sum(r.size for r in cache._protected.values()))
+        self.assertLessEqual(cache.protectedsize, 3000 * .8)
@@ -0,0 +1,40 @@
+import random
+from unittest import TestCase
+
+from cachesim import Request
+from cachesim.caches import TwoQCache
+from cachesim.readers import PopulationReader
+
+
+class TestTwoQCache(TestCase):
+    def test_twoqcache(self):
+        cache = TwoQCache(100)
+        for i in range(96):
+            cache._recv(Request(i, str(i), 1, 3600))
+
+        # hits in A1in do not change its order
+        cache._recv(Request(100, '0', 1, 3600))
+        self.assertEqual([str(i) for i in range(96)], list(cache._cache))
+
+        # A1in is above its share, the oldest objects go to A1out
+        cache._recv(Request(101, '96', 1, 3600))
+        self.assertEqual([str(i) for i in range(6)], list(cache._ghosts))
+        self.assertEqual(91, cache.size)
+
+        # requested while in A1out, enters Am
+        cache._recv(Request(102, '0', 1, 3600))
+        self.assertEqual(['0'], list(cache._main))
+        self.assertEqual([str(i) for i in range(1, 6)], list(cache._ghosts))
+        self.assertEqual(92, cache.size)
+
+    def test_size(self):
+        count = 1000
+        population = [Request(0, str(i), random.randint(1, 100), 3600 * 24) for i in range(count)]
+        cache = TwoQCache(3000)
+        for request, status, size in cache.map(PopulationReader(20000, population,
+                                                                weights=[1 / (i + 1) for i in range(count)])):
+            self.assertLessEqual(size, 3000)
+        self.assertEqual(cache.size, sum(r.size for r in list(cache._cache.values()) + list(cache._main.values())))
+        self.assertEqual(cache._ghostsize, sum(cache._ghosts.values()))
+        self.assertLessEqual(cache._ghostsize, 3000 * .5)
+        self.assertGreater(len(cache._main), 0)
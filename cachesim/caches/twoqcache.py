@@ -0,0 +1,119 @@
+from collections import OrderedDict
+from typing import Hashable, Optional
+
+from cachesim import Request
+from cachesim import PBarMixIn
+from cachesim.caches import FIFOCache
+from cachesim.readers import PopulationReader
+
+
+class TwoQCache(FIFOCache):
+    """
+    2Q caches model (Johnson and Shasha, full version): new objects enter the FIFO queue A1in, objects evicted from
+    there are remembered in the ghost queue A1out. Objects requested while in A1out enter the LRU queue Am. Eviction
+    takes from A1in while it is above its share of the caches, from Am otherwise.
+    """
+
+    def __init__(self, totalsize: int, kin: float = .25, kout: float = .5):
+        """
+        :param totalsize: Size of the caches.
+        :param kin: Share of A1in.
+        :param kout: Size of A1out relative to the caches size, in Byte of the remembered objects.
+        """
+        super().__init__(totalsize)
+
+        assert 0 < kin < 1, f"kin must be in (0, 1), got: '{kin}'"
+        assert kout >= 0, f"kout must be non negative, got: '{kout}'"
+        self._kin = kin
+        self._kout = kout
+
+        # A1in is _cache
+        self._insize = 0
+        self._main = OrderedDict()  # Am, hash: request
+        self._ghosts = OrderedDict()  # A1out, hash: size
+        self._ghostsize = 0
+
+    @property
+    def objectcount(self) -> int:
+        return len(self._cache) + len(self._main)
+
+    def _lookup(self, requested: Request) -> Optional[Request]:
+        hash = requested.hash
+        stored = self._main.get(hash)
+        if stored is not None:
+            self._main.move_to_end(hash)
+            return stored
+
+        # A1in keeps its FIFO order
+        return self._cache.get(hash)
+
+    def _store(self, fetched: Request):
+        hash = fetched.hash
+        assert hash not in self._cache and hash not in self._main, f"Object {fetched} already in caches"
+
+        if hash in self._ghosts:
+            self._ghostsize -= self._ghosts.pop(hash)
+            self._main[hash] = fetched
+        else:
+            self._cache[hash] = fetched
+            self._insize += fetched.size
+        self.size += fetched.size
+
+    def _remove(self, hash: Hashable) -> Optional[Request]:
+        removed = self._main.pop(hash, None)
+        if removed is None:
+            removed = self._cache.pop(hash, None)
+            if removed is None:
+                return None
+            self._insize -= removed.size
+
+        self.size -= removed.size
+        return removed
+
+    def _victim(self) -> Optional[Hashable]:
+        # same choice as _evict()
+        if self._cache and (self._insize > self.totalsize * self._kin or not self._main):
+            return next(iter(self._cache))
+        return next(iter(self._main), None)
+
+    def _evict(self):
+        """
+        2Q caches, evict from A1in into A1out while A1in is above its share, least recently used from Am otherwise
+        """
+
+        # evict till caches reaches 90%
+        while self.size / self.totalsize > self.thlow:
+            if self._cache and (self._insize > self.totalsize * self._kin or not self._main):
+                hash, evicted = self._cache.popitem(last=False)
+                self._insize -= evicted.size
+                self._ghosts[hash] = evicted.size
+                self._ghostsize += evicted.size
+            else:
+                _, evicted = self._main.popitem(last=False)
+            self.size -= evicted.size
+
+        while self._ghostsize > self.totalsize * self._kout:
+            _, size = self._ghosts.popitem(last=False)
+            self._ghostsize -= size
+
+
+if __name__ == "__main__":
+    import random
+
+    # zipf like popularity over 10k objects, caches size is 10% of the content base
+    count = 10000
+    population = [Request(0, str(i), random.randint(1, 100), 3600 * 24) for i in range(count)]
+    reader = PopulationReader(1000000, population, weights=[1 / (i + 1) for i in range(count)])
+
+
+    class MyCache(PBarMixIn, TwoQCache):
+        pass
+
+
+    cache = MyCache(totalsize=int(count * 50 * 0.1))
+
+    stats = cache.run(reader)
+
+    print(f"Requests: {stats.requests}")
+    print(f"CHR: {stats.chr * 100:.2f}%")
+    print(f"Bytes sent: {stats.bytes} Byte")
@@ -0,0 +1,199 @@
+import io
+import pickle
+from collections import OrderedDict
+from typing import Any, BinaryIO, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from cachesim import Cache, Reader, Request
+
+_MAGIC = b'CACHESIM\x01'
+
+# requests of the checkpoint being restored, referred to by index from the pickled state
+_requests = None
+
+
+def _request(i: int) -> Request:
+    return _requests[i]
+
+
+def _dict(cls: type, keys: Optional[list], index: np.ndarray) -> dict:
+    requests = list(map(_requests.__getitem__, index.tolist()))
+    return cls(zip(keys if keys is not None else [request._hash for request in requests], requests))
+
+
+def _list(index: np.ndarray) -> list:
+    return list(map(_requests.__getitem__, index.tolist()))
+
+
+class _Requests:
+    """Placeholder of a dict or list of requests in the pickled state, restored from the table."""
+
+    def __init__(self, reduce: tuple):
+        self._reduce = reduce
+
+    def __reduce__(self):
+        return self._reduce
+
+
+class _Pickler(pickle.Pickler):
+    """
+    Pickles the requests in columns: each request is stored once, in the table of the checkpoint, dicts and lists of
+    requests in the state of caches and readers (the caches content, queues, ...) as index arrays into the table.
+    Requests shared by several structures stay shared on restore.
+    """
+
+    def __init__(self, file: BinaryIO):
+        super().__init__(file, protocol=pickle.HIGHEST_PROTOCOL)
+        self.requests = []
+        self._index = {}  # id of the request: index in requests
+        self._placeholders = {}  # id of the dict or list: (placeholder, the dict or list kept alive)
+
+    def _indices(self, requests: Iterable) -> Optional[np.ndarray]:
+        index, table = self._index, self.requests
+        indices = []
+        for request in requests:
+            if not isinstance(request, Request):
+                return None
+            i = index.get(id(request))
+            if i is None:
+                i = index[id(request)] = len(table)
+                table.append(request)
+            indices.append(i)
+        return np.array(indices, dtype=np.uint32 if len(table) < 1 << 32 else np.int64)
+
+    def _placeholder(self, value: Any) -> Any:
+        """Placeholder of a dict or list of requests, the value itself otherwise."""
+        cls = value.__class__
+        if not ((cls is dict or cls is OrderedDict or cls is list) and value):
+            return value
+
+        placeholder = self._placeholders.get(id(value))
+        if placeholder is None:
+            indices = self._indices(value if cls is list else value.values())
+            if indices is None:
+                return value
+            if cls is list:
+                reduce = _list, (indices,)
+            else:
+                # objects are usually indexed by their hash, not stored twice then
+                keys = list(value)
+                reduce = _dict, (cls, None if keys == [request._hash for request in value.values()] else keys, indices)
+            placeholder = self._placeholders[id(value)] = _Requests(reduce), value
+
+        return placeholder[0]
+
+    def reducer_override(self, obj: Any):
+        if isinstance(obj, Request):
+            return _request, (int(self._indices([obj])[0]),)
+
+        # dicts and lists are pickled natively, only the state of caches and readers is searched for requests
+        if isinstance(obj, (Cache, Reader)):
+            reduce = obj.__reduce_ex__(pickle.HIGHEST_PROTOCOL)
+            if isinstance(reduce, tuple) and len(reduce) > 2 and isinstance(reduce[2], dict):
+                return reduce[:2] + ({name: self._placeholder(value) for name, value in reduce[2].items()},) + \
+                    reduce[3:]
+
+        return NotImplemented
+
+
+def _columns(requests: List[Request]) -> tuple:
+    types = list({type(request): None for request in requests})
+    code = {cls: i for i, cls in enumerate(types)}
+    return (types,
+            np.array([code[type(request)] for request in requests], dtype=np.uint8),
+            np.array([request._time for request in requests], dtype=np.float64),
+            [request._hash for request in requests],
+            np.array([request._size for request in requests], dtype=np.int64),
+            np.array([request._maxage for request in requests], dtype=np.int64),
+            np.array([request._fetched for request in requests], dtype=bool))
+
+
+def _table(columns: tuple) -> List[Request]:
+    types, code, time, hash, size, maxage, fetched = columns
+    if len(types) == 1:
+        return list(map(types[0], time.tolist(), hash, size.tolist(), maxage.tolist(), fetched.tolist()))
+
+    return [types[c](t, h, s, m, f) for c, t, h, s, m, f in
+            zip(code.tolist(), time.tolist(), hash, size.tolist(), maxage.tolist(), fetched.tolist())]
+
+
+def snapshot(path: str, cache: Cache, reader: Optional[Reader] = None):
+    """
+    Saves the state of a caches (its content, index, size, ...) and optionally of a reader (file position, random
+    generator state), so a warmed up caches can be restored many times, without processing the warm up requests again.
+    The requests are stored in binary columns, the rest of the state is pickled.
+
+    :param path: The checkpoint file.
+    :param cache: The caches.
+    :param reader: The reader, to continue from the actual position (optional).
+    """
+    assert isinstance(cache, Cache), f"I expect a Cache, got '{cache}'"
+    assert reader is None or isinstance(reader, Reader), f"I expect a Reader, got '{reader}'"
+
+    # requests are collected while pickling the state, the table is written first
+    state = io.BytesIO()
+    pickler = _Pickler(state)
+    pickler.dump((cache, reader))
+
+    with open(path, 'wb') as file:
+        file.write(_MAGIC)
+        pickle.dump(_columns(pickler.requests), file, protocol=pickle.HIGHEST_PROTOCOL)
+        file.write(state.getbuffer())
+
+
+def restore(path: str) -> Tuple[Cache, Optional[Reader]]:
+    """
+    Loads a checkpoint, see snapshot().
+
+    :param path: The checkpoint file.
+    :return: The caches and the reader, None if not saved.
+    """
+    global _requests
+
+    with open(path, 'rb') as file:
+        assert file.read(len(_MAGIC)) == _MAGIC, f"'{path}' is not a checkpoint"
+
+        _requests = _table(pickle.load(file))
+        try:
+            return pickle.load(file)
+        finally:
+            _requests = None
+
+
+if __name__ == "__main__":
+    import os
+    import random
+    import tempfile
+    import time
+
+    from cachesim.caches import LRUCache
+    from cachesim.readers import PopulationReader
+
+    # 2M warm up requests over 1M objects at 100 requests/s, then the measurement window of the last 1M requests is
+    # run 5 times from the checkpoint (the reader with its population included), caches size is 10% of the content base
+    random.seed(0)
+    count = 1000000
+    population = [Request(0, i, random.randint(1, 1000), 3600 * 24 * 7) for i in range(count)]
+    reader = PopulationReader(3000000, population, weights=[1 / (i + 1) ** .8 for i in range(count)], rate=100)
+    cache = LRUCache(count * 500 // 10)
+
+    start = time.perf_counter()
+    requests = iter(reader)
+    for _ in range(2000000):
+        cache._recv(next(requests))
+    warmup = time.perf_counter() - start
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'checkpoint.bin')
+        start = time.perf_counter()
+        snapshot(path, cache, reader)
+        print(f"Warm up {warmup:.1f}s, snapshot of {len(cache._cache)} objects {time.perf_counter() - start:.1f}s, "
+              f"{os.path.getsize(path) / 2 ** 20:.1f} MiB")
+
+        for window in range(5):
+            start = time.perf_counter()
+            restored, requests = restore(path)
+            elapsed = time.perf_counter() - start
+            stats = restored.run(requests)
+            print(f"Window {window}: restore {elapsed:.1f}s, {stats}")
@@ -0,0 +1,380 @@
+from abc import ABC, abstractmethod
+from bisect import bisect_left
+from collections import deque
+from copy import deepcopy
+from multiprocessing import Pool
+from typing import Callable, Dict, Hashable, Iterable, List, Optional, Tuple, Union
+from zlib import crc32
+
+import numpy as np
+
+from cachesim import Cache, Request, Status, Trace
+
+_MASK = (1 << 64) - 1
+
+# trace shared by the worker processes, set by the pool initializer
+_trace = None
+
+
+def _key(hash: Hashable) -> int:
+    # interned ids as is, others through crc32 of their string form, which does not change from run to run
+    return hash if hash.__class__ is int else crc32(str(hash).encode())
+
+
+def _mix(key: int, salt: int = 0) -> int:
+    """splitmix64 finalizer of key + salt"""
+    z = (key + salt * 0x9E3779B97F4A7C15) & _MASK
+    z = ((z ^ (z >> 30)) * 0xBF58476D1CE4E5B9) & _MASK
+    z = ((z ^ (z >> 27)) * 0x94D049BB133111EB) & _MASK
+    return z ^ (z >> 31)
+
+
+def _mixes(keys: np.ndarray, salt: int = 0) -> np.ndarray:
+    """Same as _mix() for an array of integer keys."""
+    with np.errstate(over='ignore'):
+        z = np.asarray(keys).astype(np.uint64) + np.uint64(salt * 0x9E3779B97F4A7C15 & _MASK)
+        z = (z ^ (z >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+        z = (z ^ (z >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+    return z ^ (z >> np.uint64(31))
+
+
+class Hashing(ABC):
+    """
+    Maps object hashes onto a changing set of nodes.
+    """
+
+    def __init__(self):
+        self._nodes = []
+
+    @property
+    def nodes(self) -> List[Hashable]:
+        """Nodes, in the order added."""
+        return self._nodes
+
+    def add(self, node: Hashable):
+        assert node not in self._nodes, f"Node '{node}' already added"
+        self._nodes.append(node)
+        self._update()
+
+    def remove(self, node: Hashable):
+        assert node in self._nodes, f"Unknown node '{node}'"
+        self._nodes.remove(node)
+        self._update()
+
+    def _update(self):
+        """Overload to rebuild the lookup structures after a change of the nodes."""
+        pass
+
+    @abstractmethod
+    def __call__(self, hash: Hashable) -> Hashable:
+        """
+        Implement to find the node of an object.
+
+        :param hash: The object hash.
+        :return: The node.
+        """
+        pass
+
+    @abstractmethod
+    def lookup(self, id: np.ndarray) -> np.ndarray:
+        """
+        Implement to find the nodes of an array of integer ids, the same way as __call__().
+
+        :param id: Object ids.
+        :return: Index of the node (in nodes) of each id.
+        """
+        pass
+
+
+class Ring(Hashing):
+    """
+    Consistent hashing: every node owns vnodes points on a 64 bit ring, an object belongs to the node of the first
+    point after its hash. Adding or removing a node moves the objects of its points only.
+    """
+
+    def __init__(self, vnodes: int = 100):
+        """
+        :param vnodes: Points of a node on the ring.
+        """
+        super().__init__()
+
+        assert vnodes > 0, f"I expect a positive number of vnodes, got '{vnodes}'"
+        self._vnodes = vnodes
+        self._points = []  # sorted
+        self._owners = []  # node index of the points
+
+    def _update(self):
+        points = sorted((_mix(_key(node), salt=i), n) for n, node in enumerate(self._nodes)
+                        for i in range(self._vnodes))
+        self._points = [point for point, _ in points]
+        self._owners = [n for _, n in points]
+
+    def __call__(self, hash: Hashable) -> Hashable:
+        assert self._nodes, f"Add nodes first"
+        i = bisect_left(self._points, _mix(_key(hash)))
+        return self._nodes[self._owners[i % len(self._points)]]
+
+    def lookup(self, id: np.ndarray) -> np.ndarray:
+        assert self._nodes, f"Add nodes first"
+        i = np.searchsorted(np.array(self._points, dtype=np.uint64), _mixes(id), side='left')
+        return np.array(self._owners)[i % len(self._points)]
+
+
+class Rendezvous(Hashing):
+    """
+    Rendezvous (highest random weight) hashing: an object belongs to the node with the highest hash of the object and
+    node together. Adding or removing a node moves the objects won or lost by it only.
+    """
+
+    def _update(self):
+        self._salts = [_key(node) for node in self._nodes]
+
+    def __call__(self, hash: Hashable) -> Hashable:
+        assert self._nodes, f"Add nodes first"
+        key = _key(hash)
+        weights = [_mix(key, salt) for salt in self._salts]
+        return self._nodes[weights.index(max(weights))]
+
+    def lookup(self, id: np.ndarray) -> np.ndarray:
+        assert self._nodes, f"Add nodes first"
+        owner = np.zeros(len(id), dtype=np.int64)
+        best = _mixes(id, self._salts[0])
+        for n, salt in enumerate(self._salts[1:], 1):
+            weight = _mixes(id, salt)
+            better = weight > best
+            owner[better] = n
+            best[better] = weight[better]
+        return owner
+
+
+def _init(trace: Trace):
+    global _trace
+    _trace = trace
+
+
+def _simulate(task: Tuple[Cache, np.ndarray]) -> Tuple[np.ndarray, np.ndarray]:
+    cache, index = task
+    return cache.simulate(Trace(_trace.time[index], _trace.id[index], _trace.size[index], _trace.maxage[index],
+                                hashes=_trace.hashes, check=False))
+
+
+class ClusterCache(Cache):
+    """
+    Cluster of caches, sharing the objects: each request is routed by its hash to one of the member caches (nodes), see
+    Ring and Rendezvous. Nodes may be added or removed at given times: an added node starts empty, the caches of a
+    removed node is dropped, and the objects remapped to other nodes are fetched again (rebalancing).
+
+    Batch simulation partitions the trace by node, simulates each member with its batch engine on a process pool and
+    merges the results.
+    """
+
+    def __init__(self, factory: Callable[[], Cache], nodes: Union[int, Iterable[Hashable]],
+                 hashing: Optional[Hashing] = None, events: Iterable[Tuple[float, str, Hashable]] = (),
+                 processes: Optional[int] = 1):
+        """
+        :param factory: Creates the caches of a node.
+        :param nodes: Names of the nodes, or their number for nodes 0, 1, ...
+        :param hashing: Maps objects onto the nodes, a Ring without nodes, by default.
+        :param events: (time, 'add' or 'remove', node) changes of the nodes.
+        :param processes: Worker processes of the batch simulation, defaults to the number of CPUs if None, no pool if
+            1.
+        """
+        nodes = list(range(nodes)) if isinstance(nodes, int) else list(nodes)
+        assert nodes, f"I expect at least one node"
+        members = {node: factory() for node in nodes}
+        super().__init__(sum(member.totalsize for member in members.values()))
+
+        self._factory = factory
+        self._hashing = hashing if hashing is not None else Ring()
+        assert not self._hashing.nodes, f"I expect a hashing without nodes, got '{self._hashing.nodes}'"
+        for node in nodes:
+            self._hashing.add(node)
+        self._members = members
+        self._sizes = {node: 0 for node in nodes}  # last known size of the members
+        self._size = 0
+
+        events = sorted(events, key=lambda event: event[0])
+        for _, action, _ in events:
+            assert action in ['add', 'remove'], f"I expect 'add' or 'remove' events, got '{action}'"
+        self._events = deque(events)
+        self._processes = processes
+
+    @property
+    def members(self) -> Dict[Hashable, Cache]:
+        """Caches of the actual nodes."""
+        return self._members
+
+    @property
+    def hashing(self) -> Hashing:
+        return self._hashing
+
+    @property
+    def size(self) -> int:
+        """Size of the members, as last reported by them."""
+        return self._size
+
+    @property
+    def objectcount(self) -> int:
+        return sum(member.objectcount for member in self._members.values())
+
+    def _apply(self, action: str, node: Hashable):
+        if action == 'add':
+            self._hashing.add(node)
+            self._members[node] = self._factory()
+            self._sizes[node] = 0
+        else:
+            self._hashing.remove(node)
+            del self._members[node]
+            self._size -= self._sizes.pop(node)
+
+    def _recv(self, request: Request) -> Tuple[Request, Status]:
+        events = self._events
+        while events and events[0][0] <= request.time:
+            _, action, node = events.popleft()
+            self._apply(action, node)
+
+        node = self._hashing(request.hash)
+        result = self._members[node]._recv(request)
+        if len(result) > 2:
+            self._size += result[2] - self._sizes[node]
+            self._sizes[node] = result[2]
+
+        return result[0], result[1], self._size
+
+    def _lookup(self, requested: Request) -> Optional[Request]:
+        return self._members[self._hashing(requested.hash)]._lookup(requested)
+
+    def _admit(self, fetched: Request) -> bool:
+        return self._members[self._hashing(fetched.hash)]._admit(fetched)
+
+    def _store(self, fetched: Request):
+        self._members[self._hashing(fetched.hash)]._store(fetched)
+
+    def _remove(self, hash: Hashable) -> Optional[Request]:
+        return self._members[self._hashing(hash)]._remove(hash)
+
+    @property
+    def _treshold(self) -> bool:
+        # members evict on their own
+        return False
+
+    def _evict(self):
+        pass
+
+    def partition(self, trace: Trace) -> Tuple[np.ndarray, List[Tuple[Hashable, Cache, Optional[int]]]]:
+        """
+        Routes the requests of a trace, applying the pending events at their time. The state of the cluster is not
+        changed.
+
+        :param trace: The trace, requests in time order.
+        :return: Member index of each request, and the (node, caches, removal) members, where removal is the position
+            of the first request after the node has been removed, None if not removed. A node added again is a new
+            member.
+        """
+        hashing = deepcopy(self._hashing)
+        current = {node: n for n, node in enumerate(self._members)}
+        members = [[node, cache, None] for node, cache in self._members.items()]
+
+        member = np.empty(len(trace), dtype=np.int64)
+        start = 0
+        for time, action, node in list(self._events) + [(np.inf, None, None)]:
+            end = int(np.searchsorted(trace.time, time, side='left'))
+            if end > start:
+                index = np.array([current[node] for node in hashing.nodes])
+                member[start:end] = index[hashing.lookup(trace.id[start:end])]
+                start = end
+
+            if action == 'add':
+                hashing.add(node)
+                current[node] = len(members)
+                members.append([node, self._factory(), None])
+            elif action == 'remove':
+                hashing.remove(node)
+                members[current.pop(node)][2] = end
+
+        return member, [tuple(m) for m in members]
+
+    def remapped(self, trace: Trace) -> np.ndarray:
+        """
+        Flags the requests routed to another member than the previous request of the same object, see partition().
+
+        :param trace: The trace, requests in time order.
+        :return: True for remapped requests.
+        """
+        member, _ = self.partition(trace)
+        order = np.argsort(trace.id, kind='stable')
+        id, member = trace.id[order], member[order]
+        flags = np.zeros(len(trace), dtype=bool)
+        flags[order[1:]] = (id[1:] == id[:-1]) & (member[1:] != member[:-1])
+        return flags
+
+    def simulate(self, trace: Trace) -> Tuple[np.ndarray, np.ndarray]:
+        if self._overloaded(ClusterCache):
+            return super().simulate(trace)
+
+        member, members = self.partition(trace)
+        indices = [np.flatnonzero(member == n) for n in range(len(members))]
+        tasks = [(cache, index) for (_, cache, _), index in zip(members, indices)]
+
+        # the cluster size is merged from the size changes of the members
+        status = np.empty(len(trace), dtype=np.int8)
+        delta = np.zeros(len(trace) + 1, dtype=np.int64)
+        with Pool(self._processes, initializer=_init, initargs=(trace,)) if self._processes != 1 else _Inline(trace) \
+                as pool:
+            for n, ((node, _, removal), index, (s, occupancy)) in enumerate(zip(members, indices,
+                                                                               pool.imap(_simulate, tasks))):
+                initial = self._sizes[node] if n < len(self._members) else 0
+                status[index] = s
+                delta[index] += np.diff(occupancy, prepend=initial)
+                if removal is not None:
+                    delta[removal] -= occupancy[-1] if len(occupancy) else initial
+
+        return status, self._size + np.cumsum(delta[:-1])
+
+
+class _Inline:
+    """Runs the tasks in this process, in place of a Pool."""
+
+    def __init__(self, trace: Trace):
+        self._trace = trace
+
+    def __enter__(self):
+        _init(self._trace)
+        return self
+
+    def __exit__(self, *args):
+        _init(None)
+
+    def imap(self, func: Callable, iterable: Iterable):
+        return map(func, iterable)
+
+
+if __name__ == "__main__":
+    import sys
+    import time
+
+    from cachesim import Stats
+    from cachesim.caches import LRUCache
+    from cachesim.readers import WorkloadReader
+    from cachesim.workload import Zipf, Lognormal, Constant
+
+    # 10M requests over 1M objects on 8 nodes, a node fails at the half of the trace and comes back at 3/4
+    totalcount = int(sys.argv[1]) if len(sys.argv) > 1 else 10000000
+    objectcount = totalcount // 10
+    workload = Zipf(objectcount, 0.8, size=Lognormal(10000, 1.5), maxage=Constant(10 ** 9), rate=1000)
+    trace = Trace.fromreader(WorkloadReader(totalcount, workload, seed=0))
+    nodesize = objectcount * 10000 // 100
+    half, threequarter = trace.time[totalcount // 2], trace.time[totalcount * 3 // 4]
+
+    print(f"{'hashing':>12}{'events':>8}{'processes':>11}{'CHR':>8}{'remapped':>10}{'requests/s':>12}")
+    for hashing in [Ring, Rendezvous]:
+        for events in [[], [(half, 'remove', 3), (threequarter, 'add', 3)]]:
+            for processes in [1, None]:
+                cluster = ClusterCache(lambda: LRUCache(nodesize), 8, hashing=hashing(), events=events,
+                                       processes=processes)
+                remapped = np.count_nonzero(cluster.remapped(trace))
+                start = time.perf_counter()
+                stats = Stats.fromsimulation(trace, *cluster.simulate(trace))
+                elapsed = time.perf_counter() - start
+                print(f"{hashing.__name__:>12}{len(events):>8}{str(processes):>11}{stats.chr * 100:>7.2f}%"
+                      f"{remapped:>10}{totalcount / elapsed:>12.0f}")
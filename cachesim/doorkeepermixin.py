@@ -0,0 +1,31 @@
+from cachesim import Request
+from cachesim.sketch import BloomFilter
+
+
+class DoorkeeperMixIn:
+    """
+    Admits objects on their second request only, one-hit-wonders are never cached. Objects requested before are
+    remembered in a Bloom filter, which is cleared when full (after bits / 10 objects, about 1% false positives). Use it
+    with any caches: class MyCache(DoorkeeperMixIn, FIFOCache)
+    """
+
+    def __init__(self, *args, doorkeepersize: int = 1 << 16, **kwargs):
+        """
+        :param doorkeepersize: Memory of the doorkeeper in Byte.
+        """
+        super().__init__(*args, **kwargs)
+        assert doorkeepersize > 0, f"I expect a positive doorkeepersize, got '{doorkeepersize}'"
+        self._doorkeeper = BloomFilter(8 * doorkeepersize)
+
+    @property
+    def doorkeeper(self) -> BloomFilter:
+        return self._doorkeeper
+
+    def _admit(self, fetched: Request) -> bool:
+        if not super()._admit(fetched):
+            return False
+
+        if self._doorkeeper.count >= 8 * self._doorkeeper.nbytes // 10:
+            self._doorkeeper.clear()
+
+        return self._doorkeeper.add(fetched.hash)
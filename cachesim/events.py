@@ -0,0 +1,238 @@
+from copy import copy
+from heapq import heappop, heappush
+from math import inf
+from typing import Optional
+
+import numpy as np
+
+from cachesim import Cache, Reader, Request, Stats, Status
+
+
+class LatencyStats(Stats):
+    """
+    Same as Stats, with the latency of each request and the origin connections of an event time simulation. Coalesced
+    requests (waiting for the fetch of another request) are counted as misses, but not as origin traffic.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self._latencies = []
+        self._connections = 0
+        self._coalesced = 0
+        self._coalescedbytes = 0
+
+    def add(self, request: Request, status: Status, occupancy: Optional[int] = None, latency: float = 0.0,
+            coalesced: bool = False):
+        """
+        Adds a simulation result.
+
+        :param request: Request served.
+        :param status: Caches status.
+        :param occupancy: Caches size after the request, if known.
+        :param latency: Time from the request to the response.
+        :param coalesced: Served by the origin fetch of another request.
+        """
+        super().add(request, status, occupancy)
+        self._latencies.append(latency)
+        if coalesced:
+            self._coalesced += 1
+            self._coalescedbytes += request._size
+        elif status is not Status.HIT:
+            self._connections += 1
+
+    @property
+    def latencies(self) -> np.ndarray:
+        """Latency of the requests, in the order served."""
+        return np.array(self._latencies)
+
+    def latency(self, q: float) -> float:
+        """
+        Latency percentile.
+
+        :param q: Percentile, in [0, 100].
+        """
+        return float(np.percentile(self._latencies, q)) if self._latencies else 0
+
+    @property
+    def meanlatency(self) -> float:
+        return sum(self._latencies) / len(self._latencies) if self._latencies else 0
+
+    @property
+    def connections(self) -> int:
+        """Origin fetches."""
+        return self._connections
+
+    @property
+    def coalesced(self) -> int:
+        """Requests served by the origin fetch of another request, the origin connections saved."""
+        return self._coalesced
+
+    @property
+    def originbytes(self) -> int:
+        return super().originbytes - self._coalescedbytes
+
+    def _merge(self, other: Stats):
+        super()._merge(other)
+        if isinstance(other, LatencyStats):
+            self._latencies.extend(other._latencies)
+            self._connections += other._connections
+            self._coalesced += other._coalesced
+            self._coalescedbytes += other._coalescedbytes
+
+    def __str__(self):
+        """For logging"""
+        return f"{super().__str__()}, Origin connections: {self.connections}, Coalesced: {self.coalesced}, " \
+               f"Latency p50: {self.latency(50) * 1000:.1f}ms, p99: {self.latency(99) * 1000:.1f}ms"
+
+
+class EventSimulator:
+    """
+    Event time simulation of a caches: a miss is served when the origin fetch completes, after latency and the
+    transfer time of the object at bandwidth, and the object enters the caches at that time. Requests for an object
+    being fetched wait for the same fetch (collapsed forwarding), if coalesce is set, otherwise they open their own
+    origin connection, and only the first of the concurrent fetches stores the object.
+
+    Fetch completions are kept on a priority queue, and processed in time order with the requests.
+    """
+
+    def __init__(self, cache: Cache, latency: float = .05, bandwidth: float = inf, hitlatency: float = 0.0,
+                 coalesce: bool = True):
+        """
+        :param cache: The caches.
+        :param latency: Round trip time of an origin fetch, in seconds.
+        :param bandwidth: Transfer rate of an origin connection, in Byte/s.
+        :param hitlatency: Response time of a hit, in seconds.
+        :param coalesce: Coalesce the requests of an object being fetched.
+        """
+        assert isinstance(cache, Cache), f"I expect a Cache, got '{cache}'"
+        assert latency >= 0, f"I expect a non negative latency, got '{latency}'"
+        assert bandwidth > 0, f"I expect a positive bandwidth, got '{bandwidth}'"
+        assert hitlatency >= 0, f"I expect a non negative hitlatency, got '{hitlatency}'"
+        self._cache = cache
+        self._latency = latency
+        self._bandwidth = bandwidth
+        self._hitlatency = hitlatency
+        self._coalesce = coalesce
+
+        # (completion time, sequence, request, first) fetches on a heap, first is set for the first fetch of an object
+        # in flight, which may store it
+        self._fetches = []
+        self._counter = 0
+        self._inflight = {}  # hash: fetches in flight
+        self._waiting = {}  # hash: [requests waiting for the fetch]
+
+    @property
+    def cache(self) -> Cache:
+        return self._cache
+
+    def _complete(self, now: float, request: Request, first: bool, stats: LatencyStats):
+        """
+        Origin fetch completed: the object may enter the caches (same as a miss in Cache._recv()), and the waiting
+        requests are served.
+        """
+        cache = self._cache
+        request.fetched = True
+        if self._inflight[request.hash] == 1:
+            del self._inflight[request.hash]
+        else:
+            self._inflight[request.hash] -= 1
+
+        if not first:
+            result = cache._log(request, Status.MISS)
+        elif request.cacheable and request.size <= cache.totalsize:
+            # expiry counts from the end of the fetch
+            stored = copy(request)
+            stored.time = now
+            if cache._admit(stored):
+                if cache._treshold:
+                    cache._evict()
+                cache._store(stored)
+                result = cache._log(request, Status.MISS)
+            else:
+                result = cache._log(request, Status.PASS)
+        else:
+            result = cache._log(request, Status.PASS)
+
+        occupancy = result[2] if len(result) > 2 else None
+        stats.add(request, result[1], occupancy, latency=now - request.time)
+        for waiting in self._waiting.pop(request.hash, ()):
+            waiting._size = request._size
+            waiting._maxage = request._maxage
+            waiting.fetched = True
+            stats.add(waiting, result[1], occupancy, latency=now - waiting.time, coalesced=True)
+
+    def _advance(self, now: float, stats: LatencyStats):
+        """Completes the fetches till now."""
+        fetches = self._fetches
+        while fetches and fetches[0][0] <= now:
+            completion, _, request, first = heappop(fetches)
+            self._complete(completion, request, first, stats)
+
+    def _arrive(self, request: Request, stats: LatencyStats):
+        cache = self._cache
+        stored = cache._lookup(request)
+        if stored is not None and not stored.isexpired(request.time):
+            request._size = stored._size
+            request._maxage = stored._maxage
+            request.fetched = True
+            result = cache._log(request, Status.HIT)
+            stats.add(request, Status.HIT, result[2] if len(result) > 2 else None, latency=self._hitlatency)
+            return
+        if stored is not None and type(cache)._remove is not Cache._remove:
+            # expired, fetched again, caches without _remove() keep the stale copy (see Cache._recv)
+            cache._remove(request.hash)
+
+        hash = request.hash
+        inflight = self._inflight.get(hash, 0)
+        if inflight and self._coalesce:
+            self._waiting[hash].append(request)
+            return
+        if self._coalesce:
+            self._waiting[hash] = []
+        self._inflight[hash] = inflight + 1
+
+        # the size is known to the origin only, used for the transfer time
+        completion = request.time + self._latency + request._size / self._bandwidth
+        heappush(self._fetches, (completion, self._counter, request, not inflight))
+        self._counter += 1
+
+    def run(self, reader: Reader, stats: Optional[LatencyStats] = None) -> LatencyStats:
+        """
+        Processes all requests of the reader, and completes the fetches.
+
+        :param reader: The reader, requests in time order.
+        :param stats: Statistics to update (optional).
+        :return: The statistics, requests in the order served.
+        """
+        if stats is None:
+            stats = LatencyStats()
+
+        for request in reader:
+            self._advance(request.time, stats)
+            self._arrive(request, stats)
+        self._advance(inf, stats)
+
+        return stats
+
+
+if __name__ == "__main__":
+    from cachesim import Trace
+    from cachesim.caches import LRUCache
+    from cachesim.readers import WorkloadReader
+    from cachesim.workload import Zipf, Lognormal, Constant
+
+    # 1M requests at 1000 requests/s over 100k objects, caches size is 5% of the content base
+    objectcount = 100000
+    workload = Zipf(objectcount, 0.8, size=Lognormal(100000, 1.5), maxage=Constant(3600), rate=1000)
+    trace = Trace.fromreader(WorkloadReader(1000000, workload, seed=0))
+    totalsize = objectcount * 100000 // 20
+
+    print(f"{'latency':>8}{'coalesce':>10}{'CHR':>8}{'connections':>13}{'coalesced':>11}{'p50':>9}{'p99':>9}")
+    instant = LRUCache(totalsize).run(trace)
+    print(f"{0:>8}{'-':>10}{instant.chr * 100:>7.2f}%{instant.misses + instant.passes:>13}{0:>11}")
+    for latency in [.01, .1, 1]:
+        for coalesce in [False, True]:
+            stats = EventSimulator(LRUCache(totalsize), latency=latency, bandwidth=10 ** 8,
+                                   coalesce=coalesce).run(trace)
+            print(f"{latency:>8}{str(coalesce):>10}{stats.chr * 100:>7.2f}%{stats.connections:>13}"
+                  f"{stats.coalesced:>11}{stats.latency(50) * 1000:>7.1f}ms{stats.latency(99) * 1000:>7.1f}ms")
@@ -0,0 +1,140 @@
+from collections import OrderedDict
+from heapq import heappop, heappush
+from typing import Hashable, Optional, Tuple
+
+from cachesim import Cache, Request, Status
+
+
+class ExpiryMixIn:
+    """
+    Active expiry: objects are removed from the caches as simulated time passes their expiry (time + maxage), not only
+    when requested again, so dead objects do not take space from live ones, and the occupancy is the one of a caches
+    with active expiry. Expiry times are kept on a timer wheel of resolution wide slots, an object is removed at most
+    resolution late: storing and removing an object is O(1), only the slots are kept on a heap.
+
+    Objects are tracked from their store till their expiry or removal, evicted objects are only known when the number
+    of tracked objects goes over limit (checked after each eviction), then the ones stored first are dropped. Objects
+    still cached but not tracked any more expire when requested, as without the mixin. Use it with any caches
+    implementing Cache._remove(): class MyCache(ExpiryMixIn, FIFOCache)
+    """
+
+    def __init__(self, *args, resolution: float = 1.0, limit: Optional[int] = None, **kwargs):
+        """
+        :param resolution: Width of the timer wheel slots, in seconds.
+        :param limit: Maximum number of objects tracked, twice the number of cached objects (plus 1024) if None, not
+                      limited for caches not counting their objects (evicted objects are dropped on their expiry).
+        """
+        super().__init__(*args, **kwargs)
+        assert super()._remove.__func__ is not Cache._remove, \
+            f"{self.__class__.__name__} must implement Cache._remove()"
+        assert resolution > 0, f"I expect a positive resolution, got '{resolution}'"
+        assert limit is None or limit > 0, f"I expect a positive limit, got '{limit}'"
+        self._resolution = resolution
+        self._limit = limit
+
+        self._wheel = {}  # slot: {hash: object expiring in the slot}
+        self._slots = []  # heap of the slots in the wheel
+        self._stored = OrderedDict()  # hash: object tracked, in store order
+        self._expired = 0
+        self._expiredbytes = 0
+
+    @property
+    def expired(self) -> int:
+        """Objects removed on expiry."""
+        return self._expired
+
+    @property
+    def expiredbytes(self) -> int:
+        return self._expiredbytes
+
+    def _slot(self, stored: Request) -> int:
+        return int((stored.time + stored.maxage) // self._resolution)
+
+    def _untrack(self, hash: Hashable):
+        stored = self._stored.pop(hash, None)
+        if stored is not None:
+            objects = self._wheel.get(self._slot(stored))
+            if objects is not None:
+                objects.pop(hash, None)
+
+    def _expire(self, now: float):
+        """Removes the objects of the slots ended till now."""
+        resolution, wheel, slots = self._resolution, self._wheel, self._slots
+        while slots and (slots[0] + 1) * resolution <= now:
+            for hash, expiring in wheel.pop(heappop(slots)).items():
+                del self._stored[hash]
+                if self._remove(hash) is not None:
+                    self._expired += 1
+                    self._expiredbytes += expiring.size
+
+    def _recv(self, request: Request) -> Tuple[Request, Status]:
+        self._expire(request.time)
+        return super()._recv(request)
+
+    def _store(self, fetched: Request):
+        super()._store(fetched)
+        self._untrack(fetched.hash)
+        self._stored[fetched.hash] = fetched
+
+        slot = self._slot(fetched)
+        objects = self._wheel.get(slot)
+        if objects is None:
+            objects = self._wheel[slot] = {}
+            heappush(self._slots, slot)
+        objects[fetched.hash] = fetched
+
+    def _remove(self, hash: Hashable) -> Optional[Request]:
+        self._untrack(hash)
+        return super()._remove(hash)
+
+    def _objectcount(self) -> Optional[int]:
+        try:
+            return self.objectcount
+        except NotImplementedError:
+            return None
+
+    def _evict(self):
+        super()._evict()
+
+        # evicted objects are not known, the ones stored first are the likeliest
+        limit = self._limit
+        if limit is None:
+            objects = self._objectcount()
+            if objects is None:
+                return
+            limit = 2 * objects + 1024
+        while len(self._stored) > limit:
+            self._untrack(next(iter(self._stored)))
+
+
+if __name__ == "__main__":
+    import time
+
+    import numpy as np
+
+    from cachesim import Trace
+    from cachesim.caches import FIFOCache, HeapLFUCache, LRUCache
+    from cachesim.readers import WorkloadReader
+    from cachesim.workload import Zipf, Lognormal
+
+    # 1M requests at 100 requests/s over 100k objects with lognormal maxage (mean 10 minutes), caches size is half of
+    # the content base
+    objectcount = 100000
+    workload = Zipf(objectcount, 0.8, size=Lognormal(10000, 1.5), maxage=Lognormal(600, 1), rate=100)
+    trace = Trace.fromreader(WorkloadReader(1000000, workload, seed=0))
+    totalsize = objectcount * 10000 // 2
+
+    print(f"{'caches':>20}{'CHR':>8}{'mean occupancy':>16}{'expired':>9}{'requests/s':>12}")
+    for cls in [FIFOCache, HeapLFUCache, LRUCache]:
+        class ExpiryCache(ExpiryMixIn, cls):
+            pass
+
+        for cache in [cls(totalsize), ExpiryCache(totalsize)]:
+            start = time.perf_counter()
+            results = list(cache.map(trace))
+            elapsed = time.perf_counter() - start
+            hits = sum(result[1] is Status.HIT for result in results)
+            occupancy = np.mean([result[2] for result in results]) / totalsize
+            name = f"{cls.__name__}{'+expiry' if isinstance(cache, ExpiryMixIn) else ''}"
+            print(f"{name:>20}{hits / len(trace) * 100:>7.2f}%{occupancy * 100:>15.2f}%"
+                  f"{getattr(cache, 'expired', 0):>9}{len(trace) / elapsed:>12.0f}")
@@ -0,0 +1,69 @@
+from typing import Iterable, List, Optional
+
+from cachesim import Cache, Reader, Stats
+
+
+def fanout(caches: Iterable[Cache], reader: Reader, stats: Optional[List[Stats]] = None) -> List[Stats]:
+    """
+    Runs several caches on the same requests in a single pass: each request is read (parsed) once, and fed to every
+    caches in lockstep. _recv() changes the request (fetched, size and maxage of the stored copy on hits) and the
+    caches keep it, so each caches gets its own copy, the last one the original. Comparing N caches costs one read
+    plus N _recv() calls and N-1 copies, instead of N reads. Results are aggregated on the fly, see Cache.run().
+
+    :param caches: The caches.
+    :param reader: The reader.
+    :param stats: Statistics to update for each caches, e.g. WindowedStats (optional).
+    :return: The statistics of each caches, in caches order.
+    """
+    caches = list(caches)
+    assert caches, f"I expect caches to run"
+    for cache in caches:
+        assert isinstance(cache, Cache), f"I expect a Cache, got '{cache}'"
+    if stats is None:
+        stats = [Stats() for _ in caches]
+    assert len(stats) == len(caches), f"I expect statistics for each of the {len(caches)} caches, got '{len(stats)}'"
+
+    *others, (recv, add) = [(cache._recv, s.add) for cache, s in zip(caches, stats)]
+    for request in reader:
+        for other, added in others:
+            added(*other(request.__copy__()))
+        add(*recv(request))
+
+    return stats
+
+
+if __name__ == "__main__":
+    import os
+    import random
+    import tempfile
+    import time
+
+    from cachesim.caches import FIFOCache, LRUCache, ProtectedFIFOCache, NonCache
+    from cachesim.readers import CSVReader
+
+    # zipf like popularity over 10k objects, 1M requests parsed from a CSV file, caches size is 10% of the content base
+    totalcount = 1000000
+    objectcount = 10000
+    random.seed(0)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'trace.csv')
+        with open(path, 'w') as file:
+            for t, h in enumerate(random.choices(range(objectcount), [1 / (i + 1) for i in range(objectcount)],
+                                                 k=totalcount)):
+                file.write(f"{t / 100},{h:x},{h % 1000 + 1},3600\n")
+
+        def caches():
+            totalsize = objectcount * 500 // 10
+            return [FIFOCache(totalsize), ProtectedFIFOCache(totalsize, 500), NonCache(), LRUCache(totalsize)]
+
+        start = time.perf_counter()
+        separate = [cache.run(CSVReader(totalcount, path)) for cache in caches()]
+        print(f"Separate runs: {time.perf_counter() - start:.1f}s")
+
+        start = time.perf_counter()
+        stats = fanout(caches(), CSVReader(totalcount, path))
+        print(f"Fan-out: {time.perf_counter() - start:.1f}s")
+
+    for cache, s, r in zip(caches(), stats, separate):
+        assert s.hits == r.hits and s.hitbytes == r.hitbytes
+        print(f"{cache.__class__.__name__}: {s}")
@@ -0,0 +1,97 @@
+from typing import Hashable, Iterable, List
+
+
+class Interner:
+    """
+    Maps object hashes to dense integer ids (0, 1, 2, ... in the order of first appearance). Readers use it to replace
+    hash strings with small integers, so caches key on ints instead of strings, or index into arrays. The original
+    hashes are kept once, for reporting.
+    """
+
+    def __init__(self):
+        self._ids = {}  # hash: id
+        self._hashes = []  # id: hash
+
+    def __call__(self, hash: Hashable) -> int:
+        """
+        Interns a hash.
+
+        :param hash: Object hash.
+        :return: Id of the hash, a new one for unseen hashes.
+        """
+        id = self._ids.get(hash)
+        if id is None:
+            id = self._ids[hash] = len(self._hashes)
+            self._hashes.append(hash)
+
+        return id
+
+    def map(self, hashes: Iterable[Hashable]) -> List[int]:
+        """
+        Interns many hashes at once, faster than calling the interner for each of them.
+
+        :param hashes: Object hashes.
+        :return: Ids of the hashes.
+        """
+        hashes = list(hashes)
+        new = [h for h in dict.fromkeys(hashes) if h not in self._ids]
+        self._ids.update(zip(new, range(len(self._hashes), len(self._hashes) + len(new))))
+        self._hashes.extend(new)
+
+        return list(map(self._ids.__getitem__, hashes))
+
+    def hash(self, id: int) -> Hashable:
+        """
+        Reverse lookup.
+
+        :param id: Object id.
+        :return: The original hash.
+        """
+        return self._hashes[id]
+
+    @property
+    def hashes(self) -> List:
+        """Original hashes indexed by id."""
+        return self._hashes
+
+    def __len__(self) -> int:
+        return len(self._hashes)
+
+    def __contains__(self, hash: Hashable) -> bool:
+        return hash in self._ids
+
+
+if __name__ == "__main__":
+    import random
+    import tracemalloc
+
+    from cachesim import Request
+    from cachesim.caches import FIFOCache
+
+    # memory of a caches holding 10M objects, keyed by 128 bit hex hashes or by interned ids
+    count = 10000000
+    random.seed(0)
+    hashes = ["%032x" % random.getrandbits(128) for _ in range(count)]
+
+    def measure(keys) -> int:
+        tracemalloc.start()
+        cache = FIFOCache(totalsize=count)
+        for key in keys:
+            cache._store(Request(0, key, 1, 3600, True))
+        current, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        return current
+
+    # readers create a new hash string for every request
+    cache = measure(h.encode().decode() for h in hashes)
+    print(f"hash strings: {cache / count:.0f} Byte/object, {cache / 2 ** 20:.0f} MiB")
+
+    tracemalloc.start()
+    interner = Interner()
+    ids = [interner(h.encode().decode()) for h in hashes]
+    table, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    cache = measure(ids)
+    print(f"interned ids: {cache / count:.0f} Byte/object, {cache / 2 ** 20:.0f} MiB per caches "
+          f"+ {table / count:.0f} Byte/object, {table / 2 ** 20:.0f} MiB interner shared by all caches")
@@ -0,0 +1,95 @@
+from typing import AsyncIterator, Optional, Tuple
+
+from cachesim import Cache, Stats
+from cachesim.readers import TailReader
+
+
+async def follow(cache: Cache, reader: TailReader, window: float, stats: Optional[Stats] = None,
+                 lateness: float = 0) -> AsyncIterator[Tuple[float, Stats]]:
+    """
+    Shadow simulation of live logs: runs the caches on the batches of the reader as they come, and yields the
+    statistics of each time window (by request time) once it is over, i.e. a request lateness later than its end has
+    come. Logs of several sources interleave, lateness lets the windows wait for the slower ones. Requests of windows
+    already yielded only count in stats. Only the open windows are kept, the stream is never materialized.
+
+        async for start, window in follow(LRUCache(10 ** 9), TailReader('access.log'), 60):
+            print(start, window)
+
+    :param cache: The caches.
+    :param reader: The reader.
+    :param window: Length of the time windows (same unit as Request.time).
+    :param stats: Statistics of all requests to update (optional).
+    :param lateness: Time the windows are kept open after their end.
+    :return: Start time and statistics of the windows, in time order. The open windows are yielded at the end.
+    """
+    assert window > 0, f"I expect a positive window, got '{window}'"
+    assert lateness >= 0, f"I expect a non negative lateness, got '{lateness}'"
+    if stats is None:
+        stats = Stats()
+
+    recv = cache._recv
+    add = stats.add
+    windows = {}  # start: Stats, open windows
+    closed = float('-inf')  # end of the last window yielded
+    latest = float('-inf')  # latest request time
+
+    async for batch in reader:
+        for result in map(recv, batch):
+            add(*result)
+
+            time = result[0].time
+            start = time // window * window
+            current = windows.get(start)
+            if current is None:
+                if start < closed:
+                    continue
+                current = windows[start] = Stats()
+                # carry caches size over
+                current._occupancy = stats.occupancy
+            current.add(*result)
+            if time > latest:
+                latest = time
+
+        for start in sorted(start for start in windows if start + window + lateness <= latest):
+            closed = start + window
+            yield start, windows.pop(start)
+
+    for start in sorted(windows):
+        yield start, windows.pop(start)
+
+
+if __name__ == "__main__":
+    import asyncio
+    import random
+    import sys
+    import tempfile
+
+    from cachesim.caches import LRUCache
+
+    # two web servers logging zipf distributed requests over 100k objects at 10k requests/s each, for 5s, shadowed by a
+    # caches of 5% of the content base with 1s windows
+    objectcount = 100000
+    weights = [1 / (i + 1) ** .8 for i in range(objectcount)]
+
+    async def serve(path: str, seed: int, duration: float):
+        rng = random.Random(seed)
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        with open(path, 'a') as file:
+            while (now := loop.time() - start) < duration:
+                ids = rng.choices(range(objectcount), weights, k=1000)
+                file.writelines(f"{now:.3f},{i:x},{i % 1000 + 1},3600\n" for i in ids)
+                file.flush()
+                await asyncio.sleep(.1)
+
+    async def main(paths: list, duration: float = 5):
+        servers = [asyncio.create_task(serve(path, seed, duration)) for seed, path in enumerate(paths)]
+        stats = Stats()
+        async for start, window in follow(LRUCache(objectcount * 500 // 20), TailReader(*paths, idle=1), 1, stats,
+                                          lateness=.5):
+            print(f"{start:.0f}s: {window}")
+        await asyncio.gather(*servers)
+        print(f"Total: {stats}")
+
+    with tempfile.NamedTemporaryFile(suffix='.csv') as a, tempfile.NamedTemporaryFile(suffix='.csv') as b:
+        asyncio.run(main([a.name, b.name], float(sys.argv[1]) if len(sys.argv) > 1 else 5))
@@ -0,0 +1,191 @@
+import numpy as np
+
+from cachesim import Reader
+from cachesim.sampling import spatialhash
+
+
+class _Fenwick:
+    """
+    Fenwick (binary indexed) tree for prefix sums with O(log n) updates. Indices beyond its size grow the tree.
+    """
+
+    def __init__(self, n: int):
+        assert n >= 0, f"I expect a non negative size, got '{n}'"
+        self._tree = [0] * (n + 1)
+
+    def _grow(self, n: int):
+        """Extends the tree to at least n indices, doubling it at least, the new values are 0."""
+        tree = self._tree
+        old = len(tree) - 1
+        total = self.prefix(old)
+        for j in range(old + 1, max(n, 2 * old) + 1):
+            # node j sums (j - lowbit(j), j], only the old part has values
+            tree.append(total - self.prefix(min(j - (j & -j), old)))
+
+    def add(self, i: int, v: int):
+        assert i >= 0, f"I expect a non negative index, got '{i}'"
+        tree = self._tree
+        i += 1
+        if i >= len(tree):
+            self._grow(i)
+        while i < len(tree):
+            tree[i] += v
+            i += i & -i
+
+    def prefix(self, i: int) -> int:
+        """Sum of [0, i)"""
+        tree = self._tree
+        i = min(i, len(tree) - 1)
+        s = 0
+        while i > 0:
+            s += tree[i]
+            i -= i & -i
+        return s
+
+
+class MRC:
+    """
+    Miss ratio curves of an LRU caches for every caches size, computed in a single pass over the requests from stack
+    distances: a request hits a caches of size c, if the objects requested since the previous request of the same
+    object (including itself) fit into c. Distances are counted on Fenwick trees indexed by request position.
+
+    Expired objects are fetched again, their age is counted from the first request after expiry, as in a caches large
+    enough to keep them. Non cacheable objects always miss.
+
+    With rate < 1, only objects with a spatial hash below rate are processed, distances are scaled up by 1 / rate and
+    misses are related to the expected number of sampled requests (SHARDS-adj approximation).
+    """
+
+    def __init__(self, reader: Reader, rate: float = 1.0):
+        """
+        :param reader: The reader, requests must be in time order.
+        :param rate: Sampling rate of objects.
+        """
+        assert 0 < rate <= 1, f"rate must be in (0, 1], got '{rate}'"
+        self._rate = rate
+
+        # sampled requests expected, trees grow if more come
+        counts = _Fenwick(round(reader.totalcount * rate))
+        sizes = _Fenwick(round(reader.totalcount * rate))
+        last = {}  # hash: (position, size, expires)
+
+        objectdistance = []
+        bytedistance = []
+        requestsize = []
+
+        # all requests and bytes, including the not sampled ones
+        self._total = 0
+        self._totalbytes = 0
+
+        i = 0
+        for request in reader:
+            self._total += 1
+            self._totalbytes += int(request._size)
+            if rate < 1 and spatialhash(request.hash) >= rate:
+                continue
+
+            time, size, maxage = float(request.time), int(request._size), int(request._maxage)
+
+            hit = False
+            od = bd = np.inf
+            prev = last.pop(request.hash, None)
+            if prev is not None:
+                p, stored, expires = prev
+                counts.add(p, -1)
+                sizes.add(p, -stored)
+
+                # served from caches, if not expired
+                if not expires < time:
+                    hit = True
+                    size = stored
+                    od = counts.prefix(i) - counts.prefix(p) + 1
+                    bd = sizes.prefix(i) - sizes.prefix(p) + stored
+
+            if not hit:
+                expires = time + maxage
+
+            if hit or maxage > 0:
+                counts.add(i, 1)
+                sizes.add(i, size)
+                last[request.hash] = (i, size, expires)
+
+            objectdistance.append(od)
+            bytedistance.append(bd)
+            requestsize.append(size)
+            i += 1
+
+        order = np.argsort(bytedistance, kind='stable')
+        self._objectdistance = np.sort(np.array(objectdistance, dtype=np.float64)) / rate
+        self._bytedistance = np.array(bytedistance, dtype=np.float64)[order] / rate
+        self._hitbytes = np.concatenate([[0], np.cumsum(np.array(requestsize, dtype=np.float64)[order])])
+
+    @property
+    def requests(self) -> int:
+        """Requests processed (sampled)."""
+        return len(self._objectdistance)
+
+    def _missratio(self, distance: np.ndarray, sizes) -> np.ndarray:
+        if not self._total:
+            return np.zeros(np.shape(sizes))
+
+        misses = self.requests - np.searchsorted(distance, sizes, side='right')
+        return np.minimum(misses / (self._total * self._rate), 1)
+
+    def missratio(self, sizes) -> np.ndarray:
+        """
+        Request miss ratio for caches sizes in Byte.
+
+        :param sizes: Caches sizes.
+        """
+        return self._missratio(self._bytedistance, sizes)
+
+    def objectmissratio(self, counts) -> np.ndarray:
+        """
+        Request miss ratio for caches sizes in number of objects.
+
+        :param counts: Caches sizes.
+        """
+        return self._missratio(self._objectdistance, counts)
+
+    def bytemissratio(self, sizes) -> np.ndarray:
+        """
+        Byte miss ratio for caches sizes in Byte.
+
+        :param sizes: Caches sizes.
+        """
+        if not self._totalbytes:
+            return np.zeros(np.shape(sizes))
+
+        misses = self._hitbytes[-1] - self._hitbytes[np.searchsorted(self._bytedistance, sizes, side='right')]
+        return np.minimum(misses / (self._totalbytes * self._rate), 1)
+
+
+if __name__ == "__main__":
+    import random
+    import time
+
+    from cachesim import Request, Trace
+    from cachesim.caches import FIFOCache, LFUCache
+    from cachesim.readers import PopulationReader
+    from cachesim.sweep import grid, sweep
+
+    # zipf like popularity over 100k objects
+    count = 100000
+    random.seed(0)
+    population = [Request(0, str(i), random.randint(1, 1000), 3600 * 24) for i in range(count)]
+    trace = Trace.fromreader(PopulationReader(200000, population, weights=[1 / (i + 1) for i in range(count)]))
+
+    start = time.perf_counter()
+    mrc = MRC(trace)
+    print(f"MRC: {len(trace) / (time.perf_counter() - start):.0f} requests/s")
+    shards = MRC(trace, rate=0.1)
+
+    # validate against simulation, caches keeps between thlow and thhigh of totalsize
+    sizes = [int(2 ** e) for e in range(16, 27)]
+    rows = sweep(trace, grid([FIFOCache, LFUCache], totalsize=sizes))
+    capacity = [s * (FIFOCache(s).thlow + FIFOCache(s).thhigh) / 2 for s in sizes]
+
+    print(f"{'totalsize':>10}{'LRU MRC':>10}{'SHARDS':>10}{'FIFO':>10}{'LFU':>10}")
+    for s, lru, approx, fifo, lfu in zip(sizes, mrc.missratio(capacity), shards.missratio(capacity), rows[:len(sizes)],
+                                         rows[len(sizes):]):
+        print(f"{s:>10}{lru:>10.4f}{approx:>10.4f}{1 - fifo['chr']:>10.4f}{1 - lfu['chr']:>10.4f}")
@@ -1,3 +1,5 @@
+from itertools import chain, islice
+
 from tqdm import tqdm
 
 from cachesim import Reader
@@ -5,8 +7,18 @@ from cachesim import Reader
 
 class PBarMixIn:
     """
-    Integrates a progress bar to keep track of the simulation.
+    Integrates a progress bar to keep track of the simulation. The bar is updated once per chunk of requests, not per
+    request.
     """
 
+    chunksize = 1 << 12
+
+    def _chunks(self, reader: Reader):
+        with tqdm(desc=self.__class__.__name__, total=reader.totalcount) as pbar:
+            requests = iter(reader)
+            while chunk := list(islice(requests, self.chunksize)):
+                pbar.update(len(chunk))
+                yield chunk
+
     def map(self, reader: Reader):
-        return map(super()._recv, tqdm(reader, desc=self.__class__.__name__, total=reader.totalcount))
+        return map(self._recv, chain.from_iterable(self._chunks(reader)))
@@ -0,0 +1,162 @@
+from collections import Counter
+from time import perf_counter_ns
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from cachesim import Reader, Request, Status
+
+HOOKS = ['reader', '_recv', '_lookup', '_admit', '_store', '_treshold', '_evict']
+
+
+def _percentile(histogram: List[int], q: float) -> int:
+    """Upper bound of the log2 bucket holding the q-th percentile."""
+    rank = sum(histogram) * q / 100
+    seen = 0
+    for bucket, count in enumerate(histogram):
+        seen += count
+        if count and seen >= rank:
+            return 1 << bucket
+    return 0
+
+
+class ProfilingMixIn:
+    """
+    Records the calls of the hooks of the caches (and the time spent in the reader): call counts, cumulated time and
+    a log2 histogram of the call times in ns, plus the number of objects and Bytes removed by each eviction (from
+    thhigh to thlow). Timing adds about a microsecond per call, use it to find where time goes, not to measure
+    throughput. Caches without the mixin are not affected. Use it with any caches: class MyCache(ProfilingMixIn,
+    LRUCache)
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._calls = dict.fromkeys(HOOKS, 0)
+        self._times = dict.fromkeys(HOOKS, 0)  # ns
+        self._histograms = {hook: [0] * 64 for hook in HOOKS}  # calls by the bit length of the time in ns
+        self._evicted = Counter()  # objects removed by an eviction: evictions
+        self._evictedbytes = 0
+
+    def _record(self, hook: str, elapsed: int):
+        self._calls[hook] += 1
+        self._times[hook] += elapsed
+        self._histograms[hook][elapsed.bit_length()] += 1
+
+    def _timed(self, reader: Reader) -> Iterator[Request]:
+        iterator = iter(reader)
+        while True:
+            start = perf_counter_ns()
+            try:
+                request = next(iterator)
+            except StopIteration:
+                return
+            self._record('reader', perf_counter_ns() - start)
+            yield request
+
+    def map(self, reader: Reader):
+        return map(self._recv, self._timed(reader))
+
+    def _recv(self, request: Request) -> Tuple[Request, Status]:
+        start = perf_counter_ns()
+        result = super()._recv(request)
+        self._record('_recv', perf_counter_ns() - start)
+        return result
+
+    def _lookup(self, requested: Request) -> Optional[Request]:
+        start = perf_counter_ns()
+        stored = super()._lookup(requested)
+        self._record('_lookup', perf_counter_ns() - start)
+        return stored
+
+    def _admit(self, fetched: Request) -> bool:
+        start = perf_counter_ns()
+        admitted = super()._admit(fetched)
+        self._record('_admit', perf_counter_ns() - start)
+        return admitted
+
+    def _store(self, fetched: Request):
+        start = perf_counter_ns()
+        super()._store(fetched)
+        self._record('_store', perf_counter_ns() - start)
+
+    @property
+    def _treshold(self) -> bool:
+        start = perf_counter_ns()
+        treshold = super()._treshold
+        self._record('_treshold', perf_counter_ns() - start)
+        return treshold
+
+    def _objectcount(self) -> Optional[int]:
+        try:
+            return self.objectcount
+        except NotImplementedError:
+            return None
+
+    def _evict(self):
+        objects, size = self._objectcount(), self.size
+        start = perf_counter_ns()
+        super()._evict()
+        self._record('_evict', perf_counter_ns() - start)
+        # objects per eviction of the caches counting their objects only
+        if objects is not None:
+            self._evicted[objects - self.objectcount] += 1
+        self._evictedbytes += size - self.size
+
+    @property
+    def profile(self) -> List[Dict]:
+        """Calls, total time (s), share of the time in _recv and the reader, mean, p50 and p99 (ns) of each hook."""
+        total = self._times['reader'] + self._times['_recv']
+        return [{'hook': hook, 'calls': self._calls[hook], 'total': self._times[hook] / 1e9,
+                 'share': self._times[hook] / total if total else 0,
+                 'mean': self._times[hook] / self._calls[hook] if self._calls[hook] else 0,
+                 'p50': _percentile(self._histograms[hook], 50), 'p99': _percentile(self._histograms[hook], 99)}
+                for hook in HOOKS]
+
+    @property
+    def evictions(self) -> Counter:
+        """Number of evictions by the objects removed, empty if the caches does not count its objects."""
+        return self._evicted
+
+    @property
+    def evictedbytes(self) -> int:
+        return self._evictedbytes
+
+    def summary(self) -> str:
+        """The profile and the eviction batches as a table."""
+        lines = [f"{'hook':>10}{'calls':>12}{'total s':>10}{'share':>8}{'mean ns':>10}{'p50 ns':>10}{'p99 ns':>10}"]
+        for row in self.profile:
+            lines.append(f"{row['hook']:>10}{row['calls']:>12}{row['total']:>10.3f}{row['share'] * 100:>7.1f}%"
+                         f"{row['mean']:>10.0f}{row['p50']:>10}{row['p99']:>10}")
+
+        evictions = self._calls['_evict']
+        if evictions:
+            line = f"Evictions: {evictions}, "
+            if self._evicted:
+                objects = sum(count * n for count, n in self._evicted.items())
+                line += f"objects per eviction: mean {objects / evictions:.1f}, min {min(self._evicted)}, max " \
+                        f"{max(self._evicted)}, "
+            lines.append(f"{line}Bytes per eviction: mean {self._evictedbytes / evictions:.0f}")
+        return '\n'.join(lines)
+
+
+if __name__ == "__main__":
+    from cachesim import TinyLFUMixIn
+    from cachesim.caches import LRUCache, HeapLFUCache, S3FIFOCache
+    from cachesim.readers import WorkloadReader
+    from cachesim.workload import Zipf, Lognormal, Constant
+
+    # zipf popularity over 100k objects with lognormal sizes, caches size is 5% of the content base
+    objectcount = 100000
+    workload = Zipf(objectcount, 0.8, size=Lognormal(10000, 1.5), maxage=Constant(10 ** 9), rate=1000)
+    reader = WorkloadReader(1000000, workload, seed=0)
+    totalsize = objectcount * 10000 // 20
+
+    for cls in [LRUCache, HeapLFUCache, S3FIFOCache]:
+        class ProfiledCache(ProfilingMixIn, cls):
+            pass
+
+        class ProfiledTinyLFUCache(ProfilingMixIn, TinyLFUMixIn, cls):
+            pass
+
+        for cache in [ProfiledCache(totalsize), ProfiledTinyLFUCache(totalsize)]:
+            stats = cache.run(reader)
+            print(f"{cls.__name__}{' with TinyLFU' if isinstance(cache, TinyLFUMixIn) else ''}: {stats}")
+            print(cache.summary())
@@ -0,0 +1,191 @@
+import sys
+import threading
+import time
+from itertools import islice
+from multiprocessing import SimpleQueue
+from typing import Iterator, Optional, TextIO, Tuple
+
+from cachesim import Request, Stats, Status
+
+
+class Progress:
+    """
+    Live progress of simulations: requests done, requests/s and running CHR and BHR, reported at most every interval
+    seconds. Results are added to the statistics in chunks (see track()), so nothing is added to the per request
+    work but a slice of the result iterator. Worker processes of a parallel run report through remote(), to the
+    Progress of the parent.
+
+        with Progress(totalcount) as progress:
+            stats = cache.run(reader, progress=progress)
+    """
+
+    def __init__(self, total: Optional[int] = None, interval: float = 1.0, chunksize: int = 1 << 16,
+                 file: Optional[TextIO] = None, desc: str = ''):
+        """
+        :param total: Expected number of requests, for the completion and ETA (optional).
+        :param interval: Minimum time between reports, in seconds.
+        :param chunksize: Requests between two updates.
+        :param file: Output of the reports, stderr if None, False to keep quiet (see the properties).
+        :param desc: Prefix of the reports.
+        """
+        assert total is None or total >= 0, f"I expect a non negative total, got '{total}'"
+        assert interval >= 0, f"I expect a non negative interval, got '{interval}'"
+        assert chunksize > 0, f"I expect a positive chunksize, got '{chunksize}'"
+        self._total = total
+        self._interval = interval
+        self._chunksize = chunksize
+        self._file = file if file is not None else sys.stderr
+        self._desc = desc
+
+        self._requests = 0
+        self._hits = 0
+        self._bytes = 0
+        self._hitbytes = 0
+        self._start = time.perf_counter()
+        self._last = self._start
+        self._lock = threading.Lock()
+
+        # updates of the worker processes, drained by a thread
+        self._queue = None
+        self._listener = None
+
+    @property
+    def chunksize(self) -> int:
+        return self._chunksize
+
+    @property
+    def requests(self) -> int:
+        return self._requests
+
+    @property
+    def chr(self) -> float:
+        return self._hits / self._requests if self._requests else 0
+
+    @property
+    def bhr(self) -> float:
+        return self._hitbytes / self._bytes if self._bytes else 0
+
+    @property
+    def rate(self) -> float:
+        """Requests per second since start."""
+        elapsed = time.perf_counter() - self._start
+        return self._requests / elapsed if elapsed > 0 else 0
+
+    def update(self, requests: int, hits: int, bytes: int, hitbytes: int):
+        """
+        Adds the results of a chunk.
+
+        :param requests: Requests served.
+        :param hits: Hits among them.
+        :param bytes: Bytes sent.
+        :param hitbytes: Bytes sent from caches.
+        """
+        with self._lock:
+            self._requests += requests
+            self._hits += hits
+            self._bytes += bytes
+            self._hitbytes += hitbytes
+
+            now = time.perf_counter()
+            if now - self._last >= self._interval:
+                self._last = now
+                self._report(now)
+
+    def _report(self, now: float, end: str = '\r'):
+        if self._file is False:
+            return
+
+        elapsed = now - self._start
+        rate = self._requests / elapsed if elapsed > 0 else 0
+        done = f"{self._requests}"
+        if self._total:
+            eta = (self._total - self._requests) / rate if rate else 0
+            done += f"/{self._total} ({self._requests / self._total * 100:.0f}%, ETA {eta:.0f}s)"
+        print(f"{self._desc}{': ' if self._desc else ''}{done}, {rate:.0f} requests/s, CHR: {self.chr * 100:.2f}%, "
+              f"BHR: {self.bhr * 100:.2f}%", end=end if self._file.isatty() else '\n', file=self._file, flush=True)
+
+    def track(self, results: Iterator[Tuple[Request, Status]], stats: Stats) -> Stats:
+        """
+        Adds results (see Cache.map()) to the statistics, updating the progress after every chunk.
+
+        :param results: The results.
+        :param stats: The statistics to update.
+        :return: The statistics.
+        """
+        add = stats.add
+        chunksize = self._chunksize
+        while True:
+            requests, hits, bytes, hitbytes = stats.requests, stats.hits, stats.bytes, stats.hitbytes
+            for result in islice(results, chunksize):
+                add(*result)
+            if stats.requests == requests:
+                return stats
+            self.update(stats.requests - requests, stats.hits - hits, stats.bytes - bytes, stats.hitbytes - hitbytes)
+
+    def remote(self) -> 'RemoteProgress':
+        """
+        Progress handle for worker processes, pass it to them at startup (e.g. in the initargs of a Pool).
+        """
+        if self._queue is None:
+            self._queue = SimpleQueue()
+            self._listener = threading.Thread(target=self._listen, daemon=True)
+            self._listener.start()
+        return RemoteProgress(self._queue, self._chunksize)
+
+    def _listen(self):
+        while True:
+            update = self._queue.get()
+            if update is None:
+                return
+            self.update(*update)
+
+    def close(self):
+        """Stops listening to the workers, and reports the final state."""
+        if self._listener is not None:
+            self._queue.put(None)
+            self._listener.join()
+            self._queue = self._listener = None
+        self._report(time.perf_counter(), end='\n')
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+
+class RemoteProgress(Progress):
+    """
+    Progress in a worker process, see Progress.remote(): updates are sent to the parent, nothing is reported here.
+    """
+
+    def __init__(self, queue: SimpleQueue, chunksize: int):
+        super().__init__(chunksize=chunksize, file=False)
+        self._remote = queue
+
+    def update(self, requests: int, hits: int, bytes: int, hitbytes: int):
+        self._remote.put((requests, hits, bytes, hitbytes))
+
+    def close(self):
+        pass
+
+    def __getstate__(self):
+        # the lock is not picklable, and the counts are the parent's
+        return {'_remote': self._remote, '_chunksize': self._chunksize}
+
+    def __setstate__(self, state: dict):
+        self.__init__(state['_remote'], state['_chunksize'])
+
+
+if __name__ == "__main__":
+    from cachesim.caches import LRUCache
+    from cachesim.readers import WorkloadReader
+    from cachesim.workload import Zipf, Lognormal, Constant
+
+    # zipf popularity over 1M objects with lognormal sizes, 10M requests, caches size is 5% of the content base
+    totalcount = 10000000
+    workload = Zipf(totalcount // 10, 0.8, size=Lognormal(10000, 1.5), maxage=Constant(10 ** 9), rate=1000)
+    with Progress(totalcount, desc='LRUCache') as progress:
+        stats = LRUCache(totalcount // 10 * 10000 // 20).run(WorkloadReader(totalcount, workload, seed=0),
+                                                               progress=progress)
+    print(stats)
@@ -24,6 +24,13 @@ class Reader(ABC):
         """
         return self
 
+    def _resumed(self) -> bool:
+        """
+        Tells once, if the reader has been restored in the middle of its requests (see cachesim.checkpoint), overloads
+        of __iter__ continue from there instead of starting over then.
+        """
+        return self.__dict__.pop('_resume', False)
+
     @abstractmethod
     def __next__(self) -> Request:
         """
@@ -2,3 +2,7 @@ from .constantreader import ConstantReader
 from .csvreader import CSVReader
 from .populationreader import PopulationReader
 from .randomreader import RandomReader
+from .fastcsvreader import FastCSVReader
+from .mmapreader import MmapReader
+from .workloadreader import WorkloadReader
+from .tailreader import TailReader
@@ -1,14 +1,23 @@
 import csv
+import locale
+from functools import partial
 from os import access, R_OK
 from os.path import isfile
-from typing import Iterator
+from typing import Iterator, Optional
 
-from cachesim import Reader, Request
+from cachesim import Reader, Request, Interner
 
 
 class CSVReader(Reader):
 
-    def __init__(self, totalcount: int, csvfile: str):
+    def __init__(self, totalcount: int, csvfile: str, interner: Optional[Interner] = None,
+                 encoding: Optional[str] = None):
+        """
+        :param totalcount: Number of requests to read, the file is read again from the beginning if shorter.
+        :param csvfile: CSV file with time, hash, size and maxage columns.
+        :param interner: Replace hashes with interned integer ids (optional).
+        :param encoding: Encoding of the file, the locale encoding if None (as open()), ASCII compatible ones only.
+        """
         super().__init__(totalcount=totalcount)
 
         assert isfile(csvfile) and access(csvfile, R_OK), f"File '{csvfile}' doesn't exist or isn't readable"
@@ -16,17 +25,44 @@ class CSVReader(Reader):
         self._file = None
         self._reader = None
         self._counter = 0
+        self._interner = interner
+        self._encoding = encoding if encoding is not None else locale.getpreferredencoding(False)
 
     def __iter__(self) -> Iterator:
+        if self._resumed():
+            return super().__iter__()
+
         if self._file is not None:
             self._file.close()
 
-        self._file = open(self._csvfile, newline='')
-        self._reader = csv.reader(self._file)
+        self._file = open(self._csvfile, 'rb')
+        self._reader = self._rows()
         self._counter = self.totalcount
 
         return super().__iter__()
 
+    def _rows(self) -> Iterator[list]:
+        # lines are decoded here, the binary file tells its position for checkpoints. Lines keep their ends, as with
+        # newline='', quoted fields may span lines
+        return csv.reader(map(partial(bytes.decode, encoding=self._encoding), self._file))
+
+    def __getstate__(self):
+        # the open file is replaced by its position
+        state = self.__dict__.copy()
+        state['_file'] = self._file.tell() if self._file is not None and not self._file.closed else None
+        state['_reader'] = None
+        return state
+
+    def __setstate__(self, state: dict):
+        self.__dict__.update(state)
+        if self._file is not None:
+            position = self._file
+            self._file = open(self._csvfile, 'rb')
+            self._file.seek(position)
+            self._reader = self._rows()
+            # restored while iterating, see Reader._resumed()
+            self._resume = self._counter > 0
+
     def __next__(self) -> Request:
         if self._counter == 0:
             raise StopIteration
@@ -34,7 +70,12 @@ class CSVReader(Reader):
         self._counter -= 1
 
         try:
-            return Request.fromlist(next(self._reader))
+            row = next(self._reader)
         except StopIteration:
             self._file.seek(0)
-            return Request.fromlist(next(self._reader))
+            self._reader = self._rows()
+            row = next(self._reader)
+
+        hash = row[1] if self._interner is None else self._interner(row[1])
+
+        return Request(float(row[0]), hash, int(row[2]), int(row[3]))
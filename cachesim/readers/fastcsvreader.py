@@ -0,0 +1,156 @@
+import csv
+from itertools import repeat
+from os import access, R_OK
+from os.path import getmtime, isdir, isfile
+from typing import Iterator
+
+import numpy as np
+
+from cachesim import Reader, Request, Interner, Trace
+
+
+class FastCSVReader(Reader):
+    """
+    Same as CSVReader, but the file is parsed in large chunks into typed columns (see Trace), and requests are served
+    from the columns in batches. Hashes are interned, requests carry object ids, trace.hashes has the original ones.
+
+    The columns are saved into a binary sidecar next to the CSV file (<csvfile>.trace directory). Later runs load the
+    sidecar memory mapped and skip parsing, as long as it is not older than the CSV file.
+    """
+
+    def __init__(self, totalcount: int, csvfile: str, chunksize: int = 1 << 24, sidecar: bool = True):
+        """
+        :param totalcount: Number of requests to read, the file is read again from the beginning if shorter.
+        :param csvfile: CSV file with time, hash, size and maxage columns.
+        :param chunksize: Approximate size of the chunks to parse in Byte.
+        :param sidecar: Use and create the binary sidecar.
+        """
+        super().__init__(totalcount=totalcount)
+
+        assert isfile(csvfile) and access(csvfile, R_OK), f"File '{csvfile}' doesn't exist or isn't readable"
+        assert chunksize > 0, f"I expect a positive chunksize, got '{chunksize}'"
+        self._csvfile = csvfile
+        self._chunksize = chunksize
+        self._sidecar = f"{csvfile}.trace" if sidecar else None
+        self._trace = None
+        self._requests = None
+
+    @property
+    def trace(self) -> Trace:
+        """All requests of the file, loaded from the sidecar or parsed on first access."""
+        if self._trace is None:
+            if self._sidecar is not None and isdir(self._sidecar) and \
+                    getmtime(self._sidecar) >= getmtime(self._csvfile):
+                try:
+                    self._trace = Trace.load(self._sidecar)
+                except (OSError, ValueError):
+                    # unreadable sidecar, parsed again
+                    pass
+
+            if self._trace is None:
+                self._trace = self._parse()
+                if self._sidecar is not None:
+                    try:
+                        self._trace.save(self._sidecar)
+                    except OSError:
+                        # e.g. read only directory, the parsed trace is kept
+                        pass
+
+        return self._trace
+
+    def _parse(self) -> Trace:
+        interner = Interner()
+        chunks = list(self.chunks(interner))
+
+        return Trace(*[np.concatenate([getattr(chunk, name) for chunk in chunks]) if chunks else []
+                       for name in ['time', 'id', 'size', 'maxage']], hashes=interner.hashes)
+
+    def chunks(self, interner: Interner) -> Iterator[Trace]:
+        """
+        Parses the file once, in chunks, without keeping it in memory.
+
+        :param interner: Interner of the hashes, shared by the chunks.
+        """
+        with open(self._csvfile, newline='') as file:
+            while True:
+                lines = file.readlines(self._chunksize)
+                if not lines:
+                    break
+
+                # plain split, if every line has exactly 4 fields, csv module for anything else (quoted commas, 5th
+                # column, blank lines)
+                if set(map(str.count, lines, repeat(','))) == {3}:
+                    fields = ''.join(lines).replace('\r', '').replace('\n', ',').split(',')
+                    if fields[-1] == '':
+                        fields.pop()
+                    time, hash, size, maxage = fields[0::4], [h.strip('"') for h in fields[1::4]], fields[2::4], \
+                                               fields[3::4]
+                else:
+                    rows = [row for row in csv.reader(lines) if len(row) >= 4]
+                    time, hash, size, maxage = [[row[i] for row in rows] for i in range(4)]
+
+                yield Trace(np.array(time, dtype=np.float64), np.array(interner.map(hash), dtype=np.int64),
+                            np.array(size, dtype=np.int64), np.array(maxage, dtype=np.int64))
+
+    def batches(self, batchsize: int = 1 << 16) -> Iterator[Trace]:
+        """
+        Requests in columnar batches, totalcount in total.
+
+        :param batchsize: Maximum number of requests in a batch.
+        """
+        trace = self.trace
+        assert len(trace) or not self.totalcount, f"File '{self._csvfile}' has no requests"
+
+        remaining = self.totalcount
+        start = 0
+        while remaining:
+            end = min(start + batchsize, start + remaining, len(trace))
+            yield trace[start:end]
+            remaining -= end - start
+            start = end % len(trace)
+
+    def __iter__(self) -> Iterator:
+        self._requests = (request for batch in self.batches() for request in batch)
+        return super().__iter__()
+
+    def __next__(self) -> Request:
+        return next(self._requests)
+
+
+if __name__ == "__main__":
+    import os
+    import random
+    import shutil
+    import tempfile
+    import time
+
+    from cachesim.readers import CSVReader
+
+    # 10M requests over 1M objects
+    totalcount = 10000000
+    csvfile = os.path.join(tempfile.mkdtemp(), 'trace.csv')
+    random.seed(0)
+    with open(csvfile, 'w') as f:
+        for i in range(totalcount):
+            f.write(f"{i / 100},\"{random.getrandbits(20):x}\",{random.randint(1, 10000)},3600\n")
+
+    start = time.perf_counter()
+    for _ in CSVReader(totalcount, csvfile):
+        pass
+    print(f"CSVReader: {totalcount / (time.perf_counter() - start):.0f} requests/s")
+
+    start = time.perf_counter()
+    FastCSVReader(totalcount, csvfile).trace
+    print(f"FastCSVReader parse and write sidecar: {totalcount / (time.perf_counter() - start):.0f} requests/s")
+
+    start = time.perf_counter()
+    for _ in FastCSVReader(totalcount, csvfile):
+        pass
+    print(f"FastCSVReader requests from sidecar: {totalcount / (time.perf_counter() - start):.0f} requests/s")
+
+    start = time.perf_counter()
+    for _ in FastCSVReader(totalcount, csvfile).batches():
+        pass
+    print(f"FastCSVReader batches from sidecar: {totalcount / (time.perf_counter() - start):.0f} requests/s")
+
+    shutil.rmtree(os.path.dirname(csvfile))
@@ -0,0 +1,194 @@
+import os
+from os import access, R_OK
+from os.path import isfile
+from typing import Iterable, Iterator, Optional, Sequence, Union
+
+import numpy as np
+
+from cachesim import Reader, Request, Interner, Trace
+
+# binary trace format: a 64 Byte header, fixed width records, then the original hashes as a .npy blob (optional)
+MAGIC = b'CSIMTRCE'
+VERSION = 1
+HEADER = np.dtype({'names': ['magic', 'version', 'recordsize', 'count', 'hashes'],
+                   'formats': ['S8', '<u4', '<u4', '<u8', '<u8'],
+                   'itemsize': 64})
+RECORD = np.dtype([('time', '<f8'), ('id', '<i8'), ('size', '<i8'), ('maxage', '<i8')])
+
+
+class MmapReader(Reader):
+    """
+    Serves requests from a binary trace file (see write() and convert()), memory mapped, without parsing or copying.
+    Only the header is read at startup, requests are read from the mapped records on demand, so startup takes the same
+    time for any trace size. Requests carry object ids, see hashes for the original ones.
+    """
+
+    @staticmethod
+    def write(path: str, traces: Union[Trace, Iterable[Trace]], hashes: Optional[Sequence] = None):
+        """
+        Writes a binary trace file, replacing it if exists.
+
+        :param path: The trace file.
+        :param traces: A trace, or traces to write one after the other (e.g. chunks of a large trace).
+        :param hashes: Original hash of each object id, trace.hashes by default. Written after the traces, so it may
+                       be filled while they are iterated (e.g. Interner.hashes).
+        """
+        if isinstance(traces, Trace):
+            hashes = traces.hashes if hashes is None else hashes
+            traces = [traces]
+
+        tmp = f"{path}.tmp"
+        try:
+            with open(tmp, 'wb') as file:
+                header = np.zeros(1, dtype=HEADER)
+                header.tofile(file)
+
+                for trace in traces:
+                    records = np.empty(len(trace), dtype=RECORD)
+                    for name in RECORD.names:
+                        records[name] = getattr(trace, name)
+                    records.tofile(file)
+                    header['count'] += len(trace)
+
+                if hashes is not None:
+                    header['hashes'] = file.tell()
+                    np.save(file, np.asarray(hashes, dtype=str))
+
+                header['magic'], header['version'], header['recordsize'] = MAGIC, VERSION, RECORD.itemsize
+                file.seek(0)
+                header.tofile(file)
+
+            os.replace(tmp, path)
+        except BaseException:
+            # no partial file left behind, the previous one is kept
+            if os.path.exists(tmp):
+                os.remove(tmp)
+            raise
+
+    @classmethod
+    def convert(cls, csvfile: str, path: str, chunksize: int = 1 << 24):
+        """
+        Converts a CSV file (see CSVReader) into a binary trace file, in chunks, without keeping it in memory.
+
+        :param csvfile: CSV file with time, hash, size and maxage columns.
+        :param path: The trace file.
+        :param chunksize: Approximate size of the chunks to parse in Byte.
+        """
+        from cachesim.readers import FastCSVReader
+
+        interner = Interner()
+        cls.write(path, FastCSVReader(0, csvfile, chunksize=chunksize, sidecar=False).chunks(interner),
+                  hashes=interner.hashes)
+
+    def __init__(self, totalcount: int, path: str, start: Optional[float] = None, end: Optional[float] = None):
+        """
+        :param totalcount: Number of requests to read, the trace is read again from the beginning if shorter.
+        :param path: The trace file.
+        :param start: Serve requests from this time on (optional), requests must be in time order.
+        :param end: Serve requests before this time (optional), requests must be in time order.
+        """
+        super().__init__(totalcount=totalcount)
+
+        assert isfile(path) and access(path, R_OK), f"File '{path}' doesn't exist or isn't readable"
+        header = np.fromfile(path, dtype=HEADER, count=1)
+        assert len(header) == 1 and header['magic'][0] == MAGIC, f"File '{path}' is not a binary trace"
+        assert header['version'][0] == VERSION and header['recordsize'][0] == RECORD.itemsize, \
+            f"Unsupported binary trace version '{header['version'][0]}' in '{path}'"
+
+        self._path = path
+        self._hashesoffset = int(header['hashes'][0])
+        self._hashes = None
+        count = int(header['count'][0])
+        self._records = np.memmap(path, dtype=RECORD, mode='r', offset=HEADER.itemsize, shape=(count,)) if count \
+            else np.empty(0, dtype=RECORD)
+
+        # binary search of the time range, touches a few pages only
+        time = self._records['time']
+        first = int(np.searchsorted(time, start, side='left')) if start is not None else 0
+        last = int(np.searchsorted(time, end, side='left')) if end is not None else count
+        self._trace = Trace(*[self._records[name][first:max(first, last)] for name in RECORD.names], check=False)
+        self._requests = None
+
+    @property
+    def trace(self) -> Trace:
+        """Requests of the time range, as views of the mapped file."""
+        return self._trace
+
+    @property
+    def hashes(self) -> Optional[np.ndarray]:
+        """Original hashes indexed by object id, None if unknown. Read on first access."""
+        if self._hashes is None and self._hashesoffset:
+            with open(self._path, 'rb') as file:
+                file.seek(self._hashesoffset)
+                self._hashes = np.load(file)
+
+        return self._hashes
+
+    def batches(self, batchsize: int = 1 << 16) -> Iterator[Trace]:
+        """
+        Requests in columnar batches, totalcount in total.
+
+        :param batchsize: Maximum number of requests in a batch.
+        """
+        trace = self._trace
+        assert len(trace) or not self.totalcount, f"Trace '{self._path}' has no requests in the time range"
+
+        remaining = self.totalcount
+        start = 0
+        while remaining:
+            end = min(start + batchsize, start + remaining, len(trace))
+            yield trace[start:end]
+            remaining -= end - start
+            start = end % len(trace)
+
+    def __iter__(self) -> Iterator:
+        self._requests = (request for batch in self.batches() for request in batch)
+        return super().__iter__()
+
+    def __next__(self) -> Request:
+        return next(self._requests)
+
+
+if __name__ == "__main__":
+    import random
+    import shutil
+    import tempfile
+    import time
+
+    from cachesim.readers import CSVReader
+
+    # 10M requests over 1M objects
+    totalcount = 10000000
+    dir = tempfile.mkdtemp()
+    csvfile = os.path.join(dir, 'trace.csv')
+    path = os.path.join(dir, 'trace.bin')
+    random.seed(0)
+    with open(csvfile, 'w') as f:
+        for i in range(totalcount):
+            f.write(f"{i / 100},\"{random.getrandbits(20):x}\",{random.randint(1, 10000)},3600\n")
+
+    start = time.perf_counter()
+    MmapReader.convert(csvfile, path)
+    print(f"convert: {totalcount / (time.perf_counter() - start):.0f} requests/s, "
+          f"{os.path.getsize(path) / 2 ** 20:.0f} MiB")
+
+    start = time.perf_counter()
+    reader = MmapReader(totalcount, path, start=1000, end=2000)
+    print(f"startup: {(time.perf_counter() - start) * 1000:.3f} ms, {len(reader.trace)} requests in the time range")
+
+    start = time.perf_counter()
+    for _ in CSVReader(totalcount, csvfile):
+        pass
+    print(f"CSVReader: {totalcount / (time.perf_counter() - start):.0f} requests/s")
+
+    start = time.perf_counter()
+    for _ in MmapReader(totalcount, path):
+        pass
+    print(f"MmapReader: {totalcount / (time.perf_counter() - start):.0f} requests/s")
+
+    start = time.perf_counter()
+    for _ in MmapReader(totalcount, path).batches():
+        pass
+    print(f"MmapReader batches: {totalcount / (time.perf_counter() - start):.0f} requests/s")
+
+    shutil.rmtree(dir)
@@ -1,30 +1,141 @@
 import random
 import time
-from typing import List
+from operator import length_hint
+from typing import Iterator, List, Optional
 
-from cachesim import Reader, Request
+import numpy as np
+
+from cachesim import Reader, Request, Interner
+from cachesim.workload import AliasTable
 
 
 class PopulationReader(Reader):
+    """
+    Requests for the objects of a population with given weights. Objects are drawn with an alias table in chunks, so
+    memory does not depend on totalcount. For large populations in array form and popularity churn, see
+    cachesim.workload.IRM.
+    """
 
-    def __init__(self, totalcount: int, population: List[Request], weights: List[int]):
+    def __init__(self, totalcount: int, population: List[Request], weights: List[int],
+                 interner: Optional[Interner] = None, rate: Optional[float] = None, chunksize: int = 1 << 16):
+        """
+        :param totalcount: Number of requests.
+        :param population: The objects.
+        :param weights: Relative request probability of the objects.
+        :param interner: Replace hashes with interned integer ids (optional).
+        :param rate: Requests per second of synthetic time from 0 (Poisson arrivals), wall clock time if not given.
+        :param chunksize: Number of objects drawn at once.
+        """
         super().__init__(totalcount)
 
         assert len(population) == len(
             weights), f"population size must match with weights len, got: '{len(population)}', '{len(weights)}'"
         assert all(isinstance(e, Request) for e in population), f"Population should have Request element"
         self._population = population
+        self._interner = interner
+
+        # intern hashes once, requests refer to them by id
+        self._hashes = [e._hash if interner is None else interner(e._hash) for e in population]
 
         assert all(w >= 0 for w in weights), f"Weights should be non negative integers"
         self._weights = weights
+        self._table = AliasTable(weights)
+
+        assert rate is None or rate > 0, f"I expect a positive rate, got '{rate}'"
+        assert chunksize > 0, f"I expect a positive chunksize, got '{chunksize}'"
+        self._rate = rate
+        self._chunksize = chunksize
 
         self._requests = None
 
+        # generator state before the actual chunk and positions left in it, for checkpoints
+        self._chunk = None
+        self._positions = None
+
     def __iter__(self):
-        self._requests = iter(random.choices(self._population, self._weights, k=self.totalcount))
+        if self._resumed():
+            return super().__iter__()
+
+        # seeded from the random module, random.seed() makes the requests reproducible
+        rng = np.random.default_rng(random.getrandbits(64))
+        self._chunk = (rng.bit_generator.state, self.totalcount, 0.0)
+        self._positions = None
+        self._requests = self._draw(rng, self.totalcount, 0.0)
 
         return super().__iter__()
 
+    def _draw(self, rng: np.random.Generator, remaining: int, last: float, skip: int = 0) -> Iterator[Request]:
+        """
+        Draws the remaining requests in chunks.
+
+        :param rng: The generator.
+        :param remaining: Requests to draw.
+        :param last: Time of the last request.
+        :param skip: Requests of the first chunk already returned.
+        """
+        while remaining:
+            self._chunk = (rng.bit_generator.state, remaining, last)
+            n = min(self._chunksize, remaining)
+            remaining -= n
+
+            if self._rate is not None:
+                times = last + np.cumsum(rng.exponential(1 / self._rate, n))
+                last = float(times[-1])
+                times = times.tolist()
+            else:
+                times = None
+
+            # the positions left tell the requests returned from the chunk
+            self._positions = positions = iter(range(skip, n))
+            for i, index in zip(positions, self._table(rng, n).tolist()[skip:]):
+                chosen = self._population[index]
+                yield type(chosen)(time=time.time() if times is None else times[i], hash=self._hashes[index],
+                                   size=chosen._size, maxage=chosen._maxage)
+            skip = 0
+
     def __next__(self):
-        chosen = next(self._requests)
-        return Request(time=time.time(), hash=chosen._hash, size=chosen._size, maxage=chosen._maxage)
+        return next(self._requests)
+
+    def __getstate__(self):
+        # the generator is replaced by the state of the actual chunk and the position in it, drawn again on restore
+        state = self.__dict__.copy()
+        state['_requests'] = None
+        state['_positions'] = None
+        if self._requests is None:
+            state['_chunk'] = None
+        elif self._positions is not None:
+            state['_position'] = min(self._chunksize, self._chunk[1]) - length_hint(self._positions)
+        return state
+
+    def __setstate__(self, state: dict):
+        state = state.copy()
+        position = state.pop('_position', 0)
+        self.__dict__.update(state)
+        if self._chunk is not None:
+            rngstate, remaining, last = self._chunk
+            rng = np.random.default_rng()
+            rng.bit_generator.state = rngstate
+            self._requests = self._draw(rng, remaining, last, position)
+            # restored while iterating, see Reader._resumed()
+            self._resume = remaining > position
+
+
+if __name__ == "__main__":
+    import tracemalloc
+
+    # 1M requests over 100k objects, zipf like popularity
+    count = 100000
+    population = [Request(0, str(i), random.randint(1, 1000), 3600) for i in range(count)]
+    reader = PopulationReader(1000000, population, weights=[1 / (i + 1) for i in range(count)], rate=100)
+
+    start = time.perf_counter()
+    for _ in reader:
+        pass
+    print(f"PopulationReader: {reader.totalcount / (time.perf_counter() - start):.0f} requests/s")
+
+    tracemalloc.start()
+    for _ in reader:
+        pass
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"PopulationReader: {peak / 2 ** 20:.1f} MiB peak")
@@ -1,13 +1,14 @@
 import random
 import time
+from typing import Optional
 
-from cachesim import Reader, Request
+from cachesim import Reader, Request, Interner
 
 
 class RandomReader(Reader):
 
     def __init__(self, totalcount: int, hashlen: int = 8, sizegen: callable = random.randint(1, 100),
-                 maxagegen: callable = random.randint(60, 300)):
+                 maxagegen: callable = random.randint(60, 300), interner: Optional[Interner] = None):
         super().__init__(totalcount)
 
         assert hashlen > 0, f"I expect a positive hashlen, got '{hashlen}'"
@@ -15,19 +16,36 @@ class RandomReader(Reader):
         self._sizegen = sizegen
         self._maxagegen = maxagegen
         self._counter = 0
+        self._interner = interner
+
+        # own generator, pickled with the reader for checkpoints
+        self._random = None
 
     @property
     def totalcount(self) -> int:
         return self._totalcount
 
     def __iter__(self):
+        if self._resumed():
+            return super().__iter__()
+
+        # seeded from the random module, random.seed() makes the requests reproducible
+        self._random = random.Random(random.getrandbits(64))
         self._counter = self.totalcount
         return super().__iter__()
 
+    def __setstate__(self, state: dict):
+        self.__dict__.update(state)
+        # restored while iterating, see Reader._resumed()
+        self._resume = self._random is not None and self._counter > 0
+
     def __next__(self) -> Request:
         if self._counter == 0:
             raise StopIteration
 
         self._counter -= 1
-        return Request(time.time(), '%x' % random.getrandbits(self._hashlen * 8), int(self._sizegen),
-                       int(self._maxagegen))
+        hash = '%x' % self._random.getrandbits(self._hashlen * 8)
+        if self._interner is not None:
+            hash = self._interner(hash)
+
+        return Request(time.time(), hash, int(self._sizegen), int(self._maxagegen))
@@ -0,0 +1,237 @@
+import asyncio
+import csv
+import os
+from os import access, R_OK
+from os.path import isfile
+from typing import List, Optional, Tuple, Union
+
+from cachesim import Request, Interner
+
+
+class TailReader:
+    """
+    Asyncio reader of live access logs: follows CSV files (time, hash, size and maxage columns) as lines are appended,
+    like tail -f, and/or listens on a TCP socket for log lines sent by shippers. The requests come in batches, one per
+    chunk read, parsed at once. Batches wait in a bounded queue: if the simulation is slower than the logs, files are
+    not read further and sockets are not read (TCP flow control pushes back to the senders). Nothing is kept beyond
+    the queue.
+
+        reader = TailReader('access.log', ('127.0.0.1', 9000))
+        async for batch in reader:
+            ...
+
+    Rotated (replaced) and truncated files are read again from their beginning.
+    """
+
+    def __init__(self, *sources: Union[str, Tuple[str, int]], totalcount: Optional[int] = None,
+                 chunksize: int = 1 << 16, queuesize: int = 16, interval: float = .1, idle: Optional[float] = None,
+                 fromstart: bool = True, interner: Optional[Interner] = None):
+        """
+        :param sources: Log files to follow, and (host, port) addresses to listen on.
+        :param totalcount: Number of requests to read, endless if None.
+        :param chunksize: Maximum size of the chunks read (and parsed into a batch) in Byte.
+        :param queuesize: Maximum number of batches waiting for the simulation.
+        :param interval: Time between polls of files at their end, in seconds.
+        :param idle: Stop if no requests come for this long, in seconds (optional).
+        :param fromstart: Read the files from the beginning, not only the lines appended later.
+        :param interner: Replace hashes with interned integer ids (optional).
+        """
+        assert sources, f"I expect log files or addresses to read"
+        for source in sources:
+            assert not isinstance(source, str) or isfile(source) and access(source, R_OK), \
+                f"File '{source}' doesn't exist or isn't readable"
+            assert isinstance(source, str) or len(source) == 2, f"I expect a (host, port) address, got '{source}'"
+        assert totalcount is None or totalcount >= 0, f"I expect a non negative totalcount, got '{totalcount}'"
+        assert chunksize > 0, f"I expect a positive chunksize, got '{chunksize}'"
+        assert queuesize > 0, f"I expect a positive queuesize, got '{queuesize}'"
+        assert interval > 0, f"I expect a positive interval, got '{interval}'"
+        assert idle is None or idle > 0, f"I expect a positive idle time, got '{idle}'"
+
+        self._sources = sources
+        self._totalcount = totalcount
+        self._chunksize = chunksize
+        self._queuesize = queuesize
+        self._interval = interval
+        self._idle = idle
+        self._fromstart = fromstart
+        self._interner = interner
+
+        self._queue = None
+        self._tasks = []
+        self._servers = []
+        self._remaining = totalcount
+        self._skipped = 0
+        self._closed = False
+
+    @property
+    def totalcount(self) -> Optional[int]:
+        return self._totalcount
+
+    @property
+    def skipped(self) -> int:
+        """Lines skipped, not having time, hash, size and maxage, or not UTF-8."""
+        return self._skipped
+
+    @property
+    def addresses(self) -> List[Tuple[str, int]]:
+        """Addresses listened on, with the actual ports (for port 0), once started."""
+        return [socket.getsockname()[:2] for server in self._servers for socket in server.sockets]
+
+    async def start(self):
+        """Starts reading the sources, called by the first iteration if not earlier."""
+        if self._queue is not None:
+            return
+
+        self._queue = asyncio.Queue(self._queuesize)
+        for source in self._sources:
+            if isinstance(source, str):
+                self._tasks.append(asyncio.create_task(self._tail(source)))
+            else:
+                self._servers.append(await asyncio.start_server(self._receive, *source))
+
+    def close(self):
+        """Stops reading, the iteration ends."""
+        self._closed = True
+        for task in self._tasks:
+            task.cancel()
+        for server in self._servers:
+            server.close()
+        self._tasks = []
+        self._servers = []
+
+    def _lines(self, data: bytes) -> List[str]:
+        try:
+            return data.decode().splitlines()
+        except UnicodeDecodeError:
+            # line by line, lines with invalid bytes are skipped
+            lines = []
+            for line in data.splitlines():
+                try:
+                    lines.append(line.decode())
+                except UnicodeDecodeError:
+                    self._skipped += 1
+            return lines
+
+    def _parse(self, data: bytes) -> List[Request]:
+        interner = self._interner
+        requests = []
+        for row in csv.reader(self._lines(data)):
+            try:
+                requests.append(Request(float(row[0]), row[1] if interner is None else interner(row[1]), int(row[2]),
+                                        int(row[3])))
+            except (IndexError, ValueError):
+                # blank lines, headers, lines cut by a rotation
+                self._skipped += 1
+        return requests
+
+    async def _put(self, pending: bytes, data: bytes) -> bytes:
+        """Queues the complete lines of the data, returns the partial line at the end."""
+        data = pending + data
+        end = data.rfind(b'\n') + 1
+        if end:
+            batch = self._parse(data[:end])
+            if batch:
+                await self._queue.put(batch)
+        return data[end:]
+
+    async def _tail(self, path: str):
+        file = open(path, 'rb')
+        try:
+            if not self._fromstart:
+                file.seek(0, os.SEEK_END)
+            pending = b''
+            while True:
+                data = file.read(self._chunksize)
+                if data:
+                    pending = await self._put(pending, data)
+                    continue
+
+                # at the end: replaced or truncated files are read from the beginning
+                try:
+                    stat = os.stat(path)
+                except FileNotFoundError:
+                    stat = None
+                if stat is not None and (stat.st_ino != os.fstat(file.fileno()).st_ino or stat.st_size < file.tell()):
+                    file.close()
+                    file = open(path, 'rb')
+                    pending = b''
+                    continue
+
+                await asyncio.sleep(self._interval)
+        except Exception as e:
+            await self._queue.put(e)
+        finally:
+            file.close()
+
+    async def _receive(self, stream: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        task = asyncio.current_task()
+        self._tasks.append(task)
+        try:
+            pending = b''
+            while data := await stream.read(self._chunksize):
+                pending = await self._put(pending, data)
+            if pending:
+                await self._put(pending, b'\n')
+        except ConnectionError:
+            # the sender is gone, other connections go on
+            pass
+        except Exception as e:
+            await self._queue.put(e)
+        finally:
+            writer.close()
+            if task in self._tasks:
+                self._tasks.remove(task)
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self) -> List[Request]:
+        if self._queue is None:
+            await self.start()
+        if self._closed or self._remaining == 0:
+            self.close()
+            raise StopAsyncIteration
+
+        # let the sources refill the queue
+        await asyncio.sleep(0)
+        try:
+            batch = await asyncio.wait_for(self._queue.get(), self._idle)
+        except asyncio.TimeoutError:
+            self.close()
+            raise StopAsyncIteration
+        if isinstance(batch, Exception):
+            self.close()
+            raise batch
+
+        if self._remaining is not None:
+            batch = batch[:self._remaining]
+            self._remaining -= len(batch)
+        return batch
+
+
+if __name__ == "__main__":
+    import tempfile
+    import time
+
+    # 1M log lines written to a file in 10 bursts while being read
+    totalcount = 1000000
+
+    async def write(path: str):
+        with open(path, 'a') as file:
+            for burst in range(10):
+                file.writelines(f"{i / 100},{i % 100000:x},{i % 1000 + 1},3600\n"
+                                for i in range(burst * totalcount // 10, (burst + 1) * totalcount // 10))
+                file.flush()
+                await asyncio.sleep(.01)
+
+    async def main(path: str):
+        writer = asyncio.create_task(write(path))
+        count = 0
+        start = time.perf_counter()
+        async for batch in TailReader(path, totalcount=totalcount):
+            count += len(batch)
+        await writer
+        print(f"TailReader: {count / (time.perf_counter() - start):.0f} requests/s")
+
+    with tempfile.NamedTemporaryFile(suffix='.csv') as log:
+        asyncio.run(main(log.name))
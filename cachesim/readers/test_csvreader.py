@@ -1,3 +1,5 @@
+import os
+import tempfile
 from unittest import TestCase
 
 from cachesim import Request
@@ -22,3 +24,14 @@ class TestCSVReader(TestCase):
 
         with self.assertRaises(AssertionError):
             CSVReader(totalcount=5, csvfile='nonexistent.csv')
+
+    def test_encoding(self):
+        # quoted fields spanning lines, non ASCII hashes in the given encoding
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'trace.csv')
+            with open(path, 'w', encoding='latin-1', newline='') as f:
+                f.write('1.0,"a\r\nb",100,300\r\n2.0,\xe9t\xe9,100,300\r\n')
+
+            requests = list(CSVReader(totalcount=2, csvfile=path, encoding='latin-1'))
+            self.assertEqual(['a\r\nb', '\xe9t\xe9'], [request.hash for request in requests])
+            self.assertEqual([1.0, 2.0], [request.time for request in requests])
@@ -0,0 +1,103 @@
+import os
+import shutil
+import tempfile
+from unittest import TestCase
+from unittest.mock import patch
+
+from cachesim import Request, Trace
+from cachesim.readers import CSVReader, FastCSVReader
+
+
+class TestFastCSVReader(TestCase):
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.csvfile = os.path.join(self.dir, 'sample.csv')
+        shutil.copy('cachesim/readers/sample.csv', self.csvfile)
+
+    def tearDown(self):
+        shutil.rmtree(self.dir)
+
+    def test_fastcsvreader(self):
+        reader = FastCSVReader(totalcount=12, csvfile=self.csvfile, chunksize=40)
+
+        count = 0
+        for request in reader:
+            count += 1
+            self.assertIsInstance(request, Request)
+            self.assertIn(reader.trace.hashes[request.hash], ['a', 'b', 'c', 'd', 'e'])
+
+        self.assertEqual(count, 12)
+        with self.assertRaises(StopIteration):
+            next(reader)
+
+        # same requests as CSVReader, typed
+        expected = list(CSVReader(totalcount=12, csvfile=self.csvfile))
+        actual = list(reader)
+        self.assertEqual([r.time for r in expected], [r.time for r in actual])
+        self.assertEqual([r.hash for r in expected], [reader.trace.hashes[r.hash] for r in actual])
+        self.assertEqual([r._size for r in expected], [r.size for r in actual])
+        self.assertEqual([r._maxage for r in expected], [r.maxage for r in actual])
+        self.assertIsInstance(actual[0].time, float)
+        self.assertIsInstance(actual[0].size, int)
+
+        self.assertEqual([5, 5, 2], [len(batch) for batch in reader.batches()])
+        self.assertEqual([3, 2, 3, 2, 2], [len(batch) for batch in reader.batches(batchsize=3)])
+
+        with self.assertRaises(AssertionError):
+            FastCSVReader(totalcount=5, csvfile='nonexistent.csv')
+
+    def test_sidecar(self):
+        reader = FastCSVReader(totalcount=12, csvfile=self.csvfile)
+        self.assertEqual(5, len(reader.trace))
+        self.assertTrue(os.path.isdir(f"{self.csvfile}.trace"))
+
+        # parsing is skipped
+        os.utime(self.csvfile, (0, 0))
+        reader = FastCSVReader(totalcount=12, csvfile=self.csvfile)
+        reader._parse = None
+        self.assertEqual([1.2, 3.5, 5.6, 6.7, 7.8], reader.trace.time.tolist())
+        self.assertEqual(['a', 'b', 'c', 'd', 'e'], list(reader.trace.hashes))
+        self.assertEqual(12, len(list(reader)))
+
+        # changed file
+        with open(self.csvfile, 'a') as f:
+            f.write('9.9,"f",100,300\n')
+        reader = FastCSVReader(totalcount=12, csvfile=self.csvfile)
+        self.assertEqual(6, len(reader.trace))
+        self.assertEqual(6, len(FastCSVReader(totalcount=12, csvfile=self.csvfile).trace))
+
+        reader = FastCSVReader(totalcount=12, csvfile=self.csvfile, sidecar=False)
+        shutil.rmtree(f"{self.csvfile}.trace")
+        self.assertEqual(6, len(reader.trace))
+        self.assertFalse(os.path.exists(f"{self.csvfile}.trace"))
+
+    def test_fields(self):
+        # a line with 3 fields and one with 5, as many fields as 2 lines of 4
+        with open(self.csvfile, 'w') as f:
+            f.write('1.0,a,100\n2.0,b,200,300,extra\n3.0,c,300,400\n')
+        reader = FastCSVReader(totalcount=2, csvfile=self.csvfile, sidecar=False)
+        self.assertEqual([2.0, 3.0], reader.trace.time.tolist())
+        self.assertEqual(['b', 'c'], list(reader.trace.hashes))
+        self.assertEqual([200, 300], reader.trace.size.tolist())
+        self.assertEqual([300, 400], reader.trace.maxage.tolist())
+
+    def test_readonly(self):
+        # the sidecar can not be written (read only directory), the parsed trace is used
+        with patch.object(Trace, 'save', side_effect=PermissionError):
+            reader = FastCSVReader(totalcount=5, csvfile=self.csvfile)
+            self.assertEqual(5, len(reader.trace))
+            self.assertEqual(5, len(list(reader)))
+
+    def test_partial(self):
+        # a crash while saving leaves no sidecar behind
+        trace = FastCSVReader(totalcount=5, csvfile=self.csvfile, sidecar=False).trace
+        with patch('numpy.save', side_effect=[None, None, KeyboardInterrupt]):
+            with self.assertRaises(KeyboardInterrupt):
+                trace.save(f"{self.csvfile}.trace")
+        self.assertEqual(['sample.csv'], os.listdir(self.dir))
+
+        # an unreadable sidecar is parsed again
+        os.makedirs(f"{self.csvfile}.trace")
+        with open(os.path.join(f"{self.csvfile}.trace", 'time.npy'), 'w') as f:
+            f.write('partial')
+        self.assertEqual(5, len(FastCSVReader(totalcount=5, csvfile=self.csvfile).trace))
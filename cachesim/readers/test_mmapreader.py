@@ -0,0 +1,86 @@
+import os
+import shutil
+import tempfile
+from unittest import TestCase
+
+import numpy as np
+
+from cachesim import Request, Trace
+from cachesim.readers import CSVReader, MmapReader
+
+
+class TestMmapReader(TestCase):
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.dir, 'sample.bin')
+        MmapReader.convert('cachesim/readers/sample.csv', self.path, chunksize=40)
+
+    def tearDown(self):
+        shutil.rmtree(self.dir)
+
+    def test_mmapreader(self):
+        reader = MmapReader(totalcount=12, path=self.path)
+
+        count = 0
+        for request in reader:
+            count += 1
+            self.assertIsInstance(request, Request)
+
+        self.assertEqual(count, 12)
+        with self.assertRaises(StopIteration):
+            next(reader)
+
+        # same requests as CSVReader
+        expected = list(CSVReader(totalcount=12, csvfile='cachesim/readers/sample.csv'))
+        actual = list(reader)
+        self.assertEqual([r.time for r in expected], [r.time for r in actual])
+        self.assertEqual([r.hash for r in expected], [reader.hashes[r.hash] for r in actual])
+        self.assertEqual([r._size for r in expected], [r.size for r in actual])
+        self.assertEqual([r._maxage for r in expected], [r.maxage for r in actual])
+
+        # served from the mapped file
+        self.assertIsInstance(reader.trace.time.base, np.memmap)
+
+        self.assertEqual([5, 5, 2], [len(batch) for batch in reader.batches()])
+        with self.assertRaises(AssertionError):
+            MmapReader(totalcount=5, path='nonexistent.bin')
+        with self.assertRaises(AssertionError):
+            MmapReader(totalcount=5, path='cachesim/readers/sample.csv')
+
+    def test_timerange(self):
+        reader = MmapReader(totalcount=5, path=self.path, start=3.5, end=7.8)
+        self.assertEqual([3.5, 5.6, 6.7, 3.5, 5.6], [r.time for r in reader])
+
+        self.assertEqual([6.7, 7.8], [r.time for r in MmapReader(totalcount=2, path=self.path, start=6)])
+        self.assertEqual([1.2, 1.2], [r.time for r in MmapReader(totalcount=2, path=self.path, end=2)])
+
+        reader = MmapReader(totalcount=0, path=self.path, start=10)
+        self.assertEqual(0, len(reader.trace))
+        self.assertEqual([], list(reader))
+        with self.assertRaises(AssertionError):
+            list(MmapReader(totalcount=1, path=self.path, start=10))
+
+    def test_write(self):
+        trace = Trace([1, 2, 3], [0, 1, 0], [10, 20, 10], [60, 60, 60])
+        MmapReader.write(self.path, [trace[0:2], trace[2:3]])
+
+        reader = MmapReader(totalcount=3, path=self.path)
+        self.assertIsNone(reader.hashes)
+        self.assertEqual([0, 1, 0], reader.trace.id.tolist())
+        self.assertEqual([10, 20, 10], reader.trace.size.tolist())
+        self.assertEqual([60, 60, 60], reader.trace.maxage.tolist())
+
+        MmapReader.write(self.path, Trace([], [], [], []))
+        self.assertEqual(0, len(MmapReader(totalcount=0, path=self.path).trace))
+
+    def test_failed(self):
+        # a failed write leaves the previous file, and no temporary one
+        def traces():
+            yield Trace([1], [0], [10], [60])
+            raise ValueError("parse error")
+
+        expected = MmapReader(totalcount=12, path=self.path).trace.id.tolist()
+        with self.assertRaises(ValueError):
+            MmapReader.write(self.path, traces())
+        self.assertEqual(['sample.bin'], os.listdir(self.dir))
+        self.assertEqual(expected, MmapReader(totalcount=12, path=self.path).trace.id.tolist())
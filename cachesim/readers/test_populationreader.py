@@ -48,3 +48,20 @@ class TestPopulationReader(TestCase):
 
         self.assertEqual(totalcount, n)
         self.assertLessEqual(len(uniq), count)
+
+    def test_synthetic(self):
+        population = [Request(0, "a", 10, 60), Request(0, "b", 20, 60), Request(0, "c", 30, 60)]
+
+        random.seed(1)
+        requests = list(PopulationReader(1000, population, weights=[1, 0, 3], rate=10, chunksize=300))
+        self.assertEqual(1000, len(requests))
+        self.assertEqual({"a", "c"}, {r.hash for r in requests})
+        self.assertAlmostEqual(0.75, sum(r.hash == "c" for r in requests) / 1000, delta=0.05)
+
+        # synthetic time, reproducible with random.seed()
+        self.assertTrue(all(a.time < b.time for a, b in zip(requests, requests[1:])))
+        self.assertAlmostEqual(100, requests[-1].time, delta=10)
+        random.seed(1)
+        self.assertEqual([(r.time, r.hash) for r in requests],
+                         [(r.time, r.hash) for r in PopulationReader(1000, population, [1, 0, 3], rate=10,
+                                                                     chunksize=300)])
@@ -0,0 +1,128 @@
+import asyncio
+import os
+import tempfile
+from unittest import TestCase
+
+from cachesim import Request, Interner
+from cachesim.readers import TailReader
+
+
+async def collect(reader: TailReader) -> list:
+    return [request async for batch in reader for request in batch]
+
+
+class TestTailReader(TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, 'access.log')
+        with open(self.path, 'w') as file:
+            file.write('1.2,"a",100,300\n3.5,"b",100,300\n')
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def append(self, lines: str):
+        with open(self.path, 'a') as file:
+            file.write(lines)
+
+    def test_tail(self):
+        async def main():
+            reader = TailReader(self.path, totalcount=5, interval=.01)
+            requests = []
+            async for batch in reader:
+                requests += batch
+                if len(requests) == 2:
+                    # a line written in two parts
+                    self.append('5.6,"c",10')
+                    await asyncio.sleep(.1)
+                    self.append('0,300\n6.7,d,100,300\nbad line\n7.8,e,100,300\n8.9,f,100,300\n')
+            return reader, requests
+
+        reader, requests = asyncio.run(main())
+        self.assertEqual(5, len(requests))
+        self.assertIsInstance(requests[0], Request)
+        self.assertEqual(['a', 'b', 'c', 'd', 'e'], [request.hash for request in requests])
+        self.assertEqual(5.6, requests[2].time)
+        self.assertEqual(100, requests[2]._size)
+        self.assertEqual(1, reader.skipped)
+
+        # invalid UTF-8 is skipped
+        async def main():
+            with open(self.path, 'ab') as file:
+                file.write(b'9.0,\xff\xfe,100,300\n9.1,g,100,300\n')
+            reader = TailReader(self.path, interval=.01, idle=.2)
+            return reader, await collect(reader)
+
+        reader, requests = asyncio.run(main())
+        self.assertEqual('g', requests[-1].hash)
+        self.assertEqual(2, reader.skipped)
+
+        # appended lines only
+        async def main():
+            reader = TailReader(self.path, fromstart=False, interval=.01, idle=.2)
+            task = asyncio.create_task(collect(reader))
+            await asyncio.sleep(.1)
+            self.append('9.1,g,100,300\n')
+            return await task
+
+        self.assertEqual(['g'], [request.hash for request in asyncio.run(main())])
+
+        with self.assertRaises(AssertionError):
+            TailReader('nonexistent.log')
+
+    def test_rotation(self):
+        async def main():
+            reader = TailReader(self.path, interval=.01, idle=.3, interner=Interner())
+            task = asyncio.create_task(collect(reader))
+            await asyncio.sleep(.1)
+            os.rename(self.path, self.path + '.1')
+            with open(self.path, 'w') as file:
+                file.write('4.5,c,100,300\n')
+            await asyncio.sleep(.1)
+            # truncated
+            with open(self.path, 'w') as file:
+                file.write('5,a,1,300\n')
+            return await task
+
+        self.assertEqual([0, 1, 2, 0], [request.hash for request in asyncio.run(main())])
+
+    def test_socket(self):
+        async def send(port: int, lines: str):
+            _, writer = await asyncio.open_connection('127.0.0.1', port)
+            writer.write(lines if isinstance(lines, bytes) else lines.encode())
+            await writer.drain()
+            writer.close()
+            await writer.wait_closed()
+
+        async def main():
+            reader = TailReader(('127.0.0.1', 0), self.path, idle=.3, interval=.01)
+            await reader.start()
+            port = reader.addresses[0][1]
+            await asyncio.gather(send(port, '1.5,x,10,300\n2.5,y,10,300'), send(port, '2.7,z,10,300\n'))
+            # invalid UTF-8 is skipped, the connection goes on
+            await send(port, b'2.8,\xff,10,300\n2.9,w,10,300\n')
+            await asyncio.sleep(.05)
+            # connections are forgotten once closed
+            tasks = len(reader._tasks)
+            return await collect(reader), reader, tasks
+
+        requests, reader, tasks = asyncio.run(main())
+        self.assertEqual({'a', 'b', 'x', 'y', 'z', 'w'}, {request.hash for request in requests})
+        self.assertEqual(1, reader.skipped)
+        self.assertEqual(1, tasks)
+
+    def test_backpressure(self):
+        self.append(''.join(f"{i},{i},1,300\n" for i in range(10000)))
+
+        async def main():
+            reader = TailReader(self.path, chunksize=100, queuesize=2, interval=.01)
+            batch = await reader.__anext__()
+            await asyncio.sleep(.1)
+            # the queue is full, the file is not read further
+            queued = reader._queue.qsize()
+            reader.close()
+            return batch, queued
+
+        batch, queued = asyncio.run(main())
+        self.assertLessEqual(len(batch), 10)
+        self.assertEqual(2, queued)
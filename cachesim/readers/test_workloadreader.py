@@ -0,0 +1,35 @@
+from unittest import TestCase
+
+from cachesim import Request
+from cachesim.readers import WorkloadReader
+from cachesim.workload import Zipf, ShotNoise
+
+
+class TestWorkloadReader(TestCase):
+    def test_workloadreader(self):
+        reader = WorkloadReader(totalcount=1000, workload=Zipf(100, 0.8), seed=1, batchsize=300)
+        self.assertEqual([300, 300, 300, 100], [len(batch) for batch in reader.batches()])
+
+        count = 0
+        last = 0
+        for request in reader:
+            count += 1
+            self.assertIsInstance(request, Request)
+            self.assertGreater(request.time, last)
+            last = request.time
+        self.assertEqual(1000, count)
+        with self.assertRaises(StopIteration):
+            next(reader)
+
+        # reproducible for the same seed and batchsize
+        self.assertEqual([r.hash for r in reader],
+                         [r.hash for r in WorkloadReader(1000, Zipf(100, 0.8), seed=1, batchsize=300)])
+        self.assertNotEqual([r.hash for r in reader],
+                            [r.hash for r in WorkloadReader(1000, Zipf(100, 0.8), seed=2, batchsize=300)])
+        reader = WorkloadReader(totalcount=100, workload=ShotNoise(10, 100))
+        self.assertEqual([r.time for r in reader], [r.time for r in WorkloadReader(100, ShotNoise(10, 100),
+                                                                                    seed=reader.seed)])
+
+        self.assertEqual([], list(WorkloadReader(totalcount=0, workload=Zipf(100, 0.8))))
+        with self.assertRaises(AssertionError):
+            WorkloadReader(totalcount=10, workload=None)
@@ -0,0 +1,68 @@
+from typing import Iterator, Optional
+
+import numpy as np
+
+from cachesim import Reader, Request, Trace
+from cachesim.workload import Workload
+
+
+class WorkloadReader(Reader):
+    """
+    Requests of a synthetic workload model (see cachesim.workload), generated in numpy batches, so only one batch is
+    held in memory. Reproducible: every iteration generates the same requests for the same seed and batchsize.
+    """
+
+    def __init__(self, totalcount: int, workload: Workload, seed: Optional[int] = None, batchsize: int = 1 << 16):
+        """
+        :param totalcount: Number of requests to generate.
+        :param workload: The workload model.
+        :param seed: Seed of the random generator, a random one if not given.
+        :param batchsize: Approximate number of requests in a batch.
+        """
+        super().__init__(totalcount=totalcount)
+
+        assert isinstance(workload, Workload), f"I expect a Workload, got '{workload}'"
+        assert batchsize > 0, f"I expect a positive batchsize, got '{batchsize}'"
+        self._workload = workload
+        self._seed = seed if seed is not None else int(np.random.SeedSequence().entropy % 2 ** 63)
+        self._batchsize = batchsize
+        self._requests = None
+
+    @property
+    def seed(self) -> int:
+        return self._seed
+
+    def batches(self) -> Iterator[Trace]:
+        """Requests in columnar batches, totalcount in total."""
+        remaining = self.totalcount
+        for batch in self._workload.batches(np.random.default_rng(self._seed), self._batchsize):
+            if not remaining:
+                break
+            batch = batch[:remaining]
+            remaining -= len(batch)
+            yield batch
+
+    def __iter__(self) -> Iterator:
+        self._requests = (request for batch in self.batches() for request in batch)
+        return super().__iter__()
+
+    def __next__(self) -> Request:
+        return next(self._requests)
+
+
+if __name__ == "__main__":
+    import time
+
+    from cachesim.workload import Zipf, ShotNoise, Lognormal, Pareto
+
+    # 100M requests over 10M objects, streamed in batches
+    totalcount = 100000000
+    for workload in [Zipf(10000000, 0.8, size=Lognormal(10000, 1.5), rate=1000),
+                     ShotNoise(100, 3600, volume=Pareto(1.5, 1), size=Pareto(1.2, 1000))]:
+        start = time.perf_counter()
+        requests = objects = 0
+        for batch in WorkloadReader(totalcount, workload, seed=0).batches():
+            requests += len(batch)
+            objects = max(objects, batch.objectcount)
+        print(f"{workload.__class__.__name__}: {requests / (time.perf_counter() - start):.0f} requests/s, "
+              f"{objects} objects")
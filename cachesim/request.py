@@ -3,6 +3,8 @@ class Request:
     Represents the metadata of the caches request
     """
 
+    __slots__ = ('_time', '_hash', '_size', '_maxage', '_fetched')
+
     @classmethod
     def fromlist(cls, l: list):
         assert len(l) >= 4, f"I need at least 4 elements, got '{l}'"
@@ -82,3 +84,61 @@ class Request:
 
     def __copy__(self):
         return type(self)(self._time, self._hash, self._size, self._maxage, self._fetched)
+
+    def __reduce__(self):
+        # positional arguments pickle much smaller and faster than the slots
+        return type(self), (self._time, self._hash, self._size, self._maxage, self._fetched)
+
+
+class FastRequest(Request):
+    """
+    Same as Request, without checking if the metadata is already known (fetched). Use it for fast simulation of
+    tested caches models.
+    """
+
+    __slots__ = ()
+
+    @property
+    def size(self) -> int:
+        return self._size
+
+    @property
+    def maxage(self) -> int:
+        return self._maxage
+
+    @property
+    def cacheable(self) -> bool:
+        return self._maxage > 0
+
+    def isexpired(self, now: float) -> bool:
+        return self._time + self._maxage < now
+
+
+if __name__ == "__main__":
+    import random
+    import time
+    import tracemalloc
+
+    from cachesim.caches import FIFOCache
+
+    # zipf like popularity over 100k objects
+    count = 100000
+    random.seed(0)
+    hashes = random.choices(range(count), [1 / (i + 1) for i in range(count)], k=1000000)
+
+    for cls in [Request, FastRequest]:
+        requests = [cls(t, h, h % 100 + 1, 3600 * 24 * 365) for t, h in enumerate(hashes)]
+        cache = FIFOCache(totalsize=count * 50)
+        start = time.perf_counter()
+        for _ in cache.map(requests):
+            pass
+        elapsed = time.perf_counter() - start
+
+        tracemalloc.start()
+        cache = FIFOCache(totalsize=count)
+        for i in range(count):
+            cache._store(cls(0, i, 1, 3600, True))
+        current, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        print(f"{cls.__name__}: {len(requests) / elapsed:.0f} requests/s, {current / count:.0f} Byte/cached object")
@@ -0,0 +1,410 @@
+import time
+from math import sqrt
+from statistics import NormalDist
+from typing import Hashable, Iterable, Iterator, List, Optional, Tuple, Union
+from zlib import crc32
+
+import numpy as np
+
+from cachesim import Reader, Request, Status, Trace, Stats, HIT
+
+_MASK = (1 << 64) - 1
+_GOLDEN = 0x9E3779B97F4A7C15
+_SALT = 0xBF58476D1CE4E5B9
+
+
+def spatialhash(hash: Hashable, salt: int = 0) -> float:
+    """
+    Maps an object hash to [0, 1), uniformly and the same way from run to run. Integer hashes (interned ids) are mixed
+    directly, others through crc32 of their string form. Objects with a spatial hash below rate form a sample of rate
+    of the objects, salt selects another sample.
+
+    :param hash: The object hash.
+    :param salt: Selects an independent mapping.
+    """
+    key = hash if hash.__class__ is int else crc32(str(hash).encode())
+    return ((((key + salt * _SALT) * _GOLDEN) & _MASK) >> 32) / 2 ** 32
+
+
+def spatialhashes(id: np.ndarray, salt: int = 0) -> np.ndarray:
+    """
+    Same as spatialhash() for an array of integer ids.
+
+    :param id: Object ids.
+    :param salt: Selects an independent mapping.
+    """
+    with np.errstate(over='ignore'):
+        h = (np.asarray(id).astype(np.uint64) + np.uint64(salt * _SALT & _MASK)) * np.uint64(_GOLDEN)
+    return (h >> np.uint64(32)) / 2 ** 32
+
+
+def sampletrace(trace: Trace, rate: float, salt: int = 0) -> Trace:
+    """
+    Requests of the objects with a spatial hash below rate.
+
+    :param trace: The trace.
+    :param rate: Sampling rate of objects.
+    :param salt: Selects another sample.
+    """
+    assert 0 < rate <= 1, f"rate must be in (0, 1], got '{rate}'"
+    mask = spatialhashes(trace.id, salt) < rate
+    return Trace(trace.time[mask], trace.id[mask], trace.size[mask], trace.maxage[mask], hashes=trace.hashes,
+                 check=False)
+
+
+class SampledReader(Reader):
+    """
+    Requests of the objects with a spatial hash below rate, read from another reader. All requests of a sampled object
+    are kept, so the caches sees the same reuse pattern as on the full trace, with rate of the objects. All requests
+    read are counted for the estimates (see SampledStats).
+    """
+
+    def __init__(self, reader: Reader, rate: float, salt: int = 0):
+        """
+        :param reader: The reader to sample.
+        :param rate: Sampling rate of objects.
+        :param salt: Selects another sample.
+        """
+        assert 0 < rate <= 1, f"rate must be in (0, 1], got '{rate}'"
+
+        # expected number of requests
+        super().__init__(totalcount=round(reader.totalcount * rate))
+        self._reader = reader
+        self._rate = rate
+        self._salt = salt
+        self._requests = None
+        self._seen = 0
+        self._seenbytes = 0
+
+    @property
+    def rate(self) -> float:
+        return self._rate
+
+    @property
+    def seen(self) -> int:
+        """Requests read in the last iteration, sampled or not."""
+        return self._seen
+
+    @property
+    def seenbytes(self) -> int:
+        """Bytes of the requests read in the last iteration, sampled or not."""
+        return self._seenbytes
+
+    def _sample(self) -> Iterator[Request]:
+        rate, salt = self._rate, self._salt
+        self._seen = self._seenbytes = 0
+        for request in self._reader:
+            self._seen += 1
+            self._seenbytes += request._size
+            if spatialhash(request.hash, salt) < rate:
+                yield request
+
+    def __iter__(self) -> Iterator:
+        self._requests = self._sample()
+        return super().__iter__()
+
+    def __next__(self) -> Request:
+        return next(self._requests)
+
+
+class SampledStats(Stats):
+    """
+    Statistics of a spatially sampled simulation (see sample()). Requests, hits and bytes are the ones of the sampled
+    objects, CHR and BHR are estimates for all objects.
+
+    If the number of all requests (and bytes) is known, the misses of the sampled objects are scaled up by 1 / rate to
+    estimate all misses (Horvitz-Thompson estimator, same as SHARDS-adj), so a few popular objects in or out of the
+    sample do not shift the estimates. Otherwise, the estimates are the ratios of the sampled objects. The confidence
+    intervals come from the variance of the per object misses (or hits), they cover the error of selecting the
+    objects, not the bias of a caches scaled down to a few objects.
+    """
+
+    @classmethod
+    def fromsimulation(cls, trace: Trace, status: np.ndarray, occupancy: np.ndarray, rate: float = 1.0,
+                       totalrequests: int = 0, totalbytes: int = 0):
+        """
+        Statistics of a batch simulation of a sampled trace.
+
+        :param trace: The simulated trace.
+        :param status: Status codes.
+        :param occupancy: Caches sizes.
+        :param rate: Sampling rate of the trace.
+        :param totalrequests: Number of all requests, 0 if unknown.
+        :param totalbytes: Bytes of all requests, 0 if unknown.
+        """
+        stats = super().fromsimulation(trace, status, occupancy)
+        stats._rate = rate
+        stats._totalrequests = totalrequests
+        stats._totalbytes = totalbytes
+
+        hit = status == HIT
+        requests = np.bincount(trace.id)
+        present = np.flatnonzero(requests)
+        stats._columns = (requests[present],
+                          np.bincount(trace.id, weights=hit, minlength=len(requests))[present],
+                          np.bincount(trace.id, weights=trace.size, minlength=len(requests))[present],
+                          np.bincount(trace.id, weights=np.where(hit, trace.size, 0), minlength=len(requests))[present])
+        return stats
+
+    def __init__(self, rate: float = 1.0, totalrequests: int = 0, totalbytes: int = 0):
+        """
+        :param rate: Sampling rate of the requests added.
+        :param totalrequests: Number of all requests, 0 if unknown.
+        :param totalbytes: Bytes of all requests, 0 if unknown.
+        """
+        super().__init__()
+
+        assert 0 < rate <= 1, f"rate must be in (0, 1], got '{rate}'"
+        self._rate = rate
+        self._totalrequests = totalrequests
+        self._totalbytes = totalbytes
+        self._objects = {}  # hash: [requests, hits, bytes, hit bytes]
+        self._columns = None
+
+    @property
+    def rate(self) -> float:
+        return self._rate
+
+    @property
+    def totalrequests(self) -> int:
+        """Number of all requests, 0 if unknown."""
+        return self._totalrequests
+
+    @property
+    def totalbytes(self) -> int:
+        """Bytes of all requests, 0 if unknown."""
+        return self._totalbytes
+
+    @property
+    def objectcount(self) -> int:
+        """Sampled objects requested."""
+        return len(self._perobject()[0])
+
+    def add(self, request: Request, status: Status, occupancy: Optional[int] = None):
+        super().add(request, status, occupancy)
+
+        counts = self._objects.get(request.hash)
+        if counts is None:
+            counts = self._objects[request.hash] = [0, 0, 0, 0]
+        counts[0] += 1
+        counts[2] += request._size
+        if status == Status.HIT:
+            counts[1] += 1
+            counts[3] += request._size
+        self._columns = None
+
+    def _empty(self) -> 'SampledStats':
+        return type(self)(self._rate)
+
+    def _merge(self, other: Stats):
+        super()._merge(other)
+        if not isinstance(other, SampledStats):
+            # the estimates come from the per object counts only
+            assert not other.requests, f"I expect sampled statistics, got '{other}'"
+            return
+
+        assert other._rate == self._rate, f"I expect the same rate, got '{self._rate}' and '{other._rate}'"
+        self._totalrequests += other._totalrequests
+        self._totalbytes += other._totalbytes
+        if not other._objects and other._columns is not None and len(other._columns[0]):
+            # batch simulation: object ids of different traces don't match, objects are kept apart
+            assert not self._objects, f"I expect statistics of added results, got a batch simulation"
+            self._columns = other._columns if self._columns is None else \
+                tuple(map(np.concatenate, zip(self._columns, other._columns)))
+            return
+
+        assert self._objects or self._columns is None or not len(self._columns[0]), \
+            f"I expect statistics of a batch simulation, got added results"
+        for hash, counts in other._objects.items():
+            mine = self._objects.get(hash)
+            if mine is None:
+                self._objects[hash] = list(counts)
+            else:
+                for i, count in enumerate(counts):
+                    mine[i] += count
+        self._columns = None
+
+    def _perobject(self) -> Tuple[np.ndarray, ...]:
+        """Requests, hits, bytes and hit bytes of each object."""
+        if self._columns is None:
+            columns = np.array(list(self._objects.values()), dtype=np.float64).reshape(-1, 4)
+            self._columns = tuple(columns.T)
+
+        return self._columns
+
+    def _estimate(self, hits: np.ndarray, total: np.ndarray, everything: int,
+                  confidence: float) -> Tuple[float, float, float]:
+        """
+        Estimated hit ratio and its confidence interval.
+
+        :param hits: Hits (or hit bytes) of each sampled object.
+        :param total: Requests (or bytes) of each sampled object.
+        :param everything: Requests (or bytes) of all objects, 0 if unknown.
+        :param confidence: Confidence level.
+        :return: Estimate, lower and upper bound.
+        """
+        assert 0 < confidence < 1, f"confidence must be in (0, 1), got '{confidence}'"
+        n, sumtotal = len(total), total.sum()
+        if everything:
+            # misses scaled up, with the variance of the Horvitz-Thompson estimator
+            misses = total - hits
+            ratio = 1 - misses.sum() / (self._rate * everything)
+            variance = (1 - self._rate) * np.dot(misses, misses) / (self._rate * everything) ** 2
+        elif n > 1:
+            # ratio estimator, with finite population correction
+            ratio = hits.sum() / sumtotal
+            deviation = hits - ratio * total
+            variance = (1 - self._rate) * n / (n - 1) * np.dot(deviation, deviation) / sumtotal ** 2
+        else:
+            ratio = hits.sum() / sumtotal if sumtotal else 0
+            variance = 0
+
+        ratio = min(max(ratio, 0), 1)
+        half = NormalDist().inv_cdf(.5 + confidence / 2) * sqrt(variance)
+        return ratio, max(ratio - half, 0), min(ratio + half, 1)
+
+    @property
+    def chr(self) -> float:
+        """Estimated caches hit ratio of all objects."""
+        requests, hits, _, _ = self._perobject()
+        return self._estimate(hits, requests, self._totalrequests, .95)[0]
+
+    @property
+    def bhr(self) -> float:
+        """Estimated byte hit ratio of all objects."""
+        _, _, bytes, hitbytes = self._perobject()
+        return self._estimate(hitbytes, bytes, self._totalbytes, .95)[0]
+
+    def chrinterval(self, confidence: float = .95) -> Tuple[float, float]:
+        """
+        Confidence interval of the CHR estimate.
+
+        :param confidence: Confidence level.
+        :return: Lower and upper bound.
+        """
+        requests, hits, _, _ = self._perobject()
+        return self._estimate(hits, requests, self._totalrequests, confidence)[1:]
+
+    def bhrinterval(self, confidence: float = .95) -> Tuple[float, float]:
+        """
+        Confidence interval of the BHR estimate.
+
+        :param confidence: Confidence level.
+        :return: Lower and upper bound.
+        """
+        _, _, bytes, hitbytes = self._perobject()
+        return self._estimate(hitbytes, bytes, self._totalbytes, confidence)[1:]
+
+    def __str__(self):
+        """For logging"""
+        chrlow, chrhigh = self.chrinterval()
+        bhrlow, bhrhigh = self.bhrinterval()
+        return f"Sampled requests: {self.requests} ({self.rate * 100:g}%), " \
+               f"CHR: {self.chr * 100:.2f}% [{chrlow * 100:.2f}%, {chrhigh * 100:.2f}%], " \
+               f"BHR: {self.bhr * 100:.2f}% [{bhrlow * 100:.2f}%, {bhrhigh * 100:.2f}%]"
+
+
+def sample(policy: type, totalsize: int, reader: Union[Reader, Trace], rate: float, salt: int = 0,
+           **kwargs) -> SampledStats:
+    """
+    Simulates a caches on a spatial sample of the objects, with its size scaled by rate (SHARDS like). The caches must
+    keep plenty of objects after scaling, otherwise the estimates are biased.
+
+    :param policy: Cache class.
+    :param totalsize: Size of the full caches.
+    :param reader: The reader, or a trace for batch simulation.
+    :param rate: Sampling rate of objects.
+    :param salt: Selects another sample.
+    :param kwargs: Further constructor parameters of the caches.
+    :return: Statistics of the sampled requests.
+    """
+    assert 0 < rate <= 1, f"rate must be in (0, 1], got '{rate}'"
+    cache = policy(totalsize=max(round(totalsize * rate), 1), **kwargs)
+
+    if isinstance(reader, Trace):
+        trace = sampletrace(reader, rate, salt)
+        return SampledStats.fromsimulation(trace, *cache.simulate(trace), rate=rate, totalrequests=len(reader),
+                                           totalbytes=int(reader.size.sum()))
+
+    sampled = SampledReader(reader, rate, salt)
+    stats = cache.run(sampled, SampledStats(rate))
+    stats._totalrequests, stats._totalbytes = sampled.seen, sampled.seenbytes
+    return stats
+
+
+def compare(policy: type, totalsize: int, trace: Trace, rates: Iterable[float] = (.01, .1),
+            salts: Iterable[int] = (0,), confidence: float = .95, **kwargs) -> List[dict]:
+    """
+    Validation of the sampled simulation: runs the caches on the full trace and on samples of it.
+
+    :param policy: Cache class.
+    :param totalsize: Size of the full caches.
+    :param trace: The trace.
+    :param rates: Sampling rates to compare.
+    :param salts: Samples to take for each rate.
+    :param confidence: Confidence level of the intervals.
+    :param kwargs: Further constructor parameters of the caches.
+    :return: A row for each sample, with the full results and whether they fall into the confidence intervals.
+    """
+    start = time.perf_counter()
+    full = Stats.fromsimulation(trace, *policy(totalsize=totalsize, **kwargs).simulate(trace))
+    fullelapsed = time.perf_counter() - start
+
+    rows = []
+    for rate in rates:
+        for salt in salts:
+            start = time.perf_counter()
+            stats = sample(policy, totalsize, trace, rate, salt, **kwargs)
+            elapsed = time.perf_counter() - start
+
+            chrlow, chrhigh = stats.chrinterval(confidence)
+            bhrlow, bhrhigh = stats.bhrinterval(confidence)
+            rows.append(dict(policy=policy.__name__, rate=rate, salt=salt, requests=stats.requests,
+                             chr=stats.chr, chrlow=chrlow, chrhigh=chrhigh, fullchr=full.chr,
+                             bhr=stats.bhr, bhrlow=bhrlow, bhrhigh=bhrhigh, fullbhr=full.bhr,
+                             covered=chrlow <= full.chr <= chrhigh and bhrlow <= full.bhr <= bhrhigh,
+                             speedup=fullelapsed / elapsed if elapsed else np.inf))
+
+    return rows
+
+
+if __name__ == "__main__":
+    import random
+    import sys
+
+    from cachesim.caches import FIFOCache, LRUCache, HeapLFUCache
+    from cachesim.readers import PopulationReader, WorkloadReader
+    from cachesim.workload import Zipf, ShotNoise, Lognormal, Constant
+
+    # sampled vs full simulation on the bundled readers, 10 samples for each rate, caches size is 5% of the content
+    totalcount = int(sys.argv[1]) if len(sys.argv) > 1 else 10000000
+    objectcount = totalcount // 10
+    random.seed(0)
+    population = [Request(0, str(i), random.randint(1, 100), 10 ** 9) for i in range(objectcount)]
+    readers = {
+        'population': (PopulationReader(totalcount, population, weights=[1 / (i + 1) for i in range(objectcount)]),
+                       objectcount * 50),
+        'zipf': (WorkloadReader(totalcount, Zipf(objectcount, 0.8, size=Lognormal(10000, 1.5),
+                                                 maxage=Constant(10 ** 9), rate=1000), seed=0),
+                 objectcount * 10000),
+        'shotnoise': (WorkloadReader(totalcount, ShotNoise(20, 3600, size=Lognormal(10000, 1.5),
+                                                           maxage=Constant(10 ** 9)), seed=0),
+                      totalcount // 2 * 10000),
+    }
+
+    print(f"{'reader':>12}{'caches':>14}{'rate':>6}{'CHR':>8}{'full':>8}{'CI width':>10}{'BHR':>8}{'full':>8}"
+          f"{'CI width':>10}{'covered':>9}{'speedup':>9}")
+    for name, (reader, contentsize) in readers.items():
+        trace = Trace.fromreader(reader)
+        for policy in [FIFOCache, LRUCache, HeapLFUCache]:
+            rows = compare(policy, contentsize // 20, trace, rates=[.01, .1], salts=range(10))
+            for rate in [.01, .1]:
+                sampled = [row for row in rows if row['rate'] == rate]
+                mean = {key: np.mean([row[key] for row in sampled]) for key in ['chr', 'chrlow', 'chrhigh', 'fullchr',
+                                                                                'bhr', 'bhrlow', 'bhrhigh', 'fullbhr',
+                                                                                'speedup']}
+                covered = sum(row['covered'] for row in sampled) / len(sampled)
+                print(f"{name:>12}{policy.__name__:>14}{rate:>6}{mean['chr'] * 100:>7.2f}%"
+                      f"{mean['fullchr'] * 100:>7.2f}%{(mean['chrhigh'] - mean['chrlow']) * 100:>9.2f}%"
+                      f"{mean['bhr'] * 100:>7.2f}%{mean['fullbhr'] * 100:>7.2f}%"
+                      f"{(mean['bhrhigh'] - mean['bhrlow']) * 100:>9.2f}%{covered * 100:>8.0f}%{mean['speedup']:>9.1f}")
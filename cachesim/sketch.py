@@ -0,0 +1,194 @@
+from typing import Hashable, List
+from zlib import crc32
+
+_MASK = (1 << 64) - 1
+
+# halves every byte, for aging the counters with bytes.translate()
+_HALVE = bytes(i >> 1 for i in range(256))
+
+
+def _indices(key: Hashable, count: int, width: int) -> List[int]:
+    """
+    Double hashing of the key to count indices in [0, width). Integer keys (interned ids) are used as is, others
+    through crc32 of their string form, which, unlike hash(), does not change from run to run.
+    """
+    h = ((key if key.__class__ is int else crc32(str(key).encode())) * 0x9E3779B97F4A7C15) & _MASK
+    h1 = h & 0xFFFFFFFF
+    h2 = h >> 32 | 1
+    return [(h1 + i * h2) % width for i in range(count)]
+
+
+class BloomFilter:
+    """
+    Set membership with false positives, in bits bits.
+    """
+
+    def __init__(self, bits: int, hashes: int = 3):
+        """
+        :param bits: Size of the filter in bits.
+        :param hashes: Number of bits set for a key.
+        """
+        assert bits > 0, f"I expect a positive number of bits, got '{bits}'"
+        assert hashes > 0, f"I expect a positive number of hashes, got '{hashes}'"
+        self._nbits = bits
+        self._hashes = hashes
+        self._bits = bytearray((bits + 7) // 8)
+        self._count = 0
+
+    @property
+    def nbytes(self) -> int:
+        return len(self._bits)
+
+    @property
+    def count(self) -> int:
+        """Keys added since the last clear()."""
+        return self._count
+
+    def add(self, key: Hashable) -> bool:
+        """
+        Adds a key.
+
+        :param key: The key.
+        :return: True, if the key was (probably) in the filter already.
+        """
+        bits = self._bits
+        present = True
+        for i in _indices(key, self._hashes, self._nbits):
+            mask = 1 << (i & 7)
+            if not bits[i >> 3] & mask:
+                bits[i >> 3] |= mask
+                present = False
+        if not present:
+            self._count += 1
+
+        return present
+
+    def __contains__(self, key: Hashable) -> bool:
+        bits = self._bits
+        return all(bits[i >> 3] & 1 << (i & 7) for i in _indices(key, self._hashes, self._nbits))
+
+    def clear(self):
+        self._bits = bytearray(len(self._bits))
+        self._count = 0
+
+
+class CountMinSketch:
+    """
+    Approximate request counts in depth rows of width one Byte counters, saturating at maximum. Counts are never
+    underestimated, overestimated by collisions only. Updates are conservative: only the smallest counters of a key are
+    incremented.
+
+    Aging: after sample additions, all counters are halved, so old popularity fades out.
+    """
+
+    def __init__(self, width: int, depth: int = 4, sample: int = 0, maximum: int = 15):
+        """
+        :param width: Counters in a row.
+        :param depth: Number of rows.
+        :param sample: Additions between aging, no aging if 0.
+        :param maximum: Largest count, up to 255.
+        """
+        assert width > 0, f"I expect a positive width, got '{width}'"
+        assert depth > 0, f"I expect a positive depth, got '{depth}'"
+        assert sample >= 0, f"I expect a non negative sample, got '{sample}'"
+        assert 0 < maximum < 256, f"maximum must be in [1, 255], got '{maximum}'"
+        self._width = width
+        self._depth = depth
+        self._sample = sample
+        self._maximum = maximum
+        self._counters = bytearray(width * depth)
+        self._added = 0
+
+        # (row, first counter of the row)
+        self._rows = [(row, row * width) for row in range(depth)]
+
+    @property
+    def nbytes(self) -> int:
+        return len(self._counters)
+
+    def _positions(self, key: Hashable) -> List[int]:
+        # same as _indices(), inlined for speed
+        h = ((key if key.__class__ is int else crc32(str(key).encode())) * 0x9E3779B97F4A7C15) & _MASK
+        h1 = h & 0xFFFFFFFF
+        h2 = h >> 32 | 1
+        width = self._width
+        return [(h1 + row * h2) % width + offset for row, offset in self._rows]
+
+    def add(self, key: Hashable) -> bool:
+        """
+        Counts a request.
+
+        :param key: The key.
+        :return: True, if the counters have been aged.
+        """
+        counters = self._counters
+        positions = self._positions(key)
+        count = min(map(counters.__getitem__, positions))
+        if count < self._maximum:
+            for p in positions:
+                if counters[p] == count:
+                    counters[p] = count + 1
+
+        self._added += 1
+        if self._added == self._sample:
+            self.age()
+            return True
+
+        return False
+
+    def estimate(self, key: Hashable) -> int:
+        return min(map(self._counters.__getitem__, self._positions(key)))
+
+    def age(self):
+        """Halves all counters."""
+        self._counters = bytearray(self._counters.translate(_HALVE))
+        self._added //= 2
+
+
+class TinyLFU:
+    """
+    TinyLFU frequency estimation: a count-min sketch with aging, optionally behind a Bloom filter doorkeeper. The first
+    request of a key only enters the doorkeeper, so one-hit-wonders do not take sketch counters. After sample
+    requests, the sketch is aged and the doorkeeper is cleared.
+    """
+
+    def __init__(self, sketchsize: int, doorkeepersize: int = 0, depth: int = 4, sample: int = 0):
+        """
+        :param sketchsize: Memory of the sketch in Byte.
+        :param doorkeepersize: Memory of the doorkeeper in Byte, no doorkeeper if 0.
+        :param depth: Rows of the sketch.
+        :param sample: Requests between aging, 10 * sketch width if 0.
+        """
+        assert sketchsize >= depth, f"I expect a sketchsize of at least {depth} Byte, got '{sketchsize}'"
+        assert doorkeepersize >= 0, f"I expect a non negative doorkeepersize, got '{doorkeepersize}'"
+        self._sketch = CountMinSketch(sketchsize // depth, depth=depth)
+        self._doorkeeper = BloomFilter(8 * doorkeepersize) if doorkeepersize else None
+        self._sample = sample if sample else 10 * (sketchsize // depth)
+        self._requests = 0
+
+    @property
+    def nbytes(self) -> int:
+        return self._sketch.nbytes + (self._doorkeeper.nbytes if self._doorkeeper is not None else 0)
+
+    def record(self, key: Hashable):
+        """
+        Counts a request.
+
+        :param key: The key.
+        """
+        if self._doorkeeper is None or self._doorkeeper.add(key):
+            self._sketch.add(key)
+
+        self._requests += 1
+        if self._requests == self._sample:
+            self._requests //= 2
+            self._sketch.age()
+            if self._doorkeeper is not None:
+                self._doorkeeper.clear()
+
+    def estimate(self, key: Hashable) -> int:
+        estimate = self._sketch.estimate(key)
+        if self._doorkeeper is not None and key in self._doorkeeper:
+            estimate += 1
+
+        return estimate
@@ -0,0 +1,195 @@
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+from cachesim import Request, Status, Trace, STATUSES
+
+
+class Stats:
+    """
+    Streaming statistics of a simulation. Results are aggregated on the fly with O(1) memory, instead of keeping every
+    (request, status, size) tuple.
+    """
+
+    @classmethod
+    def fromsimulation(cls, trace: Trace, status: np.ndarray, occupancy: np.ndarray):
+        """
+        Statistics of a batch simulation (see Cache.simulate()). Objects are assumed to keep their size in the trace.
+
+        :param trace: The simulated trace.
+        :param status: Status codes.
+        :param occupancy: Caches sizes.
+        """
+        stats = cls()
+        counts = np.bincount(status, minlength=len(STATUSES))
+        sizes = np.bincount(status, weights=trace.size, minlength=len(STATUSES))
+        for code, s in enumerate(STATUSES):
+            stats._count[s] = int(counts[code])
+            stats._bytes[s] = int(sizes[code])
+
+        if len(occupancy):
+            stats._occupancy = int(occupancy[-1])
+            stats._maxoccupancy = int(occupancy.max())
+            stats._sumoccupancy = int(occupancy.sum())
+
+        return stats
+
+    def __init__(self):
+        self._count = {Status.HIT: 0, Status.MISS: 0, Status.PASS: 0}
+        self._bytes = {Status.HIT: 0, Status.MISS: 0, Status.PASS: 0}
+        self._occupancy = 0
+        self._maxoccupancy = 0
+        self._sumoccupancy = 0
+
+    def add(self, request: Request, status: Status, occupancy: Optional[int] = None):
+        """
+        Adds a simulation result, use it with the result tuple of Cache._recv: stats.add(*result)
+
+        :param request: Request served.
+        :param status: Caches status.
+        :param occupancy: Caches size after the request, if known.
+        """
+        self._count[status] += 1
+        self._bytes[status] += request._size
+
+        if occupancy is not None:
+            self._occupancy = occupancy
+            if occupancy > self._maxoccupancy:
+                self._maxoccupancy = occupancy
+        self._sumoccupancy += self._occupancy
+
+    @property
+    def requests(self) -> int:
+        return sum(self._count.values())
+
+    @property
+    def hits(self) -> int:
+        return self._count[Status.HIT]
+
+    @property
+    def misses(self) -> int:
+        return self._count[Status.MISS]
+
+    @property
+    def passes(self) -> int:
+        return self._count[Status.PASS]
+
+    @property
+    def bytes(self) -> int:
+        """Bytes sent to the clients."""
+        return sum(self._bytes.values())
+
+    @property
+    def hitbytes(self) -> int:
+        """Bytes sent from caches."""
+        return self._bytes[Status.HIT]
+
+    @property
+    def originbytes(self) -> int:
+        """Bytes fetched from origin (miss and pass)."""
+        return self._bytes[Status.MISS] + self._bytes[Status.PASS]
+
+    @property
+    def chr(self) -> float:
+        """Cache hit ratio."""
+        return self.hits / self.requests if self.requests else 0
+
+    @property
+    def bhr(self) -> float:
+        """Byte hit ratio."""
+        return self.hitbytes / self.bytes if self.bytes else 0
+
+    @property
+    def occupancy(self) -> int:
+        """Last known caches size."""
+        return self._occupancy
+
+    @property
+    def maxoccupancy(self) -> int:
+        return self._maxoccupancy
+
+    @property
+    def meanoccupancy(self) -> float:
+        return self._sumoccupancy / self.requests if self.requests else 0
+
+    def _empty(self) -> 'Stats':
+        """Statistics of the same kind, without results."""
+        return type(self)()
+
+    def _merge(self, other: 'Stats'):
+        """Adds the results of other statistics, subclasses merge their own state too."""
+        for status in self._count:
+            self._count[status] += other._count[status]
+            self._bytes[status] += other._bytes[status]
+        self._occupancy += other._occupancy
+        self._maxoccupancy = max(self._maxoccupancy, other._maxoccupancy)
+        self._sumoccupancy += other._sumoccupancy
+
+    def __add__(self, other):
+        """Merges statistics, e.g. of parallel runs. The result is of the more specific type of the two."""
+        assert isinstance(other, Stats), f"Operator add has been implemented only for {Stats.__name__} type."
+        # the subclass operand keeps its own state, e.g. Stats() + WindowedStats is WindowedStats
+        first, second = (other, self) if type(other) is not type(self) and isinstance(other, type(self)) else \
+            (self, other)
+        assert isinstance(second, type(first)) or isinstance(first, type(second)), \
+            f"I expect statistics of the same kind, got '{type(self).__name__}' and '{type(other).__name__}'"
+        merged = first._empty()
+        merged._merge(first)
+        merged._merge(second)
+        return merged
+
+    def __str__(self):
+        """For logging"""
+        return f"Requests: {self.requests}, CHR: {self.chr * 100:.2f}%, BHR: {self.bhr * 100:.2f}%, " \
+               f"Bytes sent: {self.bytes} Byte, Origin bytes: {self.originbytes} Byte"
+
+
+class WindowedStats(Stats):
+    """
+    Same as Stats, with additional statistics for each time window of the requests.
+    """
+
+    def __init__(self, window: float):
+        """
+        :param window: Length of the time windows (same unit as Request.time).
+        """
+        super().__init__()
+
+        assert window > 0, f"I expect a positive window, got '{window}'"
+        self._window = window
+        self._windows = []  # (start, Stats)
+
+    @property
+    def window(self) -> float:
+        return self._window
+
+    @property
+    def windows(self) -> List[Tuple[float, Stats]]:
+        """Start time and statistics of the windows having requests, in time order."""
+        return self._windows
+
+    def add(self, request: Request, status: Status, occupancy: Optional[int] = None):
+        super().add(request, status, occupancy)
+
+        start = request.time // self._window * self._window
+        if not self._windows or self._windows[-1][0] != start:
+            assert not self._windows or self._windows[-1][0] < start, f"Requests must be in time order"
+            self._windows.append((start, Stats()))
+            # carry caches size over
+            self._windows[-1][1]._occupancy = self._occupancy
+
+        self._windows[-1][1].add(request, status, occupancy)
+
+    def _empty(self) -> 'WindowedStats':
+        return type(self)(self._window)
+
+    def _merge(self, other: Stats):
+        super()._merge(other)
+        if not isinstance(other, WindowedStats):
+            return
+
+        assert other._window == self._window, f"I expect the same window, got '{self._window}' and '{other._window}'"
+        windows = dict(self._windows)
+        for start, stats in other._windows:
+            windows[start] = windows[start] + stats if start in windows else stats + Stats()
+        self._windows = sorted(windows.items(), key=lambda window: window[0])
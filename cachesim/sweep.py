@@ -0,0 +1,89 @@
+import time
+from itertools import product
+from multiprocessing import Pool
+from typing import Iterable, List, Optional, Tuple
+
+from cachesim import Stats, Trace
+from cachesim.progress import Progress
+
+# trace shared by the worker processes and their progress, set by the pool initializer
+_trace = None
+_progress = None
+
+
+def grid(policies: Iterable[type], **params: Iterable) -> List[Tuple[type, dict]]:
+    """
+    Builds the configurations of a parameter sweep: each policy with each combination of the parameter values.
+    Concatenate grids for policies with different constructor parameters.
+
+    :param policies: Cache classes.
+    :param params: Constructor parameter values, e.g. totalsize=[1000, 2000].
+    :return: (policy, constructor kwargs) pairs.
+    """
+    names = list(params)
+    return [(policy, dict(zip(names, values))) for policy in policies for values in product(*params.values())]
+
+
+def _init(trace: Trace, progress: Optional[Progress] = None):
+    global _trace, _progress
+    _trace = trace
+    _progress = progress
+
+
+def _run(config: Tuple[type, dict]) -> dict:
+    policy, kwargs = config
+
+    start = time.perf_counter()
+    cache = policy(**kwargs)
+    stats = Stats.fromsimulation(_trace, *cache.simulate(_trace))
+    elapsed = time.perf_counter() - start
+    if _progress is not None:
+        _progress.update(stats.requests, stats.hits, stats.bytes, stats.hitbytes)
+
+    return dict(policy=policy.__name__, **kwargs, requests=stats.requests, hits=stats.hits, chr=stats.chr,
+                bhr=stats.bhr, originbytes=stats.originbytes, maxoccupancy=stats.maxoccupancy, elapsed=elapsed)
+
+
+def sweep(trace: Trace, configs: Iterable[Tuple[type, dict]], processes: Optional[int] = None,
+          progress: Optional[Progress] = None) -> List[dict]:
+    """
+    Simulates the trace with every caches configuration on a process pool. The trace is parsed once and handed over to
+    the workers at startup (shared copy-on-write on fork based platforms), not with every configuration.
+
+    :param trace: The trace.
+    :param configs: (policy, constructor kwargs) pairs, see grid().
+    :param processes: Number of worker processes, defaults to the number of CPUs.
+    :param progress: Progress, updated by the workers after each configuration (optional, see Progress).
+    :return: Tidy table, one row (dict) per configuration with policy name, kwargs and results, in config order.
+    """
+    with Pool(processes, initializer=_init, initargs=(trace, progress.remote() if progress is not None else None)) \
+            as pool:
+        return pool.map(_run, configs, chunksize=1)
+
+
+if __name__ == "__main__":
+    import numpy as np
+
+    from cachesim.caches import FIFOCache, LFUCache, ProtectedFIFOCache
+    from cachesim.progress import Progress
+
+    # zipf popularity over 100k objects, 1M requests
+    totalcount = 1000000
+    rng = np.random.default_rng(0)
+    id = rng.zipf(1.2, totalcount) % 100000
+    trace = Trace(np.arange(totalcount, dtype=np.float64), id, rng.integers(1, 1000, 100000)[id],
+                  np.full(totalcount, 3600 * 24))
+
+    sizes = [int(2 ** e) for e in range(16, 26)]
+    configs = grid([FIFOCache, LFUCache], totalsize=sizes) + \
+              grid([ProtectedFIFOCache], totalsize=sizes, limit=[500])
+
+    start = time.perf_counter()
+    with Progress(totalcount * len(configs), desc='Sweep') as progress:
+        rows = sweep(trace, configs, progress=progress)
+    print(f"{len(configs)} configurations in {time.perf_counter() - start:.1f}s")
+
+    print(f"{'policy':<20}{'totalsize':>12}{'limit':>8}{'CHR':>8}{'BHR':>8}")
+    for row in rows:
+        print(f"{row['policy']:<20}{row['totalsize']:>12}{row.get('limit', ''):>8}{row['chr'] * 100:>7.2f}%"
+              f"{row['bhr'] * 100:>7.2f}%")
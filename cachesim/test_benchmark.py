@@ -0,0 +1,29 @@
+from copy import deepcopy
+from unittest import TestCase
+
+from cachesim import benchmark
+
+
+class TestBenchmark(TestCase):
+    def test_run(self):
+        report = benchmark.run(scale=.002)
+        self.assertEqual(.002, report['scale'])
+        names = {(result['benchmark'], result['name']) for result in report['results']}
+        # every policy, also the ones not built from the size alone
+        self.assertLessEqual({'ProtectedFIFOCache', 'NonCache'}, set(benchmark.CACHES))
+        for name in benchmark.CACHES:
+            self.assertIn(('recv', name), names)
+            self.assertIn(('eviction', name), names)
+            self.assertIn(('memory', name), names)
+        for reader in ['ConstantReader', 'CSVReader', 'RandomReader', 'PopulationReader']:
+            self.assertIn(('reader', reader), names)
+        self.assertTrue(all(result['value'] > 0 for result in report['results']))
+
+        # half the throughput and twice the memory are regressions
+        slower = deepcopy(report)
+        for result in slower['results']:
+            result['value'] = result['value'] / 2 if result['unit'] == 'requests/s' else result['value'] * 2
+        comparison = benchmark.compare(report, slower)
+        self.assertEqual(len(report['results']), len(comparison))
+        self.assertTrue(all(result['regression'] for result in comparison))
+        self.assertFalse(any(result['regression'] for result in benchmark.compare(report, report)))
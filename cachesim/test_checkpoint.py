@@ -0,0 +1,135 @@
+import os
+import random
+import tempfile
+from copy import deepcopy
+from itertools import islice
+from unittest import TestCase
+
+from cachesim import Request, ExpiryMixIn
+from cachesim.caches import FIFOCache, LRUCache, LFUCache, HeapLFUCache, SLRUCache, ARCCache, TwoQCache, \
+    S3FIFOCache, GDSFCache
+from cachesim.checkpoint import snapshot, restore
+from cachesim.readers import CSVReader, PopulationReader, RandomReader
+
+
+class ExpiryLRUCache(ExpiryMixIn, LRUCache):
+    pass
+
+
+def remaining(reader):
+    # iterating the original again would start over
+    return list(iter(lambda: next(reader), None))
+
+
+class TestCheckpoint(TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self._tmp.name, 'checkpoint.bin')
+
+        random.seed(0)
+        population = [Request(0, str(i), random.randint(1, 100), random.randint(100, 5000)) for i in range(2000)]
+        self.reader = PopulationReader(20000, population, weights=[1 / (i + 1) for i in range(2000)], rate=1,
+                                       chunksize=3000)
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def test_caches(self):
+        requests = list(self.reader)
+        for cls in [FIFOCache, LRUCache, LFUCache, HeapLFUCache, SLRUCache, ARCCache, TwoQCache, S3FIFOCache,
+                    GDSFCache, ExpiryLRUCache]:
+            # warm up, the restored caches continues the same way
+            cache = cls(5000)
+            for request in requests[:10000]:
+                cache._recv(request)
+            snapshot(self.path, cache)
+            restored, reader = restore(self.path)
+            self.assertIsNone(reader)
+            self.assertIsInstance(restored, cls)
+            self.assertEqual(cache.size, restored.size)
+            self.assertEqual(list(cache._cache), list(restored._cache))
+
+            expected = [result[1:] for result in cache.map(deepcopy(requests[10000:]))]
+            self.assertEqual(expected, [result[1:] for result in restored.map(deepcopy(requests[10000:]))])
+
+            # objects shared by several structures stay shared
+            if isinstance(restored, ExpiryMixIn):
+                self.assertTrue(all(restored._stored[hash] is stored for hash, stored in restored._cache.items()))
+
+    def test_populationreader(self):
+        cache = LRUCache(5000)
+        for request in islice(iter(self.reader), 4500):
+            cache._recv(request)
+        snapshot(self.path, cache, self.reader)
+
+        restored, reader = restore(self.path)
+        expected = [(r.time, r.hash) for r in remaining(self.reader)]
+        self.assertEqual(15500, len(expected))
+        # restored readers continue, when iterated
+        self.assertEqual(expected, [(r.time, r.hash) for r in reader])
+        self.assertEqual(20000, len(list(reader)))
+
+        # at the end of a chunk, and before the first request
+        for count in [6000, 0]:
+            iterator = iter(self.reader)
+            for _ in range(count):
+                next(iterator)
+            snapshot(self.path, cache, self.reader)
+
+            _, reader = restore(self.path)
+            expected = [(r.time, r.hash) for r in remaining(self.reader)]
+            self.assertEqual(20000 - count, len(expected))
+            self.assertEqual(expected, [(r.time, r.hash) for r in reader])
+
+    def test_csvreader(self):
+        csvreader = CSVReader(totalcount=12, csvfile='cachesim/readers/sample.csv')
+        iterator = iter(csvreader)
+        next(iterator)
+        next(iterator)
+        snapshot(self.path, FIFOCache(100), csvreader)
+
+        _, reader = restore(self.path)
+        self.assertEqual(10, len(remaining(csvreader)))
+        self.assertEqual([str(r) for r in islice(iter(csvreader), 2, None)], [str(r) for r in reader])
+
+    def test_randomreader(self):
+        randomreader = RandomReader(100, hashlen=2)
+        iterator = iter(randomreader)
+        next(iterator)
+        snapshot(self.path, FIFOCache(100), randomreader)
+        expected = [r.hash for r in remaining(randomreader)]
+        self.assertEqual(99, len(expected))
+
+        _, reader = restore(self.path)
+        self.assertEqual(expected, [r.hash for r in reader])
+
+        # restoring does not change the random module
+        state = random.getstate()
+        restore(self.path)
+        deepcopy(randomreader)
+        self.assertEqual(state, random.getstate())
+
+    def test_run(self):
+        # the measurement window runs from the checkpoint
+        cache = LRUCache(5000)
+        for request in islice(iter(self.reader), 10000):
+            cache._recv(request)
+        snapshot(self.path, cache, self.reader)
+        expected = cache.run(remaining(self.reader))
+
+        restored, reader = restore(self.path)
+        stats = restored.run(reader)
+        self.assertEqual(10000, stats.requests)
+        self.assertEqual(expected.hits, stats.hits)
+
+        # readers restored at their end start over, as the original
+        snapshot(self.path, cache, self.reader)
+        _, reader = restore(self.path)
+        self.assertEqual([], remaining(reader))
+        self.assertEqual(20000, len(list(reader)))
+
+    def test_restore(self):
+        with open(self.path, 'wb') as file:
+            file.write(b'not a checkpoint')
+        with self.assertRaises(AssertionError):
+            restore(self.path)
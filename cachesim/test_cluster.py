@@ -0,0 +1,106 @@
+import random
+from unittest import TestCase
+
+import numpy as np
+
+from cachesim import Request, Trace, Stats, STATUSES
+from cachesim.caches import FIFOCache, LRUCache
+from cachesim.cluster import Ring, Rendezvous, ClusterCache
+from cachesim.readers import PopulationReader
+
+
+class TestHashing(TestCase):
+    def test_lookup(self):
+        id = np.arange(100000)
+        for hashing in [Ring(), Rendezvous()]:
+            for node in ['a', 'b', 'c', 'd']:
+                hashing.add(node)
+
+            # same nodes as for single hashes, balanced
+            owner = hashing.lookup(id)
+            self.assertEqual([hashing(i) for i in range(1000)], [hashing.nodes[n] for n in owner[:1000]])
+            for n in range(4):
+                self.assertAlmostEqual(.25, np.count_nonzero(owner == n) / len(id), delta=.05)
+
+            # a new node takes its share from the others, nothing else moves
+            hashing.add('e')
+            moved = owner != hashing.lookup(id)
+            self.assertTrue((hashing.lookup(id)[moved] == 4).all())
+            self.assertAlmostEqual(.2, np.count_nonzero(moved) / len(id), delta=.05)
+
+            # objects of a removed node move, others stay
+            before = np.array(hashing.nodes)[hashing.lookup(id)]
+            hashing.remove('b')
+            after = np.array(hashing.nodes)[hashing.lookup(id)]
+            self.assertTrue((before[before != after] == 'b').all())
+            self.assertNotIn('b', after)
+
+    def test_add(self):
+        ring = Ring()
+        ring.add('a')
+        with self.assertRaises(AssertionError):
+            ring.add('a')
+        with self.assertRaises(AssertionError):
+            ring.remove('b')
+        self.assertEqual('a', ring('anything'))
+
+
+class TestClusterCache(TestCase):
+    def setUp(self):
+        random.seed(0)
+        count = 2000
+        population = [Request(0, str(i), random.randint(1, 100), 3600 * 24) for i in range(count)]
+        weights = [1 / (i + 1) ** .8 for i in range(count)]
+        trace = Trace.fromreader(PopulationReader(20000, population, weights=weights))
+        # a request per second
+        self.trace = Trace(np.arange(len(trace), dtype=np.float64), trace.id, trace.size, trace.maxage)
+
+    def test_single(self):
+        cluster = ClusterCache(lambda: LRUCache(5000), 1)
+        self.assertEqual(5000, cluster.totalsize)
+        stats = cluster.run(self.trace)
+        expected = LRUCache(5000).run(self.trace)
+        self.assertEqual(expected.hits, stats.hits)
+        self.assertEqual(expected.maxoccupancy, stats.maxoccupancy)
+
+    def test_simulate(self):
+        events = [(5000, 'remove', 1), (10000, 'add', 'new'), (15000, 'add', 1)]
+        for hashing in [Ring(), Rendezvous()]:
+            cluster = ClusterCache(lambda: FIFOCache(2000), 4, hashing=hashing, events=events)
+            status, occupancy = cluster.simulate(self.trace)
+
+            # same results as processing the requests one by one
+            results = list(cluster.map(self.trace))
+            self.assertEqual(status.tolist(), [STATUSES.index(result[1]) for result in results])
+            self.assertEqual([result[2] for result in results], occupancy.tolist())
+            self.assertEqual({0, 2, 3, 'new', 1}, set(cluster.members))
+            self.assertEqual(sum(member.size for member in cluster.members.values()), cluster.size)
+
+    def test_processes(self):
+        cluster = ClusterCache(lambda: LRUCache(2000), ['a', 'b', 'c'], events=[(10000, 'remove', 'b')])
+        status, occupancy = cluster.simulate(self.trace)
+        cluster = ClusterCache(lambda: LRUCache(2000), ['a', 'b', 'c'], events=[(10000, 'remove', 'b')],
+                               processes=2)
+        parallel = cluster.simulate(self.trace)
+        self.assertEqual(status.tolist(), parallel[0].tolist())
+        self.assertEqual(occupancy.tolist(), parallel[1].tolist())
+
+    def test_remapped(self):
+        cluster = ClusterCache(lambda: LRUCache(2000), 4)
+        self.assertFalse(cluster.remapped(self.trace).any())
+
+        # objects of the removed node are fetched again from the others
+        cluster = ClusterCache(lambda: LRUCache(2000), 4, events=[(10000, 'remove', 1)])
+        remapped = cluster.remapped(self.trace)
+        member, members = cluster.partition(self.trace)
+        self.assertEqual(10000, members[1][2])
+        self.assertTrue(remapped.any())
+        self.assertFalse(remapped[:10000].any())
+        self.assertFalse((member[10000:] == 1).any())
+        ids = set(self.trace.id[:10000][member[:10000] == 1].tolist())
+        self.assertTrue(set(self.trace.id[remapped].tolist()) <= ids)
+
+        # rebalancing costs hits
+        stats = Stats.fromsimulation(self.trace, *cluster.simulate(self.trace))
+        expected = Stats.fromsimulation(self.trace, *ClusterCache(lambda: LRUCache(2000), 4).simulate(self.trace))
+        self.assertLess(stats.hits, expected.hits)
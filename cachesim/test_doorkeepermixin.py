@@ -0,0 +1,29 @@
+from unittest import TestCase
+
+from cachesim import Request, Status, DoorkeeperMixIn
+from cachesim.caches import FIFOCache
+
+
+class DoorkeeperFIFOCache(DoorkeeperMixIn, FIFOCache):
+    pass
+
+
+class TestDoorkeeperMixIn(TestCase):
+    def test_doorkeepermixin(self):
+        cache = DoorkeeperFIFOCache(100, doorkeepersize=16)
+
+        # admitted on the second request
+        self.assertEqual(Status.PASS, cache._recv(Request(0, 'a', 1, 3600))[1])
+        self.assertEqual(Status.MISS, cache._recv(Request(1, 'a', 1, 3600))[1])
+        self.assertEqual(Status.HIT, cache._recv(Request(2, 'a', 1, 3600))[1])
+
+        # cleared when full
+        for i in range(12):
+            cache._recv(Request(3, str(i), 1, 3600))
+        self.assertEqual(12, cache.doorkeeper.count)
+        cache._recv(Request(4, 'b', 1, 3600))
+        self.assertEqual(1, cache.doorkeeper.count)
+        self.assertEqual(Status.PASS, cache._recv(Request(5, '0', 1, 3600))[1])
+
+        with self.assertRaises(AssertionError):
+            DoorkeeperFIFOCache(100, doorkeepersize=0)
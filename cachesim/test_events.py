@@ -0,0 +1,94 @@
+import random
+from unittest import TestCase
+
+from cachesim import Cache, Request, Status, Trace
+from cachesim.caches import FIFOCache, LRUCache
+from cachesim.events import EventSimulator, LatencyStats
+from cachesim.readers import PopulationReader
+
+
+class DictCache(Cache):
+    """Implements the abstract hooks only, without _remove()."""
+
+    def __init__(self, totalsize: int):
+        super().__init__(totalsize)
+        self._cache = {}
+
+    def _lookup(self, requested: Request):
+        return self._cache.get(requested.hash)
+
+    def _admit(self, fetched: Request) -> bool:
+        return True
+
+    def _store(self, fetched: Request):
+        self._cache[fetched.hash] = fetched
+
+    @property
+    def _treshold(self) -> bool:
+        return False
+
+    def _evict(self):
+        pass
+
+
+class TestEventSimulator(TestCase):
+    def test_instant(self):
+        # without latency, same as the instantaneous simulation
+        random.seed(0)
+        population = [Request(0, str(i), random.randint(1, 100), 3600 * 24) for i in range(2000)]
+        trace = Trace.fromreader(PopulationReader(20000, population, weights=[1 / (i + 1) for i in range(2000)]))
+        stats = EventSimulator(LRUCache(5000), latency=0).run(trace)
+        expected = LRUCache(5000).run(trace)
+        self.assertEqual(expected.hits, stats.hits)
+        self.assertEqual(expected.misses, stats.misses)
+        self.assertEqual(0, stats.coalesced)
+        self.assertEqual(expected.misses + expected.passes, stats.connections)
+
+    def requests(self):
+        return [Request(0, 'a', 100, 3600), Request(.01, 'a', 100, 3600), Request(.02, 'a', 100, 3600),
+                Request(.5, 'a', 100, 3600)]
+
+    def test_coalesce(self):
+        stats = EventSimulator(LRUCache(1000), latency=.1).run(self.requests())
+        self.assertIsInstance(stats, LatencyStats)
+        self.assertEqual(1, stats.hits)
+        self.assertEqual(3, stats.misses)
+        self.assertEqual(1, stats.connections)
+        self.assertEqual(2, stats.coalesced)
+        self.assertEqual(100, stats.originbytes)
+        for expected, latency in zip([.1, .09, .08, 0], stats.latencies):
+            self.assertAlmostEqual(expected, latency)
+
+        # each miss opens a connection, the first one stores
+        stats = EventSimulator(LRUCache(1000), latency=.1, coalesce=False).run(self.requests())
+        self.assertEqual(1, stats.hits)
+        self.assertEqual(3, stats.connections)
+        self.assertEqual(0, stats.coalesced)
+        self.assertEqual(300, stats.originbytes)
+        self.assertEqual(100, stats.maxoccupancy)
+
+    def test_merge(self):
+        stats = EventSimulator(LRUCache(1000), latency=.1).run(self.requests())
+        merged = stats + stats
+        self.assertIsInstance(merged, LatencyStats)
+        self.assertEqual(8, len(merged.latencies))
+        self.assertEqual(2, merged.connections)
+        self.assertEqual(4, merged.coalesced)
+        self.assertEqual(200, merged.originbytes)
+
+    def test_expired(self):
+        # expired objects are fetched again, caches without _remove() store over the stale copy
+        for cache in [FIFOCache(1000), DictCache(1000)]:
+            requests = [Request(0, 'a', 100, 5), Request(10, 'a', 100, 5), Request(11, 'a', 100, 5)]
+            stats = EventSimulator(cache, latency=.1).run(requests)
+            self.assertEqual(2, stats.misses, type(cache).__name__)
+            self.assertEqual(1, stats.hits, type(cache).__name__)
+            # stored when the fetch completes
+            self.assertAlmostEqual(10.1, cache._lookup(Request(12, 'a', 100, 5)).time, msg=type(cache).__name__)
+
+    def test_bandwidth(self):
+        stats = EventSimulator(LRUCache(1000), latency=.1, bandwidth=1000, hitlatency=.001).run(self.requests())
+        # 100 Byte transferred in .1s
+        self.assertAlmostEqual(.2, stats.latencies[0])
+        self.assertAlmostEqual(.001, stats.latency(0))
+        self.assertAlmostEqual(.2, stats.latency(100))
@@ -0,0 +1,167 @@
+import random
+from unittest import TestCase
+
+import numpy as np
+
+from cachesim import Cache, Request, Status, Trace, ExpiryMixIn
+from cachesim.caches import FIFOCache, LRUCache, LFUCache, HeapLFUCache, SLRUCache, ARCCache, TwoQCache, \
+    S3FIFOCache, GDSFCache
+from cachesim.readers import PopulationReader
+
+CACHES = [FIFOCache, LRUCache, LFUCache, HeapLFUCache, SLRUCache, ARCCache, TwoQCache, S3FIFOCache, GDSFCache]
+
+
+class ExpiryFIFOCache(ExpiryMixIn, FIFOCache):
+    pass
+
+
+class DictCache(Cache):
+    """Implements the abstract hooks only, without _remove()."""
+
+    def __init__(self, totalsize: int):
+        super().__init__(totalsize)
+        self._cache = {}
+
+    def _lookup(self, requested: Request):
+        return self._cache.get(requested.hash)
+
+    def _admit(self, fetched: Request) -> bool:
+        return True
+
+    def _store(self, fetched: Request):
+        self._cache[fetched.hash] = fetched
+
+    @property
+    def _treshold(self) -> bool:
+        return False
+
+    def _evict(self):
+        pass
+
+
+class TestExpiryMixIn(TestCase):
+    def setUp(self):
+        # a request per second, maxage 1 to 500 seconds
+        random.seed(0)
+        population = [Request(0, str(i), random.randint(1, 100), random.randint(1, 500)) for i in range(2000)]
+        trace = Trace.fromreader(PopulationReader(20000, population, weights=[1 / (i + 1) for i in range(2000)]))
+        self.trace = Trace(np.arange(len(trace), dtype=np.float64), trace.id, trace.size, trace.maxage)
+
+    def test_refetch(self):
+        # expired objects are fetched again by every caches, same as the batch engines
+        for cls in CACHES:
+            cache = cls(100)
+            self.assertEqual(Status.MISS, cache._recv(Request(0, 'a', 1, 10))[1])
+            self.assertEqual(Status.MISS, cache._recv(Request(20, 'a', 1, 10))[1])
+            self.assertEqual(Status.HIT, cache._recv(Request(21, 'a', 1, 10))[1])
+            self.assertEqual(1, cache.size)
+
+            status, occupancy = cls(5000).simulate(self.trace)
+            expected = Cache.simulate(cls(5000), self.trace)
+            self.assertEqual(expected[0].tolist(), status.tolist())
+            self.assertEqual(expected[1].tolist(), occupancy.tolist())
+
+        # caches without _remove() store over the stale copy
+        cache = DictCache(100)
+        self.assertEqual(Status.MISS, cache._recv(Request(0, 'a', 1, 10))[1])
+        self.assertEqual(Status.MISS, cache._recv(Request(20, 'a', 1, 10))[1])
+        self.assertEqual(Status.HIT, cache._recv(Request(21, 'a', 1, 10))[1])
+        self.assertEqual(20, cache._cache['a'].time)
+
+    def test_expirymixin(self):
+        cache = ExpiryFIFOCache(100, resolution=1)
+        cache._recv(Request(0, 'a', 10, 10))
+        cache._recv(Request(0, 'b', 20, 100))
+
+        # a expires after 10, removed when its slot has ended
+        self.assertEqual(31, cache._recv(Request(10.5, 'c', 1, 100))[2])
+        self.assertEqual(22, cache._recv(Request(11, 'd', 1, 100))[2])
+        self.assertEqual(1, cache.expired)
+        self.assertEqual(10, cache.expiredbytes)
+        self.assertIsNone(cache._lookup(Request(11, 'a', 10, 10)))
+
+        # copies stored again are kept till their own expiry
+        cache._remove('b')
+        cache._recv(Request(50, 'b', 20, 100))
+        self.assertEqual(Status.HIT, cache._recv(Request(120, 'b', 20, 100))[1])
+        self.assertEqual(Status.MISS, cache._recv(Request(151, 'b', 20, 100))[1])
+
+        with self.assertRaises(AssertionError):
+            ExpiryFIFOCache(100, resolution=0)
+
+        class ExpiryDictCache(ExpiryMixIn, DictCache):
+            pass
+
+        with self.assertRaises(AssertionError):
+            ExpiryDictCache(100)
+
+    def test_limit(self):
+        # long maxage, evicted objects are not tracked till their expiry
+        for limit in [None, 50]:
+            cache = ExpiryFIFOCache(100, limit=limit)
+            for t in range(10000):
+                cache._recv(Request(t, t, 1, 10 ** 9))
+
+            # checked on eviction
+            cache._evict()
+            self.assertLessEqual(len(cache._stored), limit or 2 * cache.objectcount + 1024)
+            self.assertEqual(len(cache._stored), sum(len(objects) for objects in cache._wheel.values()))
+
+            # the cached objects are tracked first
+            for hash in list(cache._cache)[-min(limit or 100, len(cache._cache)):]:
+                self.assertIs(cache._cache[hash], cache._stored[hash])
+
+        # objects not tracked any more expire when requested
+        cache = ExpiryFIFOCache(100, limit=1)
+        cache._recv(Request(0, 'a', 1, 10))
+        cache._recv(Request(0, 'b', 1, 10))
+        cache._evict()
+        self.assertEqual(['b'], list(cache._stored))
+        self.assertEqual(Status.MISS, cache._recv(Request(20, 'a', 1, 10))[1])
+
+    def test_uncounted(self):
+        # caches not counting their objects: tracked till expiry, or limit
+        class RemovableDictCache(DictCache):
+            def _remove(self, hash):
+                return self._cache.pop(hash, None)
+
+            @property
+            def _treshold(self) -> bool:
+                return len(self._cache) > self.totalsize
+
+            def _evict(self):
+                del self._cache[next(iter(self._cache))]
+
+        class ExpiryDictCache(ExpiryMixIn, RemovableDictCache):
+            pass
+
+        for limit, tracked in [(None, 101), (50, 50)]:
+            cache = ExpiryDictCache(10, limit=limit)
+            for t in range(1000):
+                cache._recv(Request(t, t, 1, 100))
+            self.assertLessEqual(len(cache._cache), 11)
+
+            # checked on eviction
+            cache._evict()
+            self.assertLessEqual(len(cache._stored), tracked)
+
+    def test_caches(self):
+        for cls in CACHES:
+            class ExpiryCache(ExpiryMixIn, cls):
+                pass
+
+            cache = ExpiryCache(50000)
+            results = list(cache.map(self.trace))
+            expected = list(cls(50000).map(self.trace))
+
+            # dead objects do not take space
+            self.assertGreater(cache.expired, 0)
+            self.assertLess(sum(result[2] for result in results), sum(result[2] for result in expected))
+            self.assertGreaterEqual(sum(result[1] is Status.HIT for result in results),
+                                    sum(result[1] is Status.HIT for result in expected))
+
+            # no object stored longer than its maxage and the resolution
+            now = self.trace.time[-1]
+            for stored in list(cache._stored.values()):
+                if cache._lookup(stored) is stored:
+                    self.assertFalse(stored.isexpired(now - 1))
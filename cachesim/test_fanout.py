@@ -0,0 +1,43 @@
+import random
+from unittest import TestCase
+
+from cachesim import Request, WindowedStats
+from cachesim.caches import FIFOCache, LFUCache, ProtectedFIFOCache, NonCache, LRUCache
+from cachesim.fanout import fanout
+
+
+class TestFanout(TestCase):
+    def caches(self):
+        return [FIFOCache(2000), LFUCache(2000), ProtectedFIFOCache(2000, 50), NonCache(), LRUCache(2000)]
+
+    def test_fanout(self):
+        # sizes change between requests of an object, objects expire: hits must not leak between the caches
+        random.seed(0)
+        requests = [(t, random.randint(0, 100), random.randint(1, 100), random.choice([0, 20, 3600]))
+                    for t in range(5000)]
+
+        separate = [cache.run(Request(*request) for request in requests) for cache in self.caches()]
+        stats = fanout(self.caches(), (Request(*request) for request in requests))
+
+        self.assertEqual(5, len(stats))
+        for expected, s in zip(separate, stats):
+            self.assertEqual(5000, s.requests)
+            self.assertEqual(expected.hits, s.hits)
+            self.assertEqual(expected.passes, s.passes)
+            self.assertEqual(expected.hitbytes, s.hitbytes)
+            self.assertEqual(expected.originbytes, s.originbytes)
+        self.assertGreater(stats[0].hits, 0)
+        self.assertEqual(0, stats[3].hits)
+
+    def test_stats(self):
+        requests = [Request(t, t % 10, 10, 3600) for t in range(100)]
+        stats = fanout([FIFOCache(50), LRUCache(100)], requests, [WindowedStats(10), WindowedStats(10)])
+        self.assertEqual(10, len(stats[0].windows))
+        self.assertEqual(90, stats[1].hits)
+        self.assertEqual(0, stats[1].windows[0][1].hits)
+        self.assertEqual(10, stats[1].windows[-1][1].hits)
+
+        with self.assertRaises(AssertionError):
+            fanout([], requests)
+        with self.assertRaises(AssertionError):
+            fanout([FIFOCache(50), LRUCache(100)], requests, [WindowedStats(10)])
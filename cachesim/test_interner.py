@@ -0,0 +1,43 @@
+import random
+from unittest import TestCase
+
+from cachesim import Interner, Request
+from cachesim.readers import CSVReader, PopulationReader, RandomReader
+
+
+class TestInterner(TestCase):
+    def test_interner(self):
+        interner = Interner()
+        self.assertEqual(0, len(interner))
+
+        self.assertEqual(0, interner('a'))
+        self.assertEqual(1, interner('b'))
+        self.assertEqual(0, interner('a'))
+        self.assertEqual(2, interner('c'))
+
+        self.assertEqual(3, len(interner))
+        self.assertIn('b', interner)
+        self.assertNotIn('d', interner)
+        self.assertEqual('b', interner.hash(1))
+        self.assertEqual(['a', 'b', 'c'], interner.hashes)
+
+        self.assertEqual([3, 0, 3, 4, 2], interner.map(['d', 'a', 'd', 'e', 'c']))
+        self.assertEqual(['a', 'b', 'c', 'd', 'e'], interner.hashes)
+        self.assertEqual(5, interner('f'))
+
+    def test_readers(self):
+        interner = Interner()
+        requests = list(CSVReader(totalcount=12, csvfile='cachesim/readers/sample.csv', interner=interner))
+        self.assertEqual([0, 1, 2, 3, 4, 0, 1, 2, 3, 4, 0, 1], [r.hash for r in requests])
+        self.assertEqual(['a', 'b', 'c', 'd', 'e'], interner.hashes)
+
+        # same interner, same ids
+        population = [Request(0, h, 1, 60) for h in ['x', 'c', 'a']]
+        requests = list(PopulationReader(100, population=population, weights=[1, 1, 1], interner=interner))
+        self.assertTrue(all(r.hash in [5, 2, 0] for r in requests))
+        self.assertEqual(['a', 'b', 'c', 'd', 'e', 'x'], interner.hashes)
+
+        interner = Interner()
+        requests = list(RandomReader(100, hashlen=1, sizegen=random.randint(1, 10), interner=interner))
+        self.assertTrue(all(interner.hash(r.hash) in [f"{i:x}" for i in range(256)] for r in requests))
+        self.assertGreaterEqual(100, len(interner))
@@ -0,0 +1,50 @@
+import asyncio
+import os
+import tempfile
+from unittest import TestCase
+
+from cachesim import Stats
+from cachesim.caches import LRUCache
+from cachesim.live import follow
+from cachesim.readers import TailReader
+
+
+class TestLive(TestCase):
+    def test_follow(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            paths = [os.path.join(tmp, 'a.log'), os.path.join(tmp, 'b.log')]
+            for path, times in zip(paths, [[0, 1, 5, 12, 31], [2, 8, 11, 25]]):
+                with open(path, 'w') as file:
+                    file.writelines(f"{t},{t % 3},100,300\n" for t in times)
+
+            async def main():
+                stats = Stats()
+                windows = [(start, window.requests) async for start, window in
+                           follow(LRUCache(1000), TailReader(*paths, idle=.2, interval=.01), 10, stats,
+                                  lateness=100)]
+                return windows, stats
+
+            windows, stats = asyncio.run(main())
+
+        self.assertEqual([(0, 5), (10, 2), (20, 1), (30, 1)], windows)
+        self.assertEqual(9, stats.requests)
+        self.assertEqual(6, stats.hits)
+
+    def test_late(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'a.log')
+            with open(path, 'w') as file:
+                file.write('0,a,100,300\n15,b,100,300\n')
+
+            async def main():
+                reader = TailReader(path, idle=.2, interval=.01)
+                windows = []
+                async for start, window in follow(LRUCache(1000), reader, 10):
+                    windows.append((start, window.requests))
+                    if start == 0:
+                        # late, window 0 is over
+                        with open(path, 'a') as file:
+                            file.write('5,c,100,300\n')
+                return windows
+
+            self.assertEqual([(0, 1), (10, 1)], asyncio.run(main()))
@@ -0,0 +1,89 @@
+import random
+from unittest import TestCase, mock
+
+import numpy as np
+
+from cachesim import Request, Trace
+from cachesim.caches import FIFOCache, LRUCache
+from cachesim.mrc import MRC, _Fenwick
+from cachesim.readers import PopulationReader
+from cachesim.sweep import grid, sweep
+
+
+class ExactLRUCache(LRUCache):
+    """
+    LRUCache with watermarks keeping exactly totalsize - 1 unit sized objects.
+    """
+
+    @property
+    def thlow(self):
+        return (self.totalsize - 1.5) / self.totalsize
+
+    @property
+    def thhigh(self):
+        return (self.totalsize - 1.5) / self.totalsize
+
+
+class TestMRC(TestCase):
+    def setUp(self):
+        random.seed(0)
+        count = 500
+        population = [Request(0, str(i), 1, 3600) for i in range(count)]
+        self.trace = Trace.fromreader(PopulationReader(5000, population, weights=[1 / (i + 1) for i in range(count)]))
+
+    def test_lru(self):
+        mrc = MRC(self.trace)
+        self.assertEqual(5000, mrc.requests)
+
+        counts = [5, 20, 50, 100, 200, 400]
+        for count, missratio, objectmissratio in zip(counts, mrc.missratio(counts), mrc.objectmissratio(counts)):
+            stats = ExactLRUCache(count + 1).run(self.trace)
+            self.assertAlmostEqual(1 - stats.chr, missratio)
+            self.assertAlmostEqual(1 - stats.chr, objectmissratio)
+
+        # unit sizes
+        self.assertTrue(np.allclose(mrc.missratio(counts), mrc.bytemissratio(counts)))
+
+    def test_fifo(self):
+        # FIFO is no stack algorithm, under independent references it misses more than LRU, but not by far
+        mrc = MRC(self.trace)
+        sizes = [50, 100, 200, 400]
+        rows = sweep(self.trace, grid([FIFOCache], totalsize=sizes), processes=1)
+        capacity = [s * (FIFOCache(s).thlow + FIFOCache(s).thhigh) / 2 for s in sizes]
+        for row, missratio in zip(rows, mrc.missratio(capacity)):
+            self.assertLessEqual(missratio, 1 - row['chr'])
+            self.assertAlmostEqual(1 - row['chr'], missratio, delta=0.1)
+
+    def test_shards(self):
+        mrc = MRC(self.trace)
+        shards = MRC(self.trace, rate=0.5)
+        self.assertLess(shards.requests, mrc.requests)
+        self.assertTrue(np.allclose(mrc.missratio([50, 100, 200]), shards.missratio([50, 100, 200]), atol=0.1))
+
+    def test_expiry(self):
+        # a: 0 - expires after 10, b: not cacheable, c: 5 Byte
+        trace = Trace([0, 1, 2, 3, 5, 11, 12, 13, 14], [0, 1, 0, 1, 2, 0, 0, 2, 1], [1, 1, 1, 1, 5, 1, 1, 5, 1],
+                      [10, 0, 10, 0, 60, 10, 10, 60, 0])
+        mrc = MRC(trace)
+
+        # hits: a at 2 (distance 1), a at 12 (distance 1), c at 13 (distance 2 objects, 6 Byte)
+        self.assertTrue(np.allclose([1 - 2 / 9, 1 - 2 / 9, 1 - 3 / 9], mrc.objectmissratio([1, 1.5, 2])))
+        self.assertTrue(np.allclose([1 - 2 / 9, 1 - 3 / 9], mrc.missratio([5, 6])))
+        self.assertTrue(np.allclose([1 - 2 / 17, 1 - 7 / 17], mrc.bytemissratio([5, 6])))
+
+    def test_grow(self):
+        # more requests than the reader told, the trees grow
+        reader = mock.MagicMock(totalcount=10)
+        reader.__iter__.return_value = iter(self.trace)
+        mrc = MRC(reader)
+        self.assertEqual(5000, mrc.requests)
+        self.assertTrue(np.allclose(MRC(self.trace).missratio([5, 50, 400]), mrc.missratio([5, 50, 400])))
+
+        tree = _Fenwick(3)
+        values = [random.randint(-5, 5) for _ in range(100)]
+        for i, v in enumerate(values):
+            tree.add(i, v)
+        self.assertEqual([sum(values[:i]) for i in range(101)], [tree.prefix(i) for i in range(101)])
+
+        with self.assertRaises(AssertionError):
+            tree.add(-1, 1)
@@ -0,0 +1,58 @@
+from unittest import TestCase
+
+from cachesim import Request, ProfilingMixIn
+from cachesim.caches import FIFOCache, LRUCache, NonCache, SLRUCache, ARCCache, TwoQCache, S3FIFOCache, LFUCache, \
+    HeapLFUCache, GDSFCache
+
+
+class ProfilingFIFOCache(ProfilingMixIn, FIFOCache):
+    pass
+
+
+class TestProfilingMixIn(TestCase):
+    def test_profilingmixin(self):
+        cache = ProfilingFIFOCache(100)
+        requests = [Request(i, str(i), 1, 3600) for i in range(97)] + [Request(97, '96', 1, 3600)]
+        stats = cache.run(requests)
+
+        profile = {row['hook']: row for row in cache.profile}
+        self.assertEqual(98, profile['reader']['calls'])
+        self.assertEqual(98, profile['_recv']['calls'])
+        self.assertEqual(98, profile['_lookup']['calls'])
+        self.assertEqual(97, profile['_admit']['calls'])
+        self.assertEqual(97, profile['_store']['calls'])
+        self.assertEqual(1, profile['_evict']['calls'])
+        self.assertEqual(1, stats.hits)
+        self.assertAlmostEqual(1, profile['reader']['share'] + profile['_recv']['share'])
+        self.assertGreaterEqual(profile['_recv']['p99'], profile['_recv']['p50'])
+        self.assertGreater(profile['_recv']['total'], profile['_lookup']['total'])
+
+        # 96% > thhigh, evicted till 90%
+        self.assertEqual({6: 1}, cache.evictions)
+        self.assertEqual(6, cache.evictedbytes)
+        self.assertIn('_evict', cache.summary())
+        self.assertIn('objects per eviction: mean 6.0', cache.summary())
+
+    def test_objectcount(self):
+        for cls in [FIFOCache, LRUCache, SLRUCache, ARCCache, TwoQCache, S3FIFOCache, LFUCache, HeapLFUCache,
+                    GDSFCache]:
+            cache = cls(100)
+            for i in range(200):
+                cache._recv(Request(i, str(i % 120), 1, 3600))
+                cache._recv(Request(i, str(i % 7), 1, 3600))
+            self.assertEqual(cache.size, cache.objectcount)
+        self.assertEqual(0, NonCache().objectcount)
+
+    def test_uncounted(self):
+        # caches not counting their objects are profiled without the objects per eviction
+        class UncountedFIFOCache(ProfilingMixIn, FIFOCache):
+            @property
+            def objectcount(self) -> int:
+                raise NotImplementedError
+
+        cache = UncountedFIFOCache(100)
+        cache.run([Request(i, str(i), 1, 3600) for i in range(200)])
+        self.assertGreater(cache.evictedbytes, 0)
+        self.assertFalse(cache.evictions)
+        self.assertIn('Evictions: ', cache.summary())
+        self.assertNotIn('objects per eviction', cache.summary())
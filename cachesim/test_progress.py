@@ -0,0 +1,74 @@
+import io
+from unittest import TestCase
+
+from cachesim import PBarMixIn, Request, Stats, Trace
+from cachesim.caches import FIFOCache, LRUCache
+from cachesim.progress import Progress
+from cachesim.readers import PopulationReader
+from cachesim.sweep import grid, sweep
+
+
+class TestProgress(TestCase):
+    def setUp(self):
+        count = 200
+        population = [Request(0, str(i), i % 50 + 1, 3600) for i in range(count)]
+        self.trace = Trace.fromreader(PopulationReader(5000, population=population,
+                                                       weights=[1 / (i + 1) for i in range(count)]))
+
+    def test_update(self):
+        file = io.StringIO()
+        progress = Progress(total=100, interval=0, file=file, desc='Test')
+        progress.update(10, 5, 1000, 400)
+        progress.update(10, 1, 1000, 100)
+        self.assertEqual(20, progress.requests)
+        self.assertAlmostEqual(.3, progress.chr)
+        self.assertAlmostEqual(.25, progress.bhr)
+        self.assertGreater(progress.rate, 0)
+
+        lines = file.getvalue().splitlines()
+        self.assertEqual(2, len(lines))
+        self.assertTrue(lines[1].startswith('Test: 20/100 (20%'))
+        self.assertIn('CHR: 30.00%', lines[1])
+        self.assertIn('BHR: 25.00%', lines[1])
+
+        # reported at most every interval
+        file = io.StringIO()
+        progress = Progress(interval=3600, file=file)
+        progress.update(10, 5, 1000, 400)
+        self.assertEqual('', file.getvalue())
+        progress.close()
+        self.assertIn('10, ', file.getvalue())
+
+    def test_run(self):
+        expected = LRUCache(5000).run(self.trace)
+        with Progress(len(self.trace), chunksize=300, file=False) as progress:
+            stats = LRUCache(5000).run(self.trace, progress=progress)
+
+        self.assertEqual(expected.requests, stats.requests)
+        self.assertEqual(expected.hits, stats.hits)
+        self.assertEqual(expected.hitbytes, stats.hitbytes)
+        self.assertEqual(stats.requests, progress.requests)
+        self.assertAlmostEqual(stats.chr, progress.chr)
+        self.assertAlmostEqual(stats.bhr, progress.bhr)
+
+        # counts of a partially filled statistics are not reported
+        stats = Stats()
+        LRUCache(5000).run(self.trace[:100], stats)
+        with Progress(file=False) as progress:
+            LRUCache(5000).run(self.trace, stats, progress=progress)
+        self.assertEqual(5100, stats.requests)
+        self.assertEqual(5000, progress.requests)
+
+    def test_sweep(self):
+        configs = grid([FIFOCache, LRUCache], totalsize=[500, 2000])
+        with Progress(len(self.trace) * len(configs), file=False) as progress:
+            rows = sweep(self.trace, configs, processes=2, progress=progress)
+
+        self.assertEqual(len(self.trace) * len(configs), progress.requests)
+        self.assertAlmostEqual(sum(row['hits'] for row in rows) / progress.requests, progress.chr)
+
+    def test_pbarmixin(self):
+        class PBarCache(PBarMixIn, LRUCache):
+            chunksize = 300
+
+        self.assertEqual(LRUCache(5000).run(self.trace).hits, PBarCache(5000).run(self.trace).hits)
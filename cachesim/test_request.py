@@ -3,7 +3,7 @@ import string
 import time
 from unittest import TestCase
 
-from cachesim import Request
+from cachesim import Request, FastRequest
 
 
 class TestRequest(TestCase):
@@ -47,8 +47,9 @@ class TestRequest(TestCase):
             else:
                 self.assertTrue(request.cacheable)
 
-            # after caches enter
-            request.enter = ts
+            # after caches enter, slotted request has no room for extra attributes
+            with self.assertRaises(AttributeError):
+                request.enter = ts
             self.assertEqual(ts, request.time)
             self.assertEqual(hash, request.hash)
             self.assertTrue(request.fetched)
@@ -59,7 +60,6 @@ class TestRequest(TestCase):
                 self.assertFalse(request.cacheable)
             else:
                 self.assertTrue(request.cacheable)
-            self.assertEqual(ts, request.enter)
             delta = random.randint(0, 35)
             if delta > maxage:
                 self.assertTrue(request.isexpired(ts + delta))
@@ -130,3 +130,18 @@ class TestRequest(TestCase):
         self.assertEqual(request.size, 1)
         self.assertEqual(request.maxage, 60)
         self.assertTrue(request.fetched)
+
+    def test_fastrequest(self):
+        request = FastRequest(10, 'abc', 1, 60)
+
+        # no fetch gating
+        self.assertFalse(request.fetched)
+        self.assertEqual(1, request.size)
+        self.assertEqual(60, request.maxage)
+        self.assertTrue(request.cacheable)
+        self.assertFalse(request.isexpired(70))
+        self.assertTrue(request.isexpired(71))
+        self.assertFalse(FastRequest(10, 'abc', 1, 0).cacheable)
+
+        self.assertFalse(hasattr(request, '__dict__'))
+        self.assertIsInstance(FastRequest.fromlist([0, 'abc', 1, 60]), FastRequest)
@@ -0,0 +1,102 @@
+import random
+from unittest import TestCase
+
+import numpy as np
+
+from cachesim import Request, Trace, Stats
+from cachesim.caches import FIFOCache, LRUCache
+from cachesim.readers import PopulationReader
+from cachesim.sampling import spatialhash, spatialhashes, sampletrace, SampledReader, SampledStats, sample, compare
+
+
+class TestSampling(TestCase):
+    def setUp(self):
+        random.seed(0)
+        count = 20000
+        population = [Request(0, str(i), random.randint(1, 100), 3600 * 24) for i in range(count)]
+        weights = [1 / (i + 1) ** .8 for i in range(count)]
+        self.trace = Trace.fromreader(PopulationReader(200000, population, weights=weights))
+
+    def test_spatialhash(self):
+        ids = np.arange(10000)
+        hashes = spatialhashes(ids, salt=3)
+        self.assertEqual([spatialhash(i, salt=3) for i in range(100)], hashes[:100].tolist())
+        self.assertTrue(((0 <= hashes) & (hashes < 1)).all())
+        self.assertAlmostEqual(.1, np.count_nonzero(hashes < .1) / len(ids), delta=.01)
+
+        # salts select other samples, strings are hashed the same way from run to run
+        self.assertLess(np.count_nonzero((hashes < .1) & (spatialhashes(ids) < .1)), 200)
+        self.assertEqual(spatialhash('abc'), spatialhash('abc'))
+
+    def test_sampledreader(self):
+        reader = SampledReader(self.trace, .1, salt=1)
+        self.assertEqual(20000, reader.totalcount)
+
+        sampled = sampletrace(self.trace, .1, salt=1)
+        self.assertEqual(sampled.id.tolist(), [request.hash for request in reader])
+        # all requests of the sampled objects are kept
+        ids = np.unique(sampled.id)
+        self.assertEqual(np.count_nonzero(np.isin(self.trace.id, ids)), len(sampled))
+
+    def test_full(self):
+        # rate 1 is the full simulation, without sampling error
+        stats = sample(LRUCache, 50000, self.trace, 1)
+        full = Stats.fromsimulation(self.trace, *LRUCache(50000).simulate(self.trace))
+        self.assertEqual(full.hits, stats.hits)
+        self.assertEqual((stats.chr, stats.chr), stats.chrinterval())
+        self.assertEqual((stats.bhr, stats.bhr), stats.bhrinterval())
+
+    def test_stream(self):
+        # run() and simulate() give the same estimates
+        stats = sample(FIFOCache, 50000, SampledReader(self.trace, 1), .2, salt=2)
+        simulated = sample(FIFOCache, 50000, self.trace, .2, salt=2)
+        self.assertIsInstance(stats, SampledStats)
+        self.assertEqual(simulated.requests, stats.requests)
+        self.assertEqual(simulated.hits, stats.hits)
+        self.assertEqual(simulated.objectcount, stats.objectcount)
+        self.assertEqual(len(self.trace), stats.totalrequests)
+        self.assertEqual(self.trace.size.sum(), stats.totalbytes)
+        self.assertAlmostEqual(simulated.chr, stats.chr)
+        for a, b in zip(simulated.chrinterval(), stats.chrinterval()):
+            self.assertAlmostEqual(a, b)
+        for a, b in zip(simulated.bhrinterval(), stats.bhrinterval()):
+            self.assertAlmostEqual(a, b)
+
+    def test_ratio(self):
+        # without the number of all requests, the estimates are the ratios of the sampled objects
+        trace = sampletrace(self.trace, .1)
+        stats = SampledStats.fromsimulation(trace, *LRUCache(5000).simulate(trace), rate=.1)
+        self.assertEqual(stats.hits / stats.requests, stats.chr)
+        self.assertEqual(stats.hitbytes / stats.bytes, stats.bhr)
+        low, high = stats.chrinterval()
+        self.assertLess(low, stats.chr)
+        self.assertLess(stats.chr, high)
+
+    def test_merge(self):
+        # parallel runs on parts of the trace, same as one run
+        stats = sample(FIFOCache, 50000, SampledReader(self.trace, 1), .2, salt=2)
+        half = len(self.trace) // 2
+        merged = sample(FIFOCache, 50000, SampledReader(self.trace[:half], 1), .2, salt=2) + \
+            sample(FIFOCache, 50000, SampledReader(self.trace[half:], 1), .2, salt=2)
+        self.assertIsInstance(merged, SampledStats)
+        self.assertEqual(stats.requests, merged.requests)
+        self.assertEqual(stats.objectcount, merged.objectcount)
+        self.assertEqual(stats.totalrequests, merged.totalrequests)
+        self.assertAlmostEqual(stats.chr, merged.chr, delta=.01)
+
+        with self.assertRaises(AssertionError):
+            merged + sample(FIFOCache, 50000, self.trace, .2, salt=2)
+
+    def test_estimate(self):
+        rows = compare(LRUCache, 50000, self.trace, rates=[.1], salts=range(10))
+        self.assertEqual(10, len(rows))
+        for row in rows:
+            self.assertLess(row['chrlow'], row['chr'])
+            self.assertLess(row['chr'], row['chrhigh'])
+            self.assertLess(row['bhrlow'], row['bhr'])
+            self.assertLess(row['bhr'], row['bhrhigh'])
+
+        # estimates are unbiased, the full results are mostly in the 95% intervals
+        self.assertAlmostEqual(rows[0]['fullchr'], np.mean([row['chr'] for row in rows]), delta=.05)
+        self.assertAlmostEqual(rows[0]['fullbhr'], np.mean([row['bhr'] for row in rows]), delta=.05)
+        self.assertGreaterEqual(sum(row['covered'] for row in rows), 7)
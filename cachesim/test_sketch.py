@@ -0,0 +1,67 @@
+import random
+from unittest import TestCase
+
+from cachesim.sketch import BloomFilter, CountMinSketch, TinyLFU
+
+
+class TestSketch(TestCase):
+    def test_bloomfilter(self):
+        bloom = BloomFilter(8 * 1024)
+        self.assertEqual(1024, bloom.nbytes)
+
+        keys = [str(i) for i in range(800)]
+        self.assertFalse(any(bloom.add(key) for key in keys[:400]))
+        self.assertEqual(400, bloom.count)
+        self.assertTrue(all(key in bloom for key in keys[:400]))
+        self.assertTrue(all(bloom.add(key) for key in keys[:400]))
+        self.assertEqual(400, bloom.count)
+
+        # about 1% false positives with 10 bits per key
+        self.assertLess(sum(key in bloom for key in keys[400:]), 20)
+
+        bloom.clear()
+        self.assertEqual(0, bloom.count)
+        self.assertFalse(any(key in bloom for key in keys[:400]))
+
+    def test_countminsketch(self):
+        sketch = CountMinSketch(1024, depth=4)
+        self.assertEqual(4096, sketch.nbytes)
+
+        # zipf like counts, never underestimated, saturating at 15
+        random.seed(0)
+        counts = {}
+        for key in random.choices(range(1000), weights=[1 / (i + 1) for i in range(1000)], k=5000):
+            counts[key] = counts.get(key, 0) + 1
+            sketch.add(key)
+        for key, count in counts.items():
+            self.assertGreaterEqual(sketch.estimate(key), min(count, 15))
+        self.assertEqual(15, sketch.estimate(0))
+        self.assertLess(sum(sketch.estimate(key) - min(count, 15) for key, count in counts.items()) / len(counts), 1)
+
+        sketch.age()
+        self.assertEqual(7, sketch.estimate(0))
+
+        # aging after sample additions
+        sketch = CountMinSketch(64, sample=10)
+        for _ in range(9):
+            self.assertFalse(sketch.add('a'))
+        self.assertTrue(sketch.add('a'))
+        self.assertEqual(5, sketch.estimate('a'))
+
+    def test_tinylfu(self):
+        tinylfu = TinyLFU(1024, doorkeepersize=128, sample=100)
+        self.assertEqual(1024 + 128, tinylfu.nbytes)
+
+        # first request in the doorkeeper only
+        tinylfu.record('a')
+        self.assertEqual(0, tinylfu._sketch.estimate('a'))
+        self.assertEqual(1, tinylfu.estimate('a'))
+        for _ in range(4):
+            tinylfu.record('a')
+        self.assertEqual(5, tinylfu.estimate('a'))
+
+        # aged after sample requests, the doorkeeper is cleared
+        for i in range(95):
+            tinylfu.record(i)
+        self.assertNotIn('a', tinylfu._doorkeeper)
+        self.assertEqual(2, tinylfu.estimate('a'))
@@ -0,0 +1,88 @@
+from unittest import TestCase
+
+from cachesim import Request, Status, Stats, WindowedStats
+from cachesim.caches import FIFOCache, NonCache
+
+
+class TestStats(TestCase):
+    def test_stats(self):
+        stats = Stats()
+        self.assertEqual(0, stats.requests)
+        self.assertEqual(0, stats.chr)
+        self.assertEqual(0, stats.bhr)
+
+        stats.add(Request(0, 'a', 10, 60), Status.MISS, 10)
+        stats.add(Request(1, 'a', 10, 60), Status.HIT, 10)
+        stats.add(Request(2, 'b', 30, 60), Status.PASS, 10)
+        stats.add(Request(3, 'c', 20, 60), Status.MISS, 30)
+        stats.add(Request(4, 'c', 20, 60), Status.HIT)
+
+        self.assertEqual(5, stats.requests)
+        self.assertEqual(2, stats.hits)
+        self.assertEqual(2, stats.misses)
+        self.assertEqual(1, stats.passes)
+        self.assertEqual(90, stats.bytes)
+        self.assertEqual(30, stats.hitbytes)
+        self.assertEqual(60, stats.originbytes)
+        self.assertAlmostEqual(0.4, stats.chr)
+        self.assertAlmostEqual(1 / 3, stats.bhr)
+        self.assertEqual(30, stats.occupancy)
+        self.assertEqual(30, stats.maxoccupancy)
+        self.assertAlmostEqual(18, stats.meanoccupancy)
+
+        merged = stats + stats
+        self.assertEqual(10, merged.requests)
+        self.assertEqual(60, merged.hitbytes)
+        self.assertAlmostEqual(0.4, merged.chr)
+        self.assertEqual(5, stats.requests)
+
+    def test_windowedstats(self):
+        stats = WindowedStats(window=10)
+        for t in [1, 2, 5, 12, 35, 36]:
+            stats.add(Request(t, 'a', 1, 60), Status.HIT, t)
+
+        self.assertEqual(6, stats.requests)
+        self.assertEqual([0, 10, 30], [start for start, _ in stats.windows])
+        self.assertEqual([3, 1, 2], [s.requests for _, s in stats.windows])
+        self.assertEqual([5, 12, 36], [s.occupancy for _, s in stats.windows])
+
+        with self.assertRaises(AssertionError):
+            stats.add(Request(0, 'a', 1, 60), Status.HIT)
+
+    def test_merge(self):
+        a, b = WindowedStats(window=10), WindowedStats(window=10)
+        for t in [1, 12, 13]:
+            a.add(Request(t, 'a', 1, 60), Status.HIT, t)
+        for t in [5, 25]:
+            b.add(Request(t, 'b', 2, 60), Status.MISS, t)
+
+        merged = a + b
+        self.assertIsInstance(merged, WindowedStats)
+        self.assertEqual(5, merged.requests)
+        self.assertEqual([0, 10, 20], [start for start, _ in merged.windows])
+        self.assertEqual([2, 2, 1], [s.requests for _, s in merged.windows])
+        self.assertEqual(2, len(a.windows))
+
+        # plain statistics take the windows of the other
+        merged = Stats() + a
+        self.assertIsInstance(merged, WindowedStats)
+        self.assertEqual([0, 10], [start for start, _ in merged.windows])
+
+        with self.assertRaises(AssertionError):
+            a + WindowedStats(window=5)
+
+    def test_run(self):
+        request = Request(0, 'small', 3, 300)
+
+        stats = FIFOCache(20).run([request] * 100)
+        self.assertEqual(100, stats.requests)
+        self.assertEqual(99, stats.hits)
+        self.assertEqual(1, stats.misses)
+        self.assertEqual(3, stats.originbytes)
+        self.assertEqual(3, stats.occupancy)
+
+        stats = NonCache().run([request] * 100, WindowedStats(60))
+        self.assertEqual(100, stats.passes)
+        self.assertEqual(300, stats.originbytes)
+        self.assertEqual(0, stats.occupancy)
+        self.assertEqual(1, len(stats.windows))
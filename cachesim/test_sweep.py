@@ -0,0 +1,43 @@
+from unittest import TestCase
+
+from cachesim import Request, Stats, Trace
+from cachesim.caches import FIFOCache, LFUCache, ProtectedFIFOCache
+from cachesim.readers import PopulationReader
+from cachesim.sweep import grid, sweep
+
+
+class TestSweep(TestCase):
+    def test_grid(self):
+        configs = grid([FIFOCache, LFUCache], totalsize=[10, 20])
+        self.assertEqual([(FIFOCache, {'totalsize': 10}), (FIFOCache, {'totalsize': 20}),
+                          (LFUCache, {'totalsize': 10}), (LFUCache, {'totalsize': 20})], configs)
+
+        configs = grid([ProtectedFIFOCache], totalsize=[10, 20], limit=[2, 5])
+        self.assertEqual(4, len(configs))
+        self.assertIn((ProtectedFIFOCache, {'totalsize': 20, 'limit': 2}), configs)
+
+    def test_sweep(self):
+        count = 200
+        population = [Request(0, str(i), i % 50 + 1, 3600) for i in range(count)]
+        trace = Trace.fromreader(PopulationReader(5000, population=population,
+                                                  weights=[1 / (i + 1) for i in range(count)]))
+
+        configs = grid([FIFOCache, LFUCache], totalsize=[500, 2000]) + \
+                  grid([ProtectedFIFOCache], totalsize=[2000], limit=[20])
+        rows = sweep(trace, configs, processes=2)
+
+        self.assertEqual(5, len(rows))
+        self.assertEqual(['FIFOCache', 'FIFOCache', 'LFUCache', 'LFUCache', 'ProtectedFIFOCache'],
+                         [row['policy'] for row in rows])
+        self.assertEqual(20, rows[4]['limit'])
+        for (policy, kwargs), row in zip(configs, rows):
+            stats = policy(**kwargs).run(trace, Stats())
+            self.assertEqual(kwargs['totalsize'], row['totalsize'])
+            self.assertEqual(5000, row['requests'])
+            self.assertEqual(stats.hits, row['hits'])
+            self.assertAlmostEqual(stats.chr, row['chr'])
+            self.assertAlmostEqual(stats.bhr, row['bhr'])
+            self.assertEqual(stats.originbytes, row['originbytes'])
+
+        # bigger caches, better hit ratio
+        self.assertLess(rows[0]['chr'], rows[1]['chr'])
@@ -0,0 +1,71 @@
+import random
+from unittest import TestCase
+
+from cachesim import Request, Status, TinyLFUMixIn
+from cachesim.caches import FIFOCache, LRUCache, HeapLFUCache, GDSFCache, SLRUCache, ARCCache, TwoQCache, S3FIFOCache
+from cachesim.readers import PopulationReader
+
+
+class TinyLFUFIFOCache(TinyLFUMixIn, FIFOCache):
+    pass
+
+
+def cached(cache) -> set:
+    """Hashes in the queues of the caches, _lookup() would change them."""
+    return set(cache._cache).union(*[getattr(cache, name, ()) for name in ['_protected', '_frequent', '_main']])
+
+
+class TestTinyLFUMixIn(TestCase):
+    def test_tinylfumixin(self):
+        cache = TinyLFUFIFOCache(100, sketchsize=1024)
+        for i in range(90):
+            cache._recv(Request(i, str(i), 1, 3600))
+            cache._recv(Request(i, str(i), 1, 3600))
+        self.assertEqual(90, cache.size)
+
+        # full, a new object was requested less often than the victim
+        _, status, _ = cache._recv(Request(100, 'new', 1, 3600))
+        self.assertEqual(Status.PASS, status)
+
+        # more often
+        for _ in range(3):
+            cache._recv(Request(101, 'new', 1, 3600))
+        self.assertIsNotNone(cache._lookup(Request(102, 'new', 1, 3600)))
+        self.assertEqual(91, cache.size)
+
+        # no admission, if the object does not fit
+        with self.assertRaises(AssertionError):
+            TinyLFUFIFOCache(100, sketchsize=2)
+
+    def test_chr(self):
+        # zipf like popularity, TinyLFU keeps the popular objects
+        count = 2000
+        population = [Request(0, str(i), 1, 3600 * 24) for i in range(count)]
+        weights = [1 / (i + 1) for i in range(count)]
+        for cls in [FIFOCache, LRUCache, HeapLFUCache, SLRUCache, ARCCache, TwoQCache]:
+            class MyCache(TinyLFUMixIn, cls):
+                pass
+
+            random.seed(0)
+            plain = cls(100).run(PopulationReader(20000, population, weights))
+            random.seed(0)
+            admitted = MyCache(100, sketchsize=4096).run(PopulationReader(20000, population, weights))
+            self.assertGreaterEqual(admitted.chr, plain.chr, cls.__name__)
+
+    def test_victim(self):
+        # caches tell the object they evict next, multi queue ones also when their first queue is empty
+        for cls in [SLRUCache, ARCCache, TwoQCache, S3FIFOCache, HeapLFUCache, GDSFCache]:
+            cache = cls(100)
+            for i in range(85):
+                cache._recv(Request(i, str(i), 1, 3600))
+            for i in range(85):
+                cache._recv(Request(i, str(i), 1, 3600))
+
+            for i in range(85, 300):
+                victim = cache._victim()
+                self.assertIsNotNone(victim, cls.__name__)
+                before = cached(cache)
+                cache._recv(Request(i, str(i), 1, 3600))
+                evicted = before - cached(cache)
+                if evicted:
+                    self.assertIn(victim, evicted, cls.__name__)
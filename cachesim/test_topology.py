@@ -0,0 +1,83 @@
+import random
+from unittest import TestCase
+
+import numpy as np
+
+from cachesim import Request, Trace, Stats
+from cachesim.caches import FIFOCache, LRUCache, NonCache
+from cachesim.readers import PopulationReader
+from cachesim.topology import Topology
+
+
+class TestTopology(TestCase):
+    def setUp(self):
+        random.seed(0)
+        count = 2000
+        population = [Request(0, str(i), random.randint(1, 100), 3600 * 24) for i in range(count)]
+        weights = [1 / (i + 1) ** .8 for i in range(count)]
+        self.trace = Trace.fromreader(PopulationReader(20000, population, weights=weights))
+
+    def topology(self) -> Topology:
+        # shield <- 2 mid tiers <- 2 edges each
+        topology = Topology().add('shield', LRUCache(20000))
+        for mid in ['mid0', 'mid1']:
+            topology.add(mid, LRUCache(10000), parent='shield')
+            for edge in range(2):
+                topology.add(f"{mid}edge{edge}", FIFOCache(2000), parent=mid)
+        return topology
+
+    def test_add(self):
+        topology = self.topology()
+        self.assertEqual(['mid0edge0', 'mid0edge1', 'mid1edge0', 'mid1edge1'], topology.edges)
+        self.assertEqual('mid1', topology.parent('mid1edge1'))
+        self.assertIsNone(topology.parent('shield'))
+        with self.assertRaises(AssertionError):
+            topology.add('edge', FIFOCache(100), parent='unknown')
+        with self.assertRaises(AssertionError):
+            topology.add('mid0', FIFOCache(100))
+
+    def test_chain(self):
+        # misses and passes of the edge are the requests of the parent
+        stats = Topology().add('parent', LRUCache(20000)).add('edge', FIFOCache(2000), parent='parent').run(self.trace)
+        edge = FIFOCache(2000).run(self.trace)
+        self.assertEqual(edge.hits, stats['edge'].hits)
+        self.assertEqual(edge.misses + edge.passes, stats['parent'].requests)
+        self.assertEqual(len(self.trace), stats.requests)
+        self.assertEqual(stats['parent'].originbytes, stats.originbytes)
+        self.assertEqual(stats['parent'].misses + stats['parent'].passes, stats.originrequests)
+        self.assertAlmostEqual(1 - stats.originrequests / len(self.trace), stats.chr)
+        self.assertGreater(stats.chr, edge.chr)
+
+        # a non caching edge forwards everything
+        stats = Topology().add('parent', LRUCache(20000)).add('edge', NonCache(), parent='parent').run(self.trace)
+        self.assertEqual(len(self.trace), stats['parent'].requests)
+
+    def test_simulate(self):
+        # tier by tier batch simulation gives the same results as processing the requests one by one
+        stats = self.topology().simulate(self.trace)
+        expected = self.topology().run(self.trace)
+        for name in expected.caches:
+            self.assertEqual(expected[name].requests, stats[name].requests)
+            self.assertEqual(expected[name].hits, stats[name].hits)
+            self.assertEqual(expected[name].hitbytes, stats[name].hitbytes)
+        self.assertEqual(expected.originbytes, stats.originbytes)
+        self.assertEqual(expected.bytes, stats.bytes)
+
+        # per tier statistics, fan in
+        tiers = stats.tiers
+        self.assertEqual(3, len(tiers))
+        self.assertEqual(len(self.trace), tiers[2].requests)
+        self.assertEqual(tiers[2].misses + tiers[2].passes, tiers[1].requests)
+        self.assertEqual(tiers[1].misses + tiers[1].passes, tiers[0].requests)
+        self.assertEqual(tiers[0].originbytes, stats.originbytes)
+
+    def test_route(self):
+        # all requests of an object at the same edge
+        edge = self.trace.id % 4
+        stats = self.topology().simulate(self.trace, edge=edge, processes=2)
+        route = lambda request: f"mid{request.hash % 4 // 2}edge{request.hash % 2}"
+        expected = self.topology().run(self.trace, route=route)
+        for name in expected.caches:
+            self.assertEqual(expected[name].hits, stats[name].hits)
+        self.assertEqual(np.count_nonzero(edge == 3), stats['mid1edge1'].requests)
+        self.assertIsInstance(stats.tiers[0], Stats)
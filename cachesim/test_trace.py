@@ -0,0 +1,78 @@
+import random
+from unittest import TestCase
+
+from cachesim import Request, Trace, Interner, STATUSES, HIT, PASS
+from cachesim.caches import FIFOCache, LFUCache, HeapLFUCache, NonCache, ProtectedFIFOCache
+from cachesim.readers import CSVReader, PopulationReader
+
+
+class TestTrace(TestCase):
+    def test_trace(self):
+        trace = Trace.fromreader(CSVReader(totalcount=12, csvfile='cachesim/readers/sample.csv'))
+
+        self.assertEqual(12, len(trace))
+        self.assertEqual(5, trace.objectcount)
+        self.assertEqual(['a', 'b', 'c', 'd', 'e'], trace.hashes)
+        self.assertEqual([0, 1, 2, 3, 4, 0, 1, 2, 3, 4, 0, 1], trace.id.tolist())
+        self.assertEqual(1.2, trace.time[0])
+        self.assertTrue(all(trace.size == 100))
+        self.assertTrue(all(trace.maxage == 300))
+
+        self.assertEqual(4, len(trace[2:6]))
+        self.assertEqual([2, 3, 4, 0], trace[2:6].id.tolist())
+
+        requests = list(trace)
+        self.assertEqual(12, len(requests))
+        self.assertTrue(all(isinstance(r, Request) for r in requests))
+        self.assertEqual([0, 1, 2, 3, 4, 0, 1, 2, 3, 4, 0, 1], [r.hash for r in requests])
+
+        with self.assertRaises(AssertionError):
+            Trace([0, 1], [0], [1], [1])
+
+    def test_interner(self):
+        # ids of the reader's interner are kept, and looked up to the original hashes
+        interner = Interner()
+        interner('z')
+        trace = Trace.fromreader(CSVReader(totalcount=12, csvfile='cachesim/readers/sample.csv', interner=interner))
+        self.assertEqual(['z', 'a', 'b', 'c', 'd', 'e'], trace.hashes)
+        self.assertEqual([1, 2, 3, 4, 5, 1], trace.id[:6].tolist())
+
+        population = [Request(0, 'a', 1, 60), Request(0, 'b', 1, 60)]
+        reader = PopulationReader(10, population=population, weights=[1, 1], interner=Interner())
+        self.assertEqual({'a', 'b'}, set(Trace.fromreader(reader).hashes))
+
+    def test_simulate(self):
+        # zipf like popularity, some non cacheable and some big objects
+        count = 1000
+        population = [Request(0, "%x" % random.getrandbits(8 * 8), random.randint(1, 100),
+                              random.choice([-1, 0, 3600, 3600, 3600])) for x in range(count)]
+        population[0]._size = 5000
+        trace = Trace.fromreader(PopulationReader(20000, population=population,
+                                                  weights=[1 / (i + 1) for i in range(count)]))
+
+        for cache in [FIFOCache(3000), ProtectedFIFOCache(3000, 50), LFUCache(3000), HeapLFUCache(3000), NonCache()]:
+            status, size = cache.simulate(trace)
+
+            # caches has not been changed
+            self.assertEqual(0, getattr(cache, 'size', 0))
+
+            expected = list(cache.map(trace))
+            self.assertEqual([r[1] for r in expected], [STATUSES[s] for s in status])
+            self.assertEqual([r[2] if len(r) > 2 else 0 for r in expected], size.tolist())
+
+        self.assertTrue(all(status == PASS))
+
+    def test_overloaded(self):
+        class MyCache(FIFOCache):
+            def _admit(self, fetched: Request) -> bool:
+                return fetched.size < 3
+
+        trace = Trace([0, 1, 2, 3], [0, 1, 0, 1], [2, 5, 2, 5], [60, 60, 60, 60])
+        cache = MyCache(10)
+        self.assertTrue(cache._overloaded(FIFOCache))
+        self.assertFalse(FIFOCache(10)._overloaded(FIFOCache))
+
+        status, size = cache.simulate(trace)
+        self.assertEqual([STATUSES[s] for s in status], [r[1] for r in cache.map(trace)])
+        self.assertEqual(HIT, status[2])
+        self.assertEqual([2, 2, 2, 2], size.tolist())
@@ -0,0 +1,108 @@
+from unittest import TestCase
+
+import numpy as np
+
+from cachesim.workload import Constant, Lognormal, Pareto, AliasTable, Shuffle, IRM, Zipf, ShotNoise
+
+
+class TestWorkload(TestCase):
+    def test_distributions(self):
+        rng = np.random.default_rng(0)
+
+        self.assertEqual([5, 5, 5], Constant(5)(rng, 3).tolist())
+
+        values = Lognormal(1000, 1.0)(rng, 100000)
+        self.assertEqual(np.int64, values.dtype)
+        self.assertGreaterEqual(values.min(), 1)
+        self.assertAlmostEqual(1000, values.mean(), delta=30)
+
+        values = Pareto(2.5, 10)(rng, 100000)
+        self.assertGreaterEqual(values.min(), 10)
+        self.assertAlmostEqual(Pareto(2.5, 10).mean, values.mean(), delta=1)
+        self.assertEqual(np.inf, Pareto(1, 10).mean)
+
+    def test_aliastable(self):
+        rng = np.random.default_rng(0)
+        for weights in [rng.random(1000), 1 / np.arange(1, 10001) ** 1.2, np.r_[1e9, np.ones(1000)],
+                        [0, 0, 1], rng.pareto(0.5, 1000)]:
+            table = AliasTable(weights)
+
+            # probability of each index: own part of its bucket, plus the rest of the buckets it is the alias of
+            probability = table._prob.copy()
+            np.add.at(probability, table._alias, 1 - table._prob)
+            np.testing.assert_allclose(probability / len(table), np.asarray(weights) / np.sum(weights), atol=1e-12)
+
+        drawn = np.bincount(AliasTable([1, 2, 0, 7])(rng, 100000), minlength=4) / 100000
+        np.testing.assert_allclose([0.1, 0.2, 0, 0.7], drawn, atol=0.01)
+
+        with self.assertRaises(AssertionError):
+            AliasTable([0, 0])
+        with self.assertRaises(AssertionError):
+            AliasTable([1, -1])
+
+    def test_irm(self):
+        batches = IRM([0, 1, 3], size=Lognormal(100, 1), rate=10).batches(np.random.default_rng(0), 1000)
+        first, second = next(batches), next(batches)
+        self.assertEqual(1000, len(first))
+
+        # monotonic synthetic time, continued between batches
+        times = np.concatenate([first.time, second.time])
+        self.assertTrue(np.all(np.diff(times) > 0))
+        self.assertAlmostEqual(200, times[-1], delta=20)
+
+        # popularity, objects keep their size
+        id = np.concatenate([first.id, second.id])
+        counts = np.bincount(id, minlength=3)
+        self.assertEqual(0, counts[0])
+        self.assertAlmostEqual(0.25, counts[1] / len(id), delta=0.03)
+        size = np.concatenate([first.size, second.size])
+        for i in [1, 2]:
+            self.assertEqual(1, len(np.unique(size[id == i])))
+
+    def test_churn(self):
+        popularity = np.arange(100, dtype=np.float64)
+        shuffled = Shuffle(0.5)(np.random.default_rng(0), popularity)
+        self.assertEqual(sorted(popularity), sorted(shuffled))
+        self.assertAlmostEqual(50, np.count_nonzero(popularity != shuffled), delta=5)
+
+        # popularity of the objects swaps every 100 s
+        workload = IRM([1, 0], size=np.array([10, 20]), rate=10, churn=lambda rng, p: p[::-1], period=100)
+        trace = next(workload.batches(np.random.default_rng(0), 3000))
+        self.assertGreater(trace.time[-1], 250)
+        for start in [0, 100, 200]:
+            window = (start <= trace.time) & (trace.time < start + 100)
+            self.assertEqual({start // 100 % 2}, set(trace.id[window].tolist()))
+        self.assertEqual([10, 20], sorted(set(trace.size.tolist())))
+
+    def test_zipf(self):
+        trace = next(Zipf(1000, 1.0).batches(np.random.default_rng(0), 100000))
+        counts = np.bincount(trace.id, minlength=1000)
+        self.assertLess(trace.id.max(), 1000)
+        # rank 1 is requested about twice as often as rank 2, and 1 / H(1000) of all
+        self.assertAlmostEqual(2, counts[0] / counts[1], delta=0.1)
+        self.assertAlmostEqual(1 / np.sum(1 / np.arange(1, 1001)), counts[0] / len(trace), delta=0.01)
+
+        uniform = np.bincount(next(Zipf(10, 0).batches(np.random.default_rng(0), 100000)).id)
+        self.assertAlmostEqual(0.1, uniform.min() / 100000, delta=0.01)
+
+    def test_shotnoise(self):
+        batches = ShotNoise(10, 100, volume=Constant(20), maxage=Lognormal(60, 0.5)).batches(
+            np.random.default_rng(0), 1000)
+        traces = [next(batches) for _ in range(100)]
+        time = np.concatenate([trace.time for trace in traces])
+        id = np.concatenate([trace.id for trace in traces])
+        maxage = np.concatenate([trace.maxage for trace in traces])
+
+        self.assertTrue(np.all(np.diff(time) >= 0))
+        self.assertGreaterEqual(time[0], 0)
+        # steady state: arrivalrate * volume requests per second
+        self.assertAlmostEqual(200, len(time) / time[-1], delta=10)
+
+        # objects are requested within their lifetime only, with the same maxage
+        for i in np.unique(id)[:100]:
+            self.assertLessEqual(np.ptp(time[id == i]), 100)
+            self.assertEqual(1, len(np.unique(maxage[id == i])))
+        # objects appearing between 50 and 350 s (ids from about 1000 + 500 to 1000 + 3500) are requested all their
+        # lifetime
+        self.assertGreater(time[-1], 450)
+        self.assertAlmostEqual(20, np.mean(np.bincount(id)[1500:4500]), delta=1)
@@ -0,0 +1,75 @@
+from typing import Optional
+
+from cachesim import Request
+from cachesim.sketch import TinyLFU
+
+
+class TinyLFUMixIn:
+    """
+    TinyLFU admission: request frequencies are estimated on a count-min sketch with aging (optionally behind a Bloom
+    filter doorkeeper). When the caches is about to evict, a fetched object is admitted only if it was requested more
+    often than the next victim of the caches (see Cache._victim()). The caches is considered full above its low
+    watermark, where every admitted object pushes another one out. Use it with the caches having size and thlow: class
+    MyCache(TinyLFUMixIn, LRUCache)
+    """
+
+    def __init__(self, *args, sketchsize: int = 1 << 16, doorkeepersize: int = 0, **kwargs):
+        """
+        :param sketchsize: Memory of the sketch in Byte.
+        :param doorkeepersize: Memory of the doorkeeper in Byte, no doorkeeper if 0.
+        """
+        super().__init__(*args, **kwargs)
+        self._tinylfu = TinyLFU(sketchsize, doorkeepersize)
+
+    @property
+    def tinylfu(self) -> TinyLFU:
+        return self._tinylfu
+
+    def _lookup(self, requested: Request) -> Optional[Request]:
+        self._tinylfu.record(requested.hash)
+        return super()._lookup(requested)
+
+    def _admit(self, fetched: Request) -> bool:
+        if not super()._admit(fetched):
+            return False
+
+        # room for the object below the low watermark, no eviction due to it
+        if self.size + fetched.size <= self.totalsize * self.thlow:
+            return True
+
+        victim = self._victim()
+        return victim is None or self._tinylfu.estimate(fetched.hash) > self._tinylfu.estimate(victim)
+
+
+if __name__ == "__main__":
+    import time
+
+    import numpy as np
+
+    from cachesim import Trace
+    from cachesim.caches import LRUCache
+    from cachesim.readers import WorkloadReader
+    from cachesim.workload import Zipf
+
+    # zipf popularity over 1M objects, unit sizes, caches holds 1% of the objects
+    objectcount = 1000000
+    trace = Trace.fromreader(WorkloadReader(2000000, Zipf(objectcount, 0.9, maxage=np.full(objectcount, 10 ** 9)),
+                                            seed=0))
+    totalsize = objectcount // 100
+
+    class TinyLFULRUCache(TinyLFUMixIn, LRUCache):
+        pass
+
+    start = time.perf_counter()
+    stats = LRUCache(totalsize).run(trace)
+    print(f"{'LRUCache':>30}: CHR {stats.chr * 100:.2f}%, {len(trace) / (time.perf_counter() - start):.0f} requests/s")
+
+    # admission memory against hit ratio
+    for sketchsize in [1 << 10, 1 << 12, 1 << 14, 1 << 16]:
+        for doorkeepersize in [0, sketchsize // 4]:
+            cache = TinyLFULRUCache(totalsize, sketchsize=sketchsize, doorkeepersize=doorkeepersize)
+            start = time.perf_counter()
+            stats = cache.run(trace)
+            elapsed = time.perf_counter() - start
+            print(f"{cache.tinylfu.nbytes:>8} Byte TinyLFU, doorkeeper {doorkeepersize:>5} Byte: "
+                  f"CHR {stats.chr * 100:.2f}%, {len(trace) / elapsed:.0f} requests/s")
@@ -0,0 +1,266 @@
+from itertools import count
+from multiprocessing import Pool
+from typing import Callable, Dict, Hashable, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from cachesim import Cache, Reader, Request, Stats, Status, Trace, HIT
+
+# trace shared by the worker processes, set by the pool initializer
+_trace = None
+
+
+def _init(trace: Trace):
+    global _trace
+    _trace = trace
+
+
+def _subtrace(trace: Trace, index: np.ndarray) -> Trace:
+    return Trace(trace.time[index], trace.id[index], trace.size[index], trace.maxage[index], hashes=trace.hashes,
+                 check=False)
+
+
+def _simulate(task: Tuple[Cache, np.ndarray]) -> Tuple[np.ndarray, Stats]:
+    cache, index = task
+    trace = _subtrace(_trace, index)
+    status, occupancy = cache.simulate(trace)
+    return status, Stats.fromsimulation(trace, status, occupancy)
+
+
+class TopologyStats:
+    """
+    Statistics of a topology simulation: Stats of each caches, of each tier and of the origin traffic.
+    """
+
+    def __init__(self, stats: Dict[Hashable, Stats], depth: Dict[Hashable, int], clients: Stats):
+        """
+        :param stats: Statistics of each caches.
+        :param depth: Tier of each caches, 0 for the ones connected to the origin.
+        :param clients: Statistics of the client requests, as served by the edges.
+        """
+        self._stats = stats
+        self._depth = depth
+        self._clients = clients
+
+    @property
+    def caches(self) -> Dict[Hashable, Stats]:
+        return self._stats
+
+    def __getitem__(self, name: Hashable) -> Stats:
+        return self._stats[name]
+
+    @property
+    def tiers(self) -> List[Stats]:
+        """Merged statistics of the caches in each tier, starting with the ones connected to the origin."""
+        tiers = [Stats() for _ in range(max(self._depth.values(), default=-1) + 1)]
+        for name, stats in self._stats.items():
+            tiers[self._depth[name]] += stats
+        return tiers
+
+    @property
+    def requests(self) -> int:
+        """Client requests."""
+        return self._clients.requests
+
+    @property
+    def bytes(self) -> int:
+        """Bytes sent to the clients."""
+        return self._clients.bytes
+
+    @property
+    def originrequests(self) -> int:
+        """Requests sent to the origin (misses and passes of the top tier)."""
+        return sum(stats.misses + stats.passes for name, stats in self._stats.items() if not self._depth[name])
+
+    @property
+    def originbytes(self) -> int:
+        """Bytes fetched from the origin (origin egress)."""
+        return sum(stats.originbytes for name, stats in self._stats.items() if not self._depth[name])
+
+    @property
+    def chr(self) -> float:
+        """Share of the client requests served by any of the caches."""
+        return 1 - self.originrequests / self.requests if self.requests else 0
+
+    @property
+    def bhr(self) -> float:
+        """Share of the client bytes served by any of the caches (origin offload)."""
+        return 1 - self.originbytes / self.bytes if self.bytes else 0
+
+    def __str__(self):
+        """For logging"""
+        return f"Requests: {self.requests}, CHR: {self.chr * 100:.2f}%, BHR: {self.bhr * 100:.2f}%, " \
+               f"Bytes sent: {self.bytes} Byte, Origin bytes: {self.originbytes} Byte"
+
+
+class Topology:
+    """
+    Tree of caches: client requests enter at the edges (caches without children), misses and passes of a caches are
+    requests to its parent, those of the top tier go to the origin. Several caches may share a parent. Objects enter
+    every caches on the way back with their full maxage.
+    """
+
+    def __init__(self):
+        self._caches = {}  # name: caches, parents first
+        self._parents = {}  # name: parent name, None for the origin
+        self._depth = {}  # name: distance from the origin
+
+    def add(self, name: Hashable, cache: Cache, parent: Optional[Hashable] = None):
+        """
+        Adds a caches.
+
+        :param name: Name of the caches.
+        :param cache: The caches.
+        :param parent: Name of the parent caches, already added, None to connect to the origin.
+        :return: The topology, for chaining.
+        """
+        assert isinstance(cache, Cache), f"I expect a Cache, got '{cache}'"
+        assert name not in self._caches, f"Cache '{name}' already added"
+        assert parent is None or parent in self._caches, f"Parent '{parent}' must be added first"
+        self._caches[name] = cache
+        self._parents[name] = parent
+        self._depth[name] = self._depth[parent] + 1 if parent is not None else 0
+        return self
+
+    @property
+    def caches(self) -> Dict[Hashable, Cache]:
+        return self._caches
+
+    def parent(self, name: Hashable) -> Optional[Hashable]:
+        return self._parents[name]
+
+    @property
+    def edges(self) -> List[Hashable]:
+        """Names of the caches without children, in the order added."""
+        parents = set(self._parents.values())
+        return [name for name in self._caches if name not in parents]
+
+    def run(self, reader: Reader, route: Optional[Callable[[Request], Hashable]] = None) -> TopologyStats:
+        """
+        Processes the requests one by one, walking up the tree till a caches hits.
+
+        :param reader: The reader.
+        :param route: Name of the edge serving a request, round robin over the edges if not given.
+        :return: The statistics.
+        """
+        assert self._caches, f"Add caches first"
+        if route is None:
+            edges = self.edges
+            counter = count()
+            route = lambda request: edges[next(counter) % len(edges)]
+
+        stats = {name: Stats() for name in self._caches}
+        recv = {name: cache._recv for name, cache in self._caches.items()}
+        add = {name: s.add for name, s in stats.items()}
+        parents = self._parents
+        edgeset = set(self.edges)
+
+        for request in reader:
+            name = route(request)
+            assert name in edgeset, f"'{name}' is not an edge"
+            result = recv[name](request)
+            add[name](*result)
+
+            while result[1] is not Status.HIT and parents[name] is not None:
+                name = parents[name]
+                result = recv[name](request)
+                add[name](*result)
+
+        clients = Stats()
+        for name in edgeset:
+            clients += stats[name]
+
+        return TopologyStats(stats, self._depth, clients)
+
+    def simulate(self, trace: Trace, edge: Optional[np.ndarray] = None, processes: Optional[int] = 1) -> TopologyStats:
+        """
+        Batch simulation of a columnar trace, tier by tier: each caches processes all its requests at once with its
+        batch engine (see Cache.simulate()), then its misses and passes are handed over to the parent, merged in time
+        order with the ones of the siblings. The caches of a tier are independent, and can run in parallel.
+
+        :param trace: The trace, requests in time order.
+        :param edge: Index of the edge (in edges) serving each request, round robin if not given.
+        :param processes: Number of worker processes, defaults to the number of CPUs if None, no pool if 1.
+        :return: The statistics.
+        """
+        assert self._caches, f"Add caches first"
+        edges = self.edges
+        assert edge is None or len(edge) == len(trace), f"I expect an edge for each request, got '{len(edge)}'"
+
+        # request indices of the caches, lists of arrays
+        inputs = {name: [] for name in self._caches}
+        for i, name in enumerate(edges):
+            inputs[name].append(np.arange(i, len(trace), len(edges)) if edge is None else np.flatnonzero(edge == i))
+
+        stats = {}
+        with Pool(processes, initializer=_init, initargs=(trace,)) if processes != 1 else _Inline(trace) as pool:
+            for depth in range(max(self._depth.values()), -1, -1):
+                names = [name for name in self._caches if self._depth[name] == depth]
+                indices = [np.sort(np.concatenate(inputs.pop(name))) for name in names]
+                tasks = [(self._caches[name], index) for name, index in zip(names, indices)]
+                for name, index, (status, s) in zip(names, indices, pool.imap(_simulate, tasks)):
+                    stats[name] = s
+                    if self._parents[name] is not None:
+                        inputs[self._parents[name]].append(index[status != HIT])
+
+        clients = Stats()
+        for name in edges:
+            clients += stats[name]
+
+        return TopologyStats({name: stats[name] for name in self._caches}, self._depth, clients)
+
+
+class _Inline:
+    """Runs the tasks in this process, in place of a Pool."""
+
+    def __init__(self, trace: Trace):
+        self._trace = trace
+
+    def __enter__(self):
+        _init(self._trace)
+        return self
+
+    def __exit__(self, *args):
+        _init(None)
+
+    def imap(self, func: Callable, iterable: Iterable):
+        return map(func, iterable)
+
+
+if __name__ == "__main__":
+    import os
+    import sys
+    import tempfile
+    import time
+
+    from cachesim.caches import LRUCache
+    from cachesim.readers import MmapReader, WorkloadReader
+    from cachesim.workload import Zipf, Lognormal, Constant
+
+    # 100M requests over 10M objects through 24 edges, 4 mid tier caches and an origin shield, the trace is memory
+    # mapped from a temporary file
+    totalcount = int(sys.argv[1]) if len(sys.argv) > 1 else 100000000
+    objectcount = totalcount // 10
+    workload = Zipf(objectcount, 0.8, size=Lognormal(10000, 1.5), maxage=Constant(10 ** 9), rate=1000)
+    contentsize = objectcount * 10000
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'trace.bin')
+        MmapReader.write(path, WorkloadReader(totalcount, workload, seed=0).batches())
+        trace = MmapReader(totalcount, path).trace
+
+        topology = Topology().add('shield', LRUCache(contentsize // 10))
+        for mid in range(4):
+            topology.add(f"mid{mid}", LRUCache(contentsize // 20), parent='shield')
+            for edge in range(6):
+                topology.add(f"edge{mid}.{edge}", LRUCache(contentsize // 100), parent=f"mid{mid}")
+
+        start = time.perf_counter()
+        stats = topology.simulate(trace, processes=int(sys.argv[2]) if len(sys.argv) > 2 else None)
+        elapsed = time.perf_counter() - start
+
+    print(f"{len(topology.caches)} caches, {totalcount} requests in {elapsed:.0f}s, {totalcount / elapsed:.0f} "
+          f"requests/s")
+    for depth, tier in enumerate(stats.tiers):
+        print(f"Tier {depth}: {tier}")
+    print(stats)
@@ -0,0 +1,176 @@
+import os
+import shutil
+import tempfile
+from os.path import isdir, isfile, join
+from typing import Iterator, Optional, Sequence
+
+import numpy as np
+
+from cachesim import Reader, Request, FastRequest, Status, Interner
+
+# status codes of the columnar simulation results
+HIT, MISS, PASS = 0, 1, 2
+STATUSES = (Status.HIT, Status.MISS, Status.PASS)
+
+
+class Trace:
+    """
+    Columnar representation of requests: time, object id, size and maxage arrays. Object hashes are interned to dense
+    integer ids, the original hashes are kept for reporting.
+    """
+
+    @classmethod
+    def load(cls, path: str, mmap: bool = True):
+        """
+        Loads a trace saved by save().
+
+        :param path: The trace directory.
+        :param mmap: Memory map the columns instead of reading them.
+        """
+        assert isdir(path), f"Trace '{path}' doesn't exist"
+        mode = 'r' if mmap else None
+        columns = [np.load(join(path, f"{name}.npy"), mmap_mode=mode) for name in ['time', 'id', 'size', 'maxage']]
+        hashes = np.load(join(path, 'hashes.npy'), mmap_mode=mode) if isfile(join(path, 'hashes.npy')) else None
+
+        return cls(*columns, hashes=hashes)
+
+    @classmethod
+    def fromreader(cls, reader: Reader, interner: Optional[Interner] = None):
+        """
+        Reads all requests of a reader into a trace. Readers interning the hashes give the ids of their interner, which
+        are kept, and the original hashes are taken from it.
+
+        :param reader: The reader.
+        :param interner: Interner of the reader, if not the one it has been created with (optional).
+        """
+        if interner is None:
+            interner = getattr(reader, '_interner', None)
+        interned = interner is not None
+        if not interned:
+            interner = Interner()
+
+        time, id, size, maxage = [], [], [], []
+        for request in reader:
+            time.append(request.time)
+            id.append(request.hash if interned else interner(request.hash))
+            size.append(request._size)
+            maxage.append(request._maxage)
+
+        return cls(time, id, size, maxage, hashes=interner.hashes)
+
+    def __init__(self, time, id, size, maxage, hashes: Optional[Sequence] = None, check: bool = True):
+        """
+        :param time: Request timestamps.
+        :param id: Dense, non negative object ids.
+        :param size: Object sizes.
+        :param maxage: Maximum caching times.
+        :param hashes: Original hash of each object id (optional).
+        :param check: Check the object ids, which reads the whole id column.
+        """
+        self._time = np.asarray(time, dtype=np.float64)
+        self._id = np.asarray(id, dtype=np.int64)
+        self._size = np.asarray(size, dtype=np.int64)
+        self._maxage = np.asarray(maxage, dtype=np.int64)
+
+        assert len(self._time) == len(self._id) == len(self._size) == len(self._maxage), \
+            f"Columns must have the same length, got: '{len(self._time)}', '{len(self._id)}', '{len(self._size)}', " \
+            f"'{len(self._maxage)}'"
+        assert not check or len(self._id) == 0 or self._id.min() >= 0, f"Object ids must be non negative"
+        self._hashes = hashes
+
+    @property
+    def time(self) -> np.ndarray:
+        return self._time
+
+    @property
+    def id(self) -> np.ndarray:
+        return self._id
+
+    @property
+    def size(self) -> np.ndarray:
+        return self._size
+
+    @property
+    def maxage(self) -> np.ndarray:
+        return self._maxage
+
+    @property
+    def hashes(self) -> Optional[Sequence]:
+        """Original hashes indexed by object id, None if unknown."""
+        return self._hashes
+
+    @property
+    def totalcount(self) -> int:
+        """Number of requests, same as len(), for use in place of a Reader."""
+        return len(self)
+
+    @property
+    def objectcount(self) -> int:
+        """Upper bound of the object ids."""
+        return int(self._id.max()) + 1 if len(self) else 0
+
+    def __len__(self) -> int:
+        return len(self._id)
+
+    def save(self, path: str):
+        """
+        Saves the columns as .npy files into a directory, replacing it if exists. The columns are written into a
+        temporary directory renamed into place, a crash never leaves a partial trace behind.
+
+        :param path: The trace directory.
+        """
+        path = os.path.abspath(path)
+        tmp = tempfile.mkdtemp(prefix=f"{os.path.basename(path)}.", dir=os.path.dirname(path))
+        try:
+            for name, column in [('time', self._time), ('id', self._id), ('size', self._size),
+                                 ('maxage', self._maxage)]:
+                np.save(join(tmp, f"{name}.npy"), column)
+            if self._hashes is not None:
+                np.save(join(tmp, 'hashes.npy'), np.asarray(self._hashes, dtype=str))
+
+            shutil.rmtree(path, ignore_errors=True)
+            os.replace(tmp, path)
+        except BaseException:
+            shutil.rmtree(tmp, ignore_errors=True)
+            raise
+
+    def __getitem__(self, item: slice):
+        assert isinstance(item, slice), f"Only slicing is supported, got '{item}'"
+        return type(self)(self._time[item], self._id[item], self._size[item], self._maxage[item], hashes=self._hashes,
+                          check=False)
+
+    def chunks(self, chunksize: int = 1 << 20) -> Iterator[tuple]:
+        """
+        Iterates over the columns in chunks converted to lists, which is the fastest way to loop over them in python.
+
+        :param chunksize: Number of requests per chunk.
+        :return: (time, id, size, maxage) lists.
+        """
+        for start in range(0, len(self), chunksize):
+            end = start + chunksize
+            yield (self._time[start:end].tolist(), self._id[start:end].tolist(), self._size[start:end].tolist(),
+                   self._maxage[start:end].tolist())
+
+    def __iter__(self) -> Iterator[Request]:
+        """Requests with object ids as hashes."""
+        for time, id, size, maxage in self.chunks():
+            yield from map(FastRequest, time, id, size, maxage)
+
+
+if __name__ == "__main__":
+    import time
+
+    from cachesim.caches import FIFOCache, LFUCache, NonCache
+
+    # zipf popularity over 1M objects, 10M requests
+    totalcount = 10000000
+    rng = np.random.default_rng(0)
+    id = rng.zipf(1.2, totalcount) % 1000000
+    trace = Trace(np.arange(totalcount, dtype=np.float64), id, id % 100 + 1, np.full(totalcount, 3600 * 24))
+
+    for cache in [FIFOCache(totalsize=500000), LFUCache(totalsize=500000), NonCache()]:
+        start = time.perf_counter()
+        status, size = cache.simulate(trace)
+        elapsed = time.perf_counter() - start
+        print(f"{cache.__class__.__name__}: {totalcount / elapsed:.0f} requests/s, "
+              f"CHR: {np.count_nonzero(status == HIT) / totalcount * 100:.2f}%")
@@ -0,0 +1,334 @@
+from abc import ABC, abstractmethod
+from typing import Callable, Iterator, Optional, Union
+
+import numpy as np
+
+from cachesim import Trace
+
+
+class Distribution(ABC):
+    """
+    Random positive integers (object sizes, maxages, request volumes), drawn in numpy batches.
+    """
+
+    @property
+    @abstractmethod
+    def mean(self) -> float:
+        pass
+
+    @abstractmethod
+    def __call__(self, rng: np.random.Generator, n: int) -> np.ndarray:
+        """
+        :param rng: Random generator.
+        :param n: Number of values.
+        :return: int64 array of n values.
+        """
+        pass
+
+
+class Constant(Distribution):
+
+    def __init__(self, value: int):
+        assert value >= 0, f"I expect a non negative value, got '{value}'"
+        self._value = int(value)
+
+    @property
+    def mean(self) -> float:
+        return self._value
+
+    def __call__(self, rng: np.random.Generator, n: int) -> np.ndarray:
+        return np.full(n, self._value, dtype=np.int64)
+
+
+class Lognormal(Distribution):
+
+    def __init__(self, mean: float, sigma: float):
+        """
+        :param mean: Mean of the values.
+        :param sigma: Standard deviation of the underlying normal distribution.
+        """
+        assert mean >= 1, f"I expect a mean of at least 1, got '{mean}'"
+        assert sigma >= 0, f"I expect a non negative sigma, got '{sigma}'"
+        self._mean = mean
+        self._sigma = sigma
+
+    @property
+    def mean(self) -> float:
+        return self._mean
+
+    def __call__(self, rng: np.random.Generator, n: int) -> np.ndarray:
+        mu = np.log(self._mean) - self._sigma ** 2 / 2
+        return np.maximum(np.rint(rng.lognormal(mu, self._sigma, n)), 1).astype(np.int64)
+
+
+class Pareto(Distribution):
+
+    def __init__(self, alpha: float, minimum: int):
+        """
+        :param alpha: Shape, heavier tail for smaller alpha.
+        :param minimum: Smallest value.
+        """
+        assert alpha > 0, f"I expect a positive alpha, got '{alpha}'"
+        assert minimum >= 1, f"I expect a minimum of at least 1, got '{minimum}'"
+        self._alpha = alpha
+        self._minimum = minimum
+
+    @property
+    def mean(self) -> float:
+        return self._alpha * self._minimum / (self._alpha - 1) if self._alpha > 1 else np.inf
+
+    def __call__(self, rng: np.random.Generator, n: int) -> np.ndarray:
+        return np.floor(self._minimum * (1 + rng.pareto(self._alpha, n))).astype(np.int64)
+
+
+class Workload(ABC):
+    """
+    Synthetic request generation model. Requests are generated in numpy batches with synthetic, monotonic timestamps
+    (seconds from 0), and object ids as hashes.
+    """
+
+    @abstractmethod
+    def batches(self, rng: np.random.Generator, batchsize: int) -> Iterator[Trace]:
+        """
+        Infinite stream of request batches.
+
+        :param rng: Random generator, the only source of randomness.
+        :param batchsize: Approximate number of requests in a batch.
+        """
+        pass
+
+
+class AliasTable:
+    """
+    Walker's alias method: draws indices with given weights in O(1) each, from one uniform random number, after O(n)
+    preprocessing. The table takes 12 Byte per index (16 above 2 ** 31 indices).
+    """
+
+    def __init__(self, weights):
+        """
+        :param weights: Non negative relative weights, with positive sum.
+        """
+        weights = np.asarray(weights, dtype=np.float64)
+        n = len(weights)
+        assert n and weights.min() >= 0 and weights.sum() > 0, f"Weights should be non negative, with positive sum"
+
+        # Vose's construction, vectorized: in each round, the small buckets (below the average) are filled up by the
+        # large ones in order, the large bucket is the alias of every small bucket that starts in its surplus. Larges
+        # dropping below the average become small in the next round.
+        prob = weights * (n / weights.sum())
+        dtype = np.int32 if n < 2 ** 31 else np.int64
+        alias = np.arange(n, dtype=dtype)
+        small = np.flatnonzero(prob < 1).astype(dtype)
+        large = np.flatnonzero(prob >= 1).astype(dtype)
+        while len(small) and len(large):
+            deficit = 1 - prob[small]
+            start = np.cumsum(deficit)
+            start -= deficit
+            surplus = prob[large]
+            surplus -= 1
+            i = np.searchsorted(np.cumsum(surplus, out=surplus), start, side='right')
+            del start, surplus
+            np.minimum(i, len(large) - 1, out=i)
+            alias[small] = large[i]
+            prob[large] -= np.bincount(i, weights=deficit, minlength=len(large))
+            del i, deficit
+
+            below = prob[large] < 1
+            small, large = large[below], large[~below]
+
+        # rounding leftovers
+        prob[small] = 1
+        prob[large] = 1
+
+        self._prob = prob
+        self._alias = alias
+
+    def __len__(self) -> int:
+        return len(self._prob)
+
+    def __call__(self, rng: np.random.Generator, n: int) -> np.ndarray:
+        """
+        :param rng: Random generator.
+        :param n: Number of indices.
+        :return: int64 array of n indices.
+        """
+        u = rng.random(n) * len(self._prob)
+        index = u.astype(np.int64)
+        return np.where(u - index < self._prob[index], index, self._alias[index])
+
+
+class Shuffle:
+    """
+    Popularity churn for IRM: a random fraction of the objects swap popularity among each other.
+    """
+
+    def __init__(self, fraction: float):
+        """
+        :param fraction: Fraction of the objects to shuffle.
+        """
+        assert 0 <= fraction <= 1, f"I expect a fraction in [0, 1], got '{fraction}'"
+        self._fraction = fraction
+
+    def __call__(self, rng: np.random.Generator, popularity: np.ndarray) -> np.ndarray:
+        popularity = popularity.copy()
+        chosen = rng.choice(len(popularity), int(len(popularity) * self._fraction), replace=False)
+        popularity[chosen] = popularity[rng.permutation(chosen)]
+        return popularity
+
+
+class IRM(Workload):
+    """
+    Independent reference model: every request asks for an object of a fixed catalogue, independently of the others,
+    with fixed probabilities, drawn with an alias table. Requests arrive as a Poisson process.
+
+    Optionally, the popularity changes every period seconds (churn), the alias table is rebuilt then.
+    """
+
+    def __init__(self, popularity, size: Union[Distribution, np.ndarray] = Constant(1),
+                 maxage: Union[Distribution, np.ndarray] = Constant(3600), rate: float = 1.0,
+                 churn: Optional[Callable[[np.random.Generator, np.ndarray], np.ndarray]] = None,
+                 period: float = np.inf):
+        """
+        :param popularity: Relative request probability of each object, object ids are the indices.
+        :param size: Object sizes, drawn once for each object, or the sizes of the objects.
+        :param maxage: Object maxages, drawn once for each object, or the maxages of the objects.
+        :param rate: Requests per second.
+        :param churn: Returns the new popularity from the random generator and the actual popularity (e.g. Shuffle).
+        :param period: Time between popularity changes in seconds.
+        """
+        assert rate > 0, f"I expect a positive rate, got '{rate}'"
+        assert churn is None or period > 0, f"I expect a positive period, got '{period}'"
+
+        self._popularity = np.asarray(popularity, dtype=np.float64)
+        self._table = AliasTable(self._popularity)
+        for value in [size, maxage]:
+            assert isinstance(value, Distribution) or len(value) == len(self._table), \
+                f"I expect a Distribution or a value for each object"
+        self._size = size
+        self._maxage = maxage
+        self._rate = rate
+        self._churn = churn
+        self._period = period if churn is not None else np.inf
+
+    @property
+    def objectcount(self) -> int:
+        return len(self._table)
+
+    def _perobject(self, value: Union[Distribution, np.ndarray], rng: np.random.Generator) -> np.ndarray:
+        if isinstance(value, Constant):
+            # no need for an array of the same values
+            return np.broadcast_to(value(rng, 1), (self.objectcount,))
+        if isinstance(value, Distribution):
+            return value(rng, self.objectcount)
+        return np.asarray(value, dtype=np.int64)
+
+    def batches(self, rng: np.random.Generator, batchsize: int) -> Iterator[Trace]:
+        size = self._perobject(self._size, rng)
+        maxage = self._perobject(self._maxage, rng)
+        popularity, table = self._popularity, self._table
+
+        time = 0.0
+        change = self._period
+        while True:
+            times = time + np.cumsum(rng.exponential(1 / self._rate, batchsize))
+            time = float(times[-1])
+
+            # requests after a popularity change are drawn from the new table
+            ids = []
+            start = 0
+            while change <= time:
+                end = int(np.searchsorted(times, change))
+                ids.append(table(rng, end - start))
+                start = end
+                popularity = self._churn(rng, popularity)
+                table = AliasTable(popularity)
+                change += self._period
+            ids.append(table(rng, batchsize - start))
+            id = np.concatenate(ids) if len(ids) > 1 else ids[0]
+
+            yield Trace(times, id, size[id], maxage[id], check=False)
+
+
+class Zipf(IRM):
+    """
+    Independent reference model with Zipf popularity: the request probability of the object of rank i (from 1) is
+    proportional to 1 / i ** alpha. Object ids are the ranks from 0.
+    """
+
+    def __init__(self, objectcount: int, alpha: float, size: Distribution = Constant(1),
+                 maxage: Distribution = Constant(3600), rate: float = 1.0):
+        """
+        :param objectcount: Size of the catalogue.
+        :param alpha: Skewness, uniform popularity for 0.
+        :param size: Object sizes, drawn once for each object.
+        :param maxage: Object maxages, drawn once for each object.
+        :param rate: Requests per second.
+        """
+        assert objectcount > 0, f"I expect a positive objectcount, got '{objectcount}'"
+        assert alpha >= 0, f"I expect a non negative alpha, got '{alpha}'"
+        super().__init__(np.arange(1, objectcount + 1, dtype=np.float64) ** -alpha, size=size, maxage=maxage,
+                         rate=rate)
+
+
+class ShotNoise(Workload):
+    """
+    Shot noise model of temporal locality: new objects appear as a Poisson process, each is requested during its
+    lifetime only, at a constant rate (rectangular shot), for volume requests in expectation. The catalogue is in
+    steady state from time 0, objects appearing in the lifetime before are also requested. Object ids are assigned in
+    the order of appearance.
+    """
+
+    def __init__(self, arrivalrate: float, lifetime: float, volume: Distribution = Pareto(2.0, 1),
+                 size: Distribution = Constant(1), maxage: Distribution = Constant(3600)):
+        """
+        :param arrivalrate: New objects per second.
+        :param lifetime: Time an object is requested for, in seconds.
+        :param volume: Expected number of requests for an object in its lifetime, drawn for each object.
+        :param size: Object sizes, drawn for each object.
+        :param maxage: Object maxages, drawn for each object.
+        """
+        assert arrivalrate > 0, f"I expect a positive arrivalrate, got '{arrivalrate}'"
+        assert lifetime > 0, f"I expect a positive lifetime, got '{lifetime}'"
+        assert 0 < volume.mean < np.inf, f"I expect a finite positive mean volume, got '{volume.mean}'"
+        self._arrivalrate = arrivalrate
+        self._lifetime = lifetime
+        self._volume = volume
+        self._size = size
+        self._maxage = maxage
+
+    def batches(self, rng: np.random.Generator, batchsize: int) -> Iterator[Trace]:
+        # window with batchsize requests expected in steady state
+        window = batchsize / (self._arrivalrate * self._volume.mean)
+
+        # active objects: id, birth, request rate, size, maxage
+        active = [np.empty(0, dtype=np.int64), np.empty(0), np.empty(0), np.empty(0, dtype=np.int64),
+                  np.empty(0, dtype=np.int64)]
+        objectcount = 0
+        time = -self._lifetime
+        start = 0.0
+        while True:
+            # objects appearing until the end of the window
+            count = rng.poisson(self._arrivalrate * (start + window - time))
+            born = [np.arange(objectcount, objectcount + count),
+                    np.sort(rng.uniform(time, start + window, count)),
+                    self._volume(rng, count) / self._lifetime,
+                    self._size(rng, count),
+                    self._maxage(rng, count)]
+            objectcount += count
+            time = start + window
+            alive = active[1] + self._lifetime > start
+            active = [np.concatenate([column[alive], new]) for column, new in zip(active, born)]
+            id, birth, rate, size, maxage = active
+
+            # requests of each object, in the overlap of its lifetime and the window
+            begin = np.maximum(birth, start)
+            end = np.minimum(birth + self._lifetime, time)
+            counts = rng.poisson(rate * np.maximum(end - begin, 0))
+            index = np.repeat(np.arange(len(id)), counts)
+            times = rng.uniform(begin[index], end[index])
+            order = np.argsort(times, kind='stable')
+            index = index[order]
+
+            yield Trace(times[order], id[index], size[index], maxage[index], check=False)
+            start = time
+